@@ -1,4 +1,5 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -9,12 +10,68 @@ load_dotenv()
 # Database URL - SQLite for development, PostgreSQL for production
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./ai_resume_screener.db")
 
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def sqlite_pragmas() -> dict:
+    """Per-connection SQLite tuning: WAL lets readers run alongside the writer, busy_timeout makes writers wait
+    for the lock instead of failing, and mmap/cache sizes keep hot pages in memory"""
+    return {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",  # Durable in WAL mode; only the last commits can be lost on power failure
+        "busy_timeout": _env_int("SQLITE_BUSY_TIMEOUT_MS", 5000),
+        "mmap_size": _env_int("SQLITE_MMAP_MB", 256) * 1024 * 1024,
+        "cache_size": -_env_int("SQLITE_CACHE_MB", 64) * 1024,  # Negative values are KiB
+        "temp_store": "MEMORY"
+    }
+
+
+def engine_options(database_url: str) -> dict:
+    """create_engine arguments for the database dialect"""
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        options = {"connect_args": {"check_same_thread": False}}
+        if url.database and url.database != ":memory:":
+            # SQLite has a single writer, so a handful of pooled connections is enough
+            options.update(pool_size=_env_int("DB_POOL_SIZE", 5), max_overflow=_env_int("DB_MAX_OVERFLOW", 5))
+        return options
+
+    # Server databases (PostgreSQL): size the pool for the worker's concurrency and drop dead connections
+    return {
+        "pool_size": _env_int("DB_POOL_SIZE", 10),
+        "max_overflow": _env_int("DB_MAX_OVERFLOW", 20),
+        "pool_timeout": _env_int("DB_POOL_TIMEOUT", 30),
+        "pool_recycle": _env_int("DB_POOL_RECYCLE", 1800),
+        "pool_pre_ping": True
+    }
+
+
+def create_database_engine(database_url: str):
+    """Create the engine with the dialect's pool settings (and SQLite pragmas)"""
+    engine = create_engine(
+        database_url,
+        echo=False,  # Set to True for SQL debugging
+        **engine_options(database_url)
+    )
+
+    if engine.dialect.name == "sqlite":
+        pragmas = sqlite_pragmas()
+
+        @event.listens_for(engine, "connect")
+        def configure_sqlite(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+    return engine
+
+
 # Create engine
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
-    echo=False  # Set to True for SQL debugging
-)
+engine = create_database_engine(DATABASE_URL)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
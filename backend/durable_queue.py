@@ -0,0 +1,530 @@
+"""
+Durable Job Queue
+SQLite-backed job queue for long-running ML work (backfills, re-parsing, re-embedding) that survives restarts
+
+Delivery is at-least-once: a job leased by a worker becomes visible again if it isn't acknowledged
+within its visibility timeout (e.g. the process died), so handlers should be idempotent.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+DEAD = "dead"
+CANCELLED = "cancelled"
+
+
+class DurableJobQueue:
+    """Persistent job queue with visibility timeouts, retries and dead-lettering (no external broker)"""
+    
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        visibility_timeout: float = 300.0,
+        max_attempts: int = 5,
+        backoff_base: float = 2.0,
+        backoff_max: float = 600.0,
+        timeout: float = 10.0
+    ):
+        """
+        Initialize durable job queue
+        
+        Args:
+            path: SQLite database file (default: JOB_QUEUE_PATH or ./job_queue.db)
+            visibility_timeout: Seconds a leased job stays invisible to other workers
+            max_attempts: Deliveries before a job is dead-lettered (per-job override on enqueue)
+            backoff_base: Retry delay after the first failure; doubles on each attempt
+            backoff_max: Upper bound for the retry delay
+            timeout: Seconds to wait for a lock held by another process
+        """
+        self.path = path or os.getenv("JOB_QUEUE_PATH", "./job_queue.db")
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self._handlers: Dict[str, Callable] = {}
+        self._local = threading.local()
+        
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._init_db()
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def _init_db(self) -> None:
+        self._connect().executescript("""
+            BEGIN;
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                task TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                priority INTEGER NOT NULL DEFAULT 5,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                available_at REAL NOT NULL,
+                lease_id TEXT,
+                idempotency_key TEXT UNIQUE,
+                owner TEXT,
+                result TEXT,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs(status, priority, available_at);
+            COMMIT;
+        """)
+        # Queues created before jobs recorded their owner
+        columns = {row["name"] for row in self._connect().execute("PRAGMA table_info(jobs)")}
+        if "owner" not in columns:
+            self._connect().execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+    
+    def _transaction(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run func in a write transaction (BEGIN IMMEDIATE avoids lock-upgrade deadlocks)"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = func(conn)
+            conn.execute("COMMIT")
+            return result
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    
+    # Tasks
+    
+    def register(self, name: str, handler: Callable) -> None:
+        """Register the handler run for jobs of a task (handlers are looked up by name, so jobs survive restarts)"""
+        self._handlers[name] = handler
+    
+    def task(self, name: Optional[str] = None) -> Callable:
+        """Decorator registering a function as a task handler"""
+        def decorator(func: Callable) -> Callable:
+            self.register(name or func.__name__, func)
+            return func
+        return decorator
+    
+    # Producer side
+    
+    def enqueue(
+        self,
+        task: str,
+        args: Sequence = (),
+        kwargs: Optional[Dict] = None,
+        priority: int = 5,
+        idempotency_key: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+        delay: float = 0.0,
+        owner: Optional[str] = None
+    ) -> str:
+        """
+        Add a job
+        
+        Args:
+            task: Registered task name
+            args, kwargs: JSON-serializable handler arguments
+            priority: Lower runs first
+            idempotency_key: Enqueuing the same key again returns the existing job instead of adding one
+            max_attempts: Deliveries before dead-lettering (default: queue setting)
+            delay: Seconds before the job becomes available
+            owner: ID of the user who enqueued the job (for access checks)
+        
+        Returns:
+            Job ID
+        """
+        return self.enqueue_many(
+            task, [(args, kwargs)], priority=priority,
+            idempotency_keys=[idempotency_key], max_attempts=max_attempts, delay=delay, owner=owner
+        )[0]
+    
+    def enqueue_many(
+        self,
+        task: str,
+        calls: Sequence,
+        priority: int = 5,
+        idempotency_keys: Optional[Sequence[Optional[str]]] = None,
+        max_attempts: Optional[int] = None,
+        delay: float = 0.0,
+        owner: Optional[str] = None
+    ) -> List[str]:
+        """
+        Add many jobs of one task in a single transaction
+        
+        Args:
+            task: Registered task name
+            calls: (args, kwargs) pairs
+            idempotency_keys: Optional key per call
+            owner: ID of the user who enqueued the jobs
+        
+        Returns:
+            Job IDs (existing IDs for duplicate idempotency keys)
+        """
+        now = time.time()
+        keys = list(idempotency_keys) if idempotency_keys is not None else [None] * len(calls)
+        rows = [
+            (uuid.uuid4().hex, task, json.dumps({"args": list(args), "kwargs": kwargs or {}}), priority, QUEUED,
+             max_attempts or self.max_attempts, now + delay, key, owner, now, now)
+            for (args, kwargs), key in zip(calls, keys)
+        ]
+        
+        def insert(conn: sqlite3.Connection) -> List[str]:
+            ids = []
+            for row in rows:
+                inserted = conn.execute(
+                    """
+                    INSERT INTO jobs (id, task, payload, priority, status, max_attempts, available_at,
+                                      idempotency_key, owner, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(idempotency_key) DO NOTHING
+                    """,
+                    row
+                ).rowcount
+                if inserted or row[7] is None:
+                    ids.append(row[0])
+                else:
+                    ids.append(conn.execute(
+                        "SELECT id FROM jobs WHERE idempotency_key = ?", (row[7],)
+                    ).fetchone()[0])
+            return ids
+        
+        return self._transaction(insert)
+    
+    # Consumer side
+    
+    def dequeue(self, batch_size: int = 1, visibility_timeout: Optional[float] = None) -> List[Dict]:
+        """
+        Lease up to batch_size available jobs
+        
+        Jobs whose lease expired without an acknowledgement are delivered again (or dead-lettered
+        once they've used all attempts).
+        
+        Returns:
+            Leased jobs with id, task, args, kwargs, attempts and lease_id
+        """
+        visibility_timeout = visibility_timeout or self.visibility_timeout
+        
+        def lease(conn: sqlite3.Connection) -> List[Dict]:
+            now = time.time()
+            # Expired leases that have no attempts left go to the dead-letter state
+            conn.execute(
+                """
+                UPDATE jobs SET status = ?, lease_id = NULL, updated_at = ?,
+                    last_error = COALESCE(last_error, 'visibility timeout expired')
+                WHERE status = ? AND available_at <= ? AND attempts >= max_attempts
+                """,
+                (DEAD, now, RUNNING, now)
+            )
+            rows = conn.execute(
+                """
+                SELECT * FROM jobs
+                WHERE status IN (?, ?) AND available_at <= ?
+                ORDER BY priority, available_at
+                LIMIT ?
+                """,
+                (QUEUED, RUNNING, now, batch_size)
+            ).fetchall()
+            
+            jobs = []
+            for row in rows:
+                lease_id = uuid.uuid4().hex
+                conn.execute(
+                    """
+                    UPDATE jobs SET status = ?, attempts = attempts + 1, available_at = ?,
+                        lease_id = ?, updated_at = ?
+                    WHERE id = ?
+                    """,
+                    (RUNNING, now + visibility_timeout, lease_id, now, row["id"])
+                )
+                payload = json.loads(row["payload"])
+                jobs.append({
+                    "id": row["id"],
+                    "task": row["task"],
+                    "args": payload["args"],
+                    "kwargs": payload["kwargs"],
+                    "attempts": row["attempts"] + 1,
+                    "max_attempts": row["max_attempts"],
+                    "lease_id": lease_id
+                })
+            return jobs
+        
+        return self._transaction(lease)
+    
+    def ack(self, job_id: str, lease_id: str, result: Any = None) -> bool:
+        """Mark a leased job completed; False if the lease was lost (the job was redelivered)"""
+        return self._transaction(lambda conn: conn.execute(
+            """
+            UPDATE jobs SET status = ?, result = ?, lease_id = NULL, last_error = NULL, updated_at = ?
+            WHERE id = ? AND lease_id = ?
+            """,
+            (COMPLETED, json.dumps(result, default=str), time.time(), job_id, lease_id)
+        ).rowcount == 1)
+    
+    def fail(self, job_id: str, lease_id: str, error: str) -> Optional[str]:
+        """
+        Record a failed attempt: retry with exponential backoff, or dead-letter after max_attempts
+        
+        Returns:
+            New status ("queued" or "dead"), or None if the lease was lost
+        """
+        def record(conn: sqlite3.Connection) -> Optional[str]:
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND lease_id = ?", (job_id, lease_id)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            now = time.time()
+            if row["attempts"] >= row["max_attempts"]:
+                status, available_at = DEAD, now
+            else:
+                delay = min(self.backoff_max, self.backoff_base * 2 ** (row["attempts"] - 1))
+                # Jitter spreads retries of jobs that failed together
+                status, available_at = QUEUED, now + delay * random.uniform(0.5, 1.0)
+            conn.execute(
+                """
+                UPDATE jobs SET status = ?, available_at = ?, lease_id = NULL, last_error = ?, updated_at = ?
+                WHERE id = ?
+                """,
+                (status, available_at, error[:2000], now, job_id)
+            )
+            return status
+        
+        return self._transaction(record)
+    
+    def extend(self, job_id: str, lease_id: str, visibility_timeout: Optional[float] = None) -> bool:
+        """Extend a lease (heartbeat for jobs that outlive the visibility timeout)"""
+        now = time.time()
+        return self._transaction(lambda conn: conn.execute(
+            "UPDATE jobs SET available_at = ?, updated_at = ? WHERE id = ? AND lease_id = ? AND status = ?",
+            (now + (visibility_timeout or self.visibility_timeout), now, job_id, lease_id, RUNNING)
+        ).rowcount == 1)
+    
+    # Inspection and maintenance
+    
+    def get_status(self, job_id: str) -> Optional[Dict]:
+        """Status, attempts, result and last error of a job"""
+        row = self._connect().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": row["id"],
+            "name": row["task"],
+            "status": row["status"],
+            "priority": row["priority"],
+            "attempts": row["attempts"],
+            "max_attempts": row["max_attempts"],
+            "idempotency_key": row["idempotency_key"],
+            "owner": row["owner"],
+            "created_at": datetime.utcfromtimestamp(row["created_at"]).isoformat(),
+            "updated_at": datetime.utcfromtimestamp(row["updated_at"]).isoformat(),
+            "result": json.loads(row["result"]) if row["result"] is not None else None,
+            "error": row["last_error"],
+            "durable": True
+        }
+    
+    def dead_letters(self, limit: int = 100) -> List[Dict]:
+        """Jobs that exhausted their attempts"""
+        rows = self._connect().execute(
+            "SELECT id FROM jobs WHERE status = ? ORDER BY updated_at DESC LIMIT ?", (DEAD, limit)
+        ).fetchall()
+        return [self.get_status(row["id"]) for row in rows]
+    
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that is waiting to run (including one waiting to retry); False if it isn't queued"""
+        return self._transaction(lambda conn: conn.execute(
+            "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status = ?",
+            (CANCELLED, time.time(), job_id, QUEUED)
+        ).rowcount == 1)
+    
+    def requeue_dead(self, job_id: Optional[str] = None) -> int:
+        """Give dead-lettered jobs (one, or all) a fresh set of attempts"""
+        now = time.time()
+        query = "UPDATE jobs SET status = ?, attempts = 0, available_at = ?, updated_at = ? WHERE status = ?"
+        params: list = [QUEUED, now, now, DEAD]
+        if job_id:
+            query += " AND id = ?"
+            params.append(job_id)
+        return self._transaction(lambda conn: conn.execute(query, params).rowcount)
+    
+    def purge_completed(self, older_than: float = 7 * 24 * 3600) -> int:
+        """Delete completed and cancelled jobs last updated more than older_than seconds ago"""
+        cutoff = time.time() - older_than
+        return self._transaction(lambda conn: conn.execute(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?", (COMPLETED, CANCELLED, cutoff)
+        ).rowcount)
+    
+    def get_stats(self) -> Dict:
+        """Job counts per status and the age of the oldest available job"""
+        conn = self._connect()
+        now = time.time()
+        counts = {status: 0 for status in (QUEUED, RUNNING, COMPLETED, DEAD, CANCELLED)}
+        for row in conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+            counts[row[0]] = row[1]
+        oldest = conn.execute(
+            "SELECT MIN(available_at) FROM jobs WHERE status = ? AND available_at <= ?", (QUEUED, now)
+        ).fetchone()[0]
+        return {
+            "path": self.path,
+            **counts,
+            "oldest_ready_age_seconds": round(now - oldest, 3) if oldest is not None else None
+        }
+    
+    # Processing
+    
+    def process(self, job: Dict) -> bool:
+        """Run one leased job with its registered handler and ack or fail it"""
+        handler = self._handlers.get(job["task"])
+        if handler is None:
+            self.fail(job["id"], job["lease_id"], f"No handler registered for task '{job['task']}'")
+            return False
+        try:
+            result = handler(*job["args"], **job["kwargs"])
+        except Exception as e:
+            print(f"Durable job {job['id']} ({job['task']}) attempt {job['attempts']} failed: {e}")
+            self.fail(job["id"], job["lease_id"], f"{type(e).__name__}: {e}")
+            return False
+        return self.ack(job["id"], job["lease_id"], result)
+    
+    def run_pending(self, batch_size: int = 10, max_jobs: Optional[int] = None) -> int:
+        """Process available jobs in the calling thread until none are left; returns jobs processed"""
+        processed = 0
+        while max_jobs is None or processed < max_jobs:
+            jobs = self.dequeue(batch_size if max_jobs is None else min(batch_size, max_jobs - processed))
+            if not jobs:
+                break
+            for job in jobs:
+                self.process(job)
+                processed += 1
+        return processed
+
+
+class DurableWorker:
+    """
+    Background threads consuming a DurableJobQueue
+    
+    Jobs are leased in batches; leases of jobs still in flight are extended periodically so
+    long-running work isn't redelivered while it is making progress. The heartbeat thread also
+    purges finished jobs past their retention period.
+    """
+    
+    def __init__(
+        self,
+        queue: DurableJobQueue,
+        concurrency: int = 1,
+        batch_size: int = 10,
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 10.0,
+        retention: Optional[float] = 7 * 24 * 3600,
+        purge_interval: float = 3600.0
+    ):
+        """
+        Args:
+            queue: Queue to consume
+            concurrency: Worker threads
+            batch_size: Jobs leased per dequeue
+            poll_interval: Initial wait when the queue is empty (doubles up to max_poll_interval)
+            max_poll_interval: Longest wait between polls of an empty queue
+            retention: Seconds completed/cancelled jobs are kept (None never purges)
+            purge_interval: Seconds between purges
+        """
+        self.queue = queue
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.retention = retention
+        self.purge_interval = purge_interval
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._in_flight: Dict[str, str] = {}
+        self._lock = threading.Lock()
+    
+    def start(self) -> None:
+        """Start worker and heartbeat threads"""
+        if self._threads:
+            return
+        self._stop.clear()
+        for i in range(self.concurrency):
+            thread = threading.Thread(target=self._run, name=f"durable-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        heartbeat = threading.Thread(target=self._heartbeat, name="durable-heartbeat", daemon=True)
+        heartbeat.start()
+        self._threads.append(heartbeat)
+    
+    def stop(self, timeout: float = 5) -> None:
+        """Stop after the jobs in progress; unprocessed leased jobs are redelivered after their timeout"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads.clear()
+    
+    def _run(self) -> None:
+        wait = self.poll_interval
+        while not self._stop.is_set():
+            try:
+                jobs = self.queue.dequeue(self.batch_size)
+            except sqlite3.Error as e:
+                print(f"Warning: durable queue dequeue failed: {e}")
+                jobs = []
+            
+            if not jobs:
+                self._stop.wait(wait)
+                wait = min(wait * 2, self.max_poll_interval)
+                continue
+            
+            wait = self.poll_interval
+            with self._lock:
+                self._in_flight.update((job["id"], job["lease_id"]) for job in jobs)
+            for job in jobs:
+                if self._stop.is_set():
+                    break
+                try:
+                    self.queue.process(job)
+                finally:
+                    with self._lock:
+                        self._in_flight.pop(job["id"], None)
+            with self._lock:
+                for job in jobs:
+                    self._in_flight.pop(job["id"], None)
+    
+    def _heartbeat(self) -> None:
+        interval = min(self.queue.visibility_timeout / 2, self.purge_interval)
+        next_purge = time.time()
+        while True:
+            if self.retention is not None and time.time() >= next_purge:
+                next_purge = time.time() + self.purge_interval
+                try:
+                    self.queue.purge_completed(self.retention)
+                except sqlite3.Error as e:
+                    print(f"Warning: durable queue purge failed: {e}")
+            
+            if self._stop.wait(interval):
+                break
+            with self._lock:
+                leases = list(self._in_flight.items())
+            for job_id, lease_id in leases:
+                try:
+                    self.queue.extend(job_id, lease_id)
+                except sqlite3.Error as e:
+                    print(f"Warning: could not extend lease of job {job_id}: {e}")
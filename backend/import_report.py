@@ -0,0 +1,116 @@
+"""
+Import-time report for the API worker
+Imports a module in a fresh interpreter with `python -X importtime` and summarizes per-module timings
+
+Usage:
+    python import_report.py [module] [--top N]
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Optional
+import argparse
+import os
+import subprocess
+import sys
+
+
+# ML / document-processing packages that should only be imported on first use
+HEAVY_MODULES = (
+    "spacy", "torch", "sentence_transformers", "transformers",
+    "sklearn", "scipy", "fitz", "pdfminer"
+)
+
+
+def _parse_importtime(output: str) -> List[Dict]:
+    """Parse `-X importtime` stderr into entries (times in seconds)"""
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        entries.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+            "self_time": int(parts[0]) / 1e6,
+            "cumulative_time": int(parts[1]) / 1e6
+        })
+    return entries
+
+
+def measure_imports(module: str = "main", cwd: Optional[str] = None,
+                    env: Optional[Dict[str, str]] = None) -> Dict:
+    """
+    Import a module in a fresh interpreter and collect import timings
+
+    Args:
+        module: Module to import
+        cwd: Working directory (default: backend/)
+        env: Environment overrides
+
+    Returns:
+        Total import time, per-entry timings and the heavy packages that were imported
+    """
+    run_env = dict(os.environ)
+    run_env.update(env or {})
+    # main refuses to import without an API key; the value is never used here
+    run_env.setdefault("NVIDIA_API_KEY", "import-report")
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd or os.path.dirname(os.path.abspath(__file__)),
+        env=run_env,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    entries = _parse_importtime(result.stderr)
+    total_time = next((e["cumulative_time"] for e in entries if e["module"] == module and e["depth"] == 0), 0.0)
+    imported = {e["module"].split(".")[0] for e in entries}
+
+    return {
+        "module": module,
+        "total_time": total_time,
+        "entries": entries,
+        "heavy_modules": sorted(m for m in HEAVY_MODULES if m in imported)
+    }
+
+
+def get_import_report(module: str = "main", top: int = 15, **kwargs) -> Dict:
+    """
+    Summarize import cost per top-level package
+
+    Returns:
+        Total time, the slowest packages by self time and heavy packages imported
+    """
+    measurement = measure_imports(module, **kwargs)
+
+    package_times: Dict[str, float] = defaultdict(float)
+    for entry in measurement["entries"]:
+        package_times[entry["module"].split(".")[0]] += entry["self_time"]
+
+    packages = sorted(package_times.items(), key=lambda x: x[1], reverse=True)[:top]
+
+    return {
+        "module": module,
+        "total_time": round(measurement["total_time"], 4),
+        "packages": [{"package": name, "time": round(t, 4)} for name, t in packages],
+        "heavy_modules": measurement["heavy_modules"]
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report import time per package")
+    parser.add_argument("module", nargs="?", default="main")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    report = get_import_report(args.module, top=args.top)
+    print(f"Import time for '{report['module']}': {report['total_time'] * 1000:.0f}ms")
+    for package in report["packages"]:
+        print(f"  {package['package']:<30} {package['time'] * 1000:8.1f}ms")
+    print(f"Heavy modules imported: {', '.join(report['heavy_modules']) or 'none'}")
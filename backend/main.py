@@ -1,20 +1,16 @@
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-import fitz  # PyMuPDF
-from pdfminer.high_level import extract_text
-import spacy
-from sentence_transformers import SentenceTransformer
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from fastapi.responses import JSONResponse, PlainTextResponse
 import re
-from typing import Dict, List, Optional
+from typing import Dict, List, Literal, Optional
 import os
 import sys
 import tempfile
 import json
 from typing import Dict, List
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 import hashlib
+import queue
 from datetime import datetime
 import requests
 from dotenv import load_dotenv
@@ -24,16 +20,16 @@ load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
 
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, parent_dir)
-from ml.job_predictor import JobPredictor
-from ml.resume_parser import AdvancedResumeParser
-from ml.semantic_matcher import SemanticMatcher
-from ml.skill_recommender import SkillRecommendationEngine
-from ml.ats_optimizer import ATSOptimizer
+from ml.skill_vocabulary import skill_vocabulary
 from backend.performance import (
     cached, monitor_performance, rate_limit,
     api_rate_limiter, cache_manager, performance_monitor,
-    get_performance_report
+    get_performance_report, register_stats_provider, model_loader,
+    PerformanceMiddleware, TracingMiddleware, span,
+    RateLimitMiddleware, ml_rate_limiter, client_identifier, job_queue, JOB_PRIORITIES,
+    connection_pool, inference_batches, register_metrics_collector, render_metrics, PROMETHEUS_CONTENT_TYPE
 )
+from backend.durable_queue import DurableJobQueue, DurableWorker
 
 class SummaryRequest(BaseModel):
     experience_data: Dict
@@ -53,6 +49,27 @@ class ParseResumeRequest(BaseModel):
 
 app = FastAPI(title="AI Resume Screener", description="NLP-powered resume screening API")
 
+def rate_limit_identifier(scope: Dict) -> str:
+    """Rate-limit per user (verified JWT subject) when authenticated, else per client IP"""
+    for name, value in scope.get("headers", []):
+        if name == b"authorization" and value.lower().startswith(b"bearer "):
+            try:
+                payload = jwt.decode(value[7:].strip().decode(), SECRET_KEY, algorithms=[ALGORITHM])
+            except Exception:
+                break
+            if payload.get("sub"):
+                return f"user:{payload['sub']}"
+    return client_identifier(scope)
+
+# Rate limiting (added before CORS so 429 responses still carry CORS headers)
+if os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes"):
+    app.add_middleware(
+        RateLimitMiddleware,
+        rules=[("/api/ml/", ml_rate_limiter), ("/screen-resume", ml_rate_limiter), ("/api/jobs/", ml_rate_limiter)],
+        default_limiter=api_rate_limiter,
+        identifier_func=rate_limit_identifier
+    )
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -62,6 +79,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency histograms (reported under "requests" in /api/admin/performance)
+app.add_middleware(PerformanceMiddleware)
+# Per-stage spans as a Server-Timing header (reported under "tracing")
+app.add_middleware(TracingMiddleware)
+
 # Import authentication dependencies
 from sqlalchemy.orm import Session
 from passlib.context import CryptContext
@@ -73,7 +95,8 @@ from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 # Database imports
 try:
     from database import SessionLocal, engine
-    from models import User, UserRole, Job, Resume, Application, Candidate
+    from models import User, UserRole, Job, Resume, Application, Candidate, Skill
+    connection_pool.attach(engine)
 except ImportError as e:
     # Create minimal setup if database module not available
     print(f"Warning: Database import failed: {e}")
@@ -82,6 +105,7 @@ except ImportError as e:
     Job = None
     Resume = None
     Application = None
+    Skill = None
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -295,61 +319,136 @@ async def register(request: RegisterRequest, db: Session = Depends(get_db)):
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Registration error: {str(e)}")
 
-# Lazy loading for ML models (loaded on first use to avoid startup delays)
-_nlp = None
-_model = None
-_job_predictor = None
-_advanced_parser = None
-_semantic_matcher = None
-_skill_recommender = None
-_ats_optimizer = None
+@app.on_event("startup")
+def load_skill_vocabulary():
+    """Seed the shared skill vocabulary with IDs from the Skill table"""
+    if SessionLocal is None or Skill is None:
+        return
+    db = SessionLocal()
+    try:
+        skill_vocabulary.load_from_db(db, Skill)
+    except Exception as e:
+        print(f"Warning: Could not load skill vocabulary: {e}")
+    finally:
+        db.close()
+
+# Lazy loading for ML models (loaded on first use, or warmed up in the background at startup).
+# The ML stack (spaCy, sentence-transformers, scikit-learn) is imported inside the loaders so
+# workers that never touch a model don't pay its import time or memory.
+def _load_nlp():
+    import spacy
+    return spacy.load("en_core_web_sm")
+
+def _load_sentence_transformer():
+    # Shared with SemanticMatcher; EMBEDDING_BACKEND selects torch or onnx-int8
+    from ml.embeddings import get_embedder
+    return get_embedder()
+
+def _load_job_predictor():
+    from ml.job_predictor import JobPredictor
+    job_predictor = JobPredictor()
+    model_path = os.path.join(os.path.dirname(__file__), '..', 'ml', 'job_predictor_model.pkl')
+    try:
+        job_predictor.load_model(model_path)
+    except:
+        print("Warning: Job predictor model not found. Run train_models.py first.")
+    register_stats_provider("job_predictor_cache", job_predictor.get_cache_stats)
+    return job_predictor
+
+def _load_role_learner():
+    from ml.job_predictor import IncrementalJobPredictor
+    from ml.model_pipeline import ModelRegistry
+    registry = ModelRegistry(registry_dir=os.path.join(os.path.dirname(__file__), '..', 'ml', 'models'))
+    role_learner = IncrementalJobPredictor.from_registry(registry)
+    register_stats_provider("role_learner", role_learner.get_stats)
+    return role_learner
+
+def _load_advanced_parser():
+    from ml.resume_parser import AdvancedResumeParser
+    return AdvancedResumeParser()
+
+def _load_semantic_matcher():
+    from ml.semantic_matcher import SemanticMatcher
+    return SemanticMatcher()
+
+def _load_skill_recommender():
+    from ml.skill_recommender import SkillRecommendationEngine
+    skill_recommender = SkillRecommendationEngine()
+    register_stats_provider("skill_recommender_cache", skill_recommender.get_cache_stats)
+    return skill_recommender
+
+def _load_ats_optimizer():
+    from ml.ats_optimizer import ATSOptimizer
+    return ATSOptimizer()
+
+def _load_drift_monitor():
+    from ml.drift_monitor import DriftMonitor
+    drift_monitor = DriftMonitor(window_seconds=int(os.getenv("DRIFT_WINDOW_SECONDS", "3600")))
+    register_stats_provider("drift", drift_monitor.get_report)
+    return drift_monitor
+
+WARMUP_TEXT = "Jane Doe\nSoftware Engineer with 5 years of experience in Python, React and AWS."
+
+model_loader.register("nlp", _load_nlp,
+                      warmup=lambda nlp: nlp(WARMUP_TEXT))
+model_loader.register("sentence_transformer", _load_sentence_transformer,
+                      warmup=lambda model: model.encode([WARMUP_TEXT]))
+model_loader.register("job_predictor", _load_job_predictor,
+                      warmup=lambda predictor: predictor.predict_batch([WARMUP_TEXT]))
+model_loader.register("role_learner", _load_role_learner,
+                      warmup=lambda learner: learner.predict_batch([WARMUP_TEXT]) if learner.model is not None else None)
+model_loader.register("advanced_parser", _load_advanced_parser,
+                      warmup=lambda parser: parser.parse(WARMUP_TEXT))
+model_loader.register("semantic_matcher", _load_semantic_matcher,
+                      warmup=lambda matcher: matcher.model.encode([WARMUP_TEXT]))
+model_loader.register("skill_recommender", _load_skill_recommender,
+                      warmup=lambda recommender: recommender.infer_roles(["Python", "React"]))
+model_loader.register("ats_optimizer", _load_ats_optimizer,
+                      warmup=lambda optimizer: optimizer.analyze(WARMUP_TEXT))
+model_loader.register("drift_monitor", _load_drift_monitor)
+
+def get_warmup_models() -> List[str]:
+    """Models to warm up at startup, from MODEL_WARMUP ("all", "none" or a comma-separated list)"""
+    setting = os.getenv("MODEL_WARMUP", "all").strip().lower()
+    if setting in ("", "none", "false", "0"):
+        return []
+    if setting == "all":
+        return model_loader.names
+    return [name.strip() for name in setting.split(",") if name.strip() in model_loader.names]
+
+@app.on_event("startup")
+def warm_up_models():
+    """Load and warm up the configured models in the background"""
+    models = get_warmup_models()
+    if models:
+        model_loader.warm_up_async(models)
 
 def get_nlp():
-    global _nlp
-    if _nlp is None:
-        _nlp = spacy.load("en_core_web_sm")
-    return _nlp
+    return model_loader.get("nlp")
 
 def get_sentence_transformer():
-    global _model
-    if _model is None:
-        _model = SentenceTransformer('all-MiniLM-L6-v2')
-    return _model
+    return model_loader.get("sentence_transformer")
 
 def get_job_predictor():
-    global _job_predictor
-    if _job_predictor is None:
-        _job_predictor = JobPredictor()
-        model_path = os.path.join(os.path.dirname(__file__), '..', 'ml', 'job_predictor_model.pkl')
-        try:
-            _job_predictor.load_model(model_path)
-        except:
-            print("Warning: Job predictor model not found. Run train_models.py first.")
-    return _job_predictor
+    return model_loader.get("job_predictor")
+
+def get_role_learner():
+    return model_loader.get("role_learner")
 
 def get_advanced_parser():
-    global _advanced_parser
-    if _advanced_parser is None:
-        _advanced_parser = AdvancedResumeParser()
-    return _advanced_parser
+    return model_loader.get("advanced_parser")
 
 def get_semantic_matcher():
-    global _semantic_matcher
-    if _semantic_matcher is None:
-        _semantic_matcher = SemanticMatcher()
-    return _semantic_matcher
+    return model_loader.get("semantic_matcher")
 
 def get_skill_recommender():
-    global _skill_recommender
-    if _skill_recommender is None:
-        _skill_recommender = SkillRecommendationEngine()
-    return _skill_recommender
+    return model_loader.get("skill_recommender")
 
 def get_ats_optimizer():
-    global _ats_optimizer
-    if _ats_optimizer is None:
-        _ats_optimizer = ATSOptimizer()
-    return _ats_optimizer
+    return model_loader.get("ats_optimizer")
+
+def get_drift_monitor():
+    return model_loader.get("drift_monitor")
 
 # NVIDIA API configuration
 NVIDIA_API_KEY = os.getenv("NVIDIA_API_KEY")
@@ -377,6 +476,7 @@ def anonymize_text(text: str) -> str:
 def extract_text_from_pdf(file_path: str) -> str:
     """Extract text from PDF using PyMuPDF or fallback to reading as text"""
     try:
+        import fitz  # PyMuPDF
         doc = fitz.open(file_path)
         text = ""
         for page in doc:
@@ -385,6 +485,7 @@ def extract_text_from_pdf(file_path: str) -> str:
     except Exception as e:
         # Fallback to pdfminer
         try:
+            from pdfminer.high_level import extract_text
             return extract_text(file_path)
         except Exception as e2:
             # If both fail, try reading as plain text (for test files that are actually text)
@@ -397,7 +498,8 @@ def extract_text_from_pdf(file_path: str) -> str:
 def parse_resume(text: str) -> Dict:
     """Parse resume text to extract structured data"""
     nlp = get_nlp()
-    doc = nlp(text)
+    with span("spacy"):
+        doc = nlp(text)
 
     # Extract entities
     entities = {ent.label_: ent.text for ent in doc.ents}
@@ -466,13 +568,19 @@ def extract_skills_from_job(job_description: str) -> List[str]:
     return [skill for skill in skills_keywords if skill.lower() in job_description.lower()]
 
 def analyze_skill_gap(resume_skills: List[str], job_skills: List[str]) -> Dict:
-    """Analyze skill gap between resume and job requirements"""
-    present = set(resume_skills) & set(job_skills)
-    missing = set(job_skills) - set(resume_skills)
+    """Analyze skill gap between resume and job requirements (synonym-aware; returns the job's skill names)"""
+    resume = skill_vocabulary.encode(resume_skills)
+    present, missing, seen = [], [], set()
+    for skill in job_skills:
+        key = skill_vocabulary.canonical(skill)
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        (present if skill_vocabulary.contains(resume, skill) else missing).append(skill)
     return {
-        "present_skills": list(present),
-        "missing_skills": list(missing),
-        "gap_score": len(missing) / len(job_skills) if job_skills else 0
+        "present_skills": present,
+        "missing_skills": missing,
+        "gap_score": len(missing) / len(seen) if seen else 0
     }
 
 def ats_optimization_check(text: str, job_description: str) -> Dict:
@@ -621,27 +729,41 @@ Analysis:"""
 
 def calculate_fit_score(resume_data: Dict, job_description: str) -> float:
     """Calculate fit score using keyword matching and semantic similarity"""
-    resume_text = resume_data["raw_text"]
-    skills_text = " ".join(resume_data["skills"])
+    return calculate_fit_scores([resume_data], job_description)[0]
+
+def calculate_fit_scores(resumes: List[Dict], job_description: str, batch_size: int = 32) -> List[float]:
+    """Fit scores for many resumes against one job description (parsed and embedded once)"""
+    def keywords(doc) -> set:
+        return {token.lemma_ for token in doc if token.is_alpha and not token.is_stop}
 
     # Keyword matching
     nlp = get_nlp()
-    job_doc = nlp(job_description.lower())
-    resume_doc = nlp((resume_text + " " + skills_text).lower())
-
-    job_keywords = [token.lemma_ for token in job_doc if token.is_alpha and not token.is_stop]
-    resume_keywords = [token.lemma_ for token in resume_doc if token.is_alpha and not token.is_stop]
-
-    keyword_overlap = len(set(job_keywords) & set(resume_keywords)) / len(set(job_keywords)) if job_keywords else 0
+    with span("spacy"):
+        job_keywords = keywords(nlp(job_description.lower()))
+        resume_keywords = [
+            keywords(doc) for doc in nlp.pipe(
+                ((resume["raw_text"] + " " + " ".join(resume["skills"])).lower() for resume in resumes),
+                batch_size=batch_size
+            )
+        ]
 
     # Semantic similarity
     model = get_sentence_transformer()
-    embeddings = model.encode([job_description, resume_text])
-    semantic_similarity = float(cosine_similarity([embeddings[0]], [embeddings[1]])[0][0])
-
-    # Combine scores (weighted)
-    fit_score = (keyword_overlap * 0.6) + (semantic_similarity * 0.4)
-    return min(fit_score * 100, 100)  # Scale to 0-100
+    with span("embeddings"):
+        job_embedding = model.encode([job_description])
+        resume_embeddings = model.encode([resume["raw_text"] for resume in resumes], batch_size=batch_size)
+    inference_batches.record("sentence_transformer", len(resumes) + 1)
+    from sklearn.metrics.pairwise import cosine_similarity
+    similarities = cosine_similarity(job_embedding, resume_embeddings)[0]
+    get_drift_monitor().observe_batch(embeddings=resume_embeddings)
+
+    scores = []
+    for resume_keyword_set, semantic_similarity in zip(resume_keywords, similarities):
+        keyword_overlap = len(job_keywords & resume_keyword_set) / len(job_keywords) if job_keywords else 0
+        # Combine scores (weighted)
+        fit_score = (keyword_overlap * 0.6) + (float(semantic_similarity) * 0.4)
+        scores.append(min(fit_score * 100, 100))  # Scale to 0-100
+    return scores
 
 @app.post("/screen-resume")
 async def screen_resume(file: UploadFile = File(...), job_description: str = Form(...), job_id: Optional[str] = Form(None)):
@@ -657,37 +779,50 @@ async def screen_resume(file: UploadFile = File(...), job_description: str = For
 
     try:
         # Extract text
-        text = extract_text_from_pdf(temp_path)
+        with span("pdf_extract"):
+            text = extract_text_from_pdf(temp_path)
 
         # Parse resume
-        resume_data = parse_resume(text)
+        with span("parse_resume"):
+            resume_data = parse_resume(text)
 
         # Predict job role
         job_predictor = get_job_predictor()
-        predicted_role = job_predictor.predict(text)
+        with span("job_prediction"):
+            role_predictions = job_predictor.predict_topk([text], k=3)[0]
+        inference_batches.record("job_predictor", 1)
+        predicted_role = role_predictions[0]["role"]
 
         # Skill gap analysis
-        job_skills = extract_skills_from_job(job_description)
-        skill_gap = analyze_skill_gap(resume_data["skills"], job_skills)
+        with span("skill_gap"):
+            job_skills = extract_skills_from_job(job_description)
+            skill_gap = analyze_skill_gap(resume_data["skills"], job_skills)
 
         # ATS optimization
-        ats_check = ats_optimization_check(text, job_description)
+        with span("ats_check"):
+            ats_check = ats_optimization_check(text, job_description)
 
         # Language and tone
-        tone_eval = language_tone_evaluation(text)
+        with span("language_tone"):
+            tone_eval = language_tone_evaluation(text)
 
         # Bias detection
-        bias_check = bias_detection(text)
+        with span("bias_detection"):
+            bias_check = bias_detection(text)
 
         # Calculate fit score (refined with new features)
-        base_fit = calculate_fit_score(resume_data, job_description)
+        with span("fit_score"):
+            base_fit = calculate_fit_score(resume_data, job_description)
         # Adjust fit score based on skill gap, ATS, tone
         adjusted_fit = base_fit * (1 - skill_gap["gap_score"] * 0.2) * (ats_check["ats_score"] / 100 * 0.1 + 0.9)
         fit_score = float(min(adjusted_fit, 100))
+        get_drift_monitor().observe(prediction=predicted_role, score=fit_score)
 
         # Generate AI-powered summary and analysis
-        resume_summary = generate_resume_summary(text)
-        fit_analysis = generate_fit_analysis(resume_data, job_description, fit_score)
+        with span("llm_summary"):
+            resume_summary = generate_resume_summary(text)
+        with span("llm_fit_analysis"):
+            fit_analysis = generate_fit_analysis(resume_data, job_description, fit_score)
 
         # Store screening result
         screening_result = {
@@ -725,6 +860,7 @@ async def screen_resume(file: UploadFile = File(...), job_description: str = For
         return {
             "resume_data": resume_data,
             "predicted_role": predicted_role,
+            "role_predictions": role_predictions,
             "skill_gap": skill_gap,
             "ats_optimization": ats_check,
             "language_tone": tone_eval,
@@ -1481,6 +1617,26 @@ def parse_resume_fallback(raw_text: str):
 def read_root():
     return {"message": "AI Resume Screener API"}
 
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """Performance counters in the Prometheus text format (route latency, cache, jobs, rate limits, models)"""
+    return PlainTextResponse(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+@app.get("/ready")
+def readiness_check():
+    """Readiness probe: 200 once every warm-up model is loaded and warmed up, 503 before"""
+    models = get_warmup_models()
+    ready = model_loader.is_ready(models)
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "ready": ready,
+            "warmup_models": models,
+            "degraded_models": model_loader.degraded(models),
+            "models": model_loader.get_status()
+        }
+    )
+
 @app.get("/dashboard-stats")
 def get_dashboard_stats():
     """Get dashboard statistics"""
@@ -2082,7 +2238,7 @@ async def get_system_health(current_user: dict = Depends(get_current_admin), db:
         "status": "healthy" if db_status == "connected" else "degraded",
         "database": db_status,
         "cache": "operational",
-        "ml_models": "lazy-loaded",
+        "ml_models": model_loader.get_status(),
         "memory_usage": f"{memory.percent}%",
         "cpu_usage": f"{cpu}%",
         "disk_usage": f"{disk.percent}%"
@@ -2146,6 +2302,92 @@ async def recommend_skills(request: SkillRecommendationRequest):
         raise HTTPException(status_code=500, detail=f"Recommendation error: {str(e)}")
 
 
+class SkillProfile(BaseModel):
+    candidate_id: Optional[str] = None
+    current_skills: List[str]
+    target_role: Optional[str] = None
+    experience_years: float = 0
+
+
+class BatchSkillRecommendationRequest(BaseModel):
+    profiles: List[SkillProfile]
+
+
+@app.post("/api/ml/recommend-skills/batch")
+@monitor_performance
+async def recommend_skills_batch(request: BatchSkillRecommendationRequest):
+    """Get skill recommendations and aggregated skill demand for a cohort of candidates"""
+    try:
+        skill_recommender = get_skill_recommender()
+        report = skill_recommender.generate_batch_recommendations(
+            [profile.model_dump() for profile in request.profiles]
+        )
+        return {
+            "success": True,
+            "report": report
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Recommendation error: {str(e)}")
+
+
+class RolePredictionRequest(BaseModel):
+    resume_texts: List[str]
+    top_k: int = 3
+
+
+@app.post("/api/ml/predict-roles")
+@monitor_performance
+async def predict_roles(request: RolePredictionRequest):
+    """Predict the most likely job roles for a batch of resumes"""
+    try:
+        job_predictor = get_job_predictor()
+        predictions = job_predictor.predict_topk(request.resume_texts, k=request.top_k)
+        inference_batches.record("job_predictor", len(request.resume_texts))
+        get_drift_monitor().observe_batch(predictions=[roles[0]["role"] for roles in predictions])
+        return {
+            "success": True,
+            "predictions": [
+                {
+                    "predicted_role": roles[0]["role"],
+                    "confidence": roles[0]["confidence"],
+                    "top_roles": roles
+                }
+                for roles in predictions
+            ]
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+
+
+class RoleFeedback(BaseModel):
+    resume_text: str
+    role: str
+
+
+class RoleFeedbackRequest(BaseModel):
+    feedback: List[RoleFeedback]
+    flush: bool = False
+
+
+@app.post("/api/ml/role-feedback")
+@monitor_performance
+async def submit_role_feedback(request: RoleFeedbackRequest, current_user: dict = Depends(get_current_admin)):
+    """Feed confirmed job roles to the online role learner (admin only; this trains the live model)"""
+    try:
+        role_learner = get_role_learner()
+        for item in request.feedback:
+            role_learner.add_feedback(item.resume_text, item.role)
+        if request.flush:
+            role_learner.flush_feedback()
+        return {
+            "success": True,
+            "accepted": len(request.feedback),
+            "learner": role_learner.get_stats()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Feedback error: {str(e)}")
+
+
 class ATSAnalysisRequest(BaseModel):
     resume_text: str
     job_keywords: Optional[List[str]] = None
@@ -2187,6 +2429,247 @@ async def ats_optimize(request: ATSAnalysisRequest):
         raise HTTPException(status_code=500, detail=f"Optimization error: {str(e)}")
 
 
+# Background jobs
+
+def run_bulk_screening(job_description: str, resume_texts: List[str], batch_size: int = 32) -> Dict:
+    """Screen many resumes against one job description (runs as a background job)"""
+    job_predictor = get_job_predictor()
+    role_predictions = job_predictor.predict_topk(resume_texts, k=3)
+    inference_batches.record("job_predictor", len(resume_texts))
+
+    results = []
+    parsed = []
+    for index, text in enumerate(resume_texts):
+        try:
+            parsed.append((index, parse_resume(text)))
+        except Exception as e:
+            results.append({"index": index, "error": str(e)})
+
+    # The job description is parsed and embedded once; resumes are encoded batch_size at a time
+    fit_scores = []
+    if parsed:
+        try:
+            fit_scores = calculate_fit_scores([resume_data for _, resume_data in parsed], job_description, batch_size)
+        except Exception as e:
+            results.extend({"index": index, "error": str(e)} for index, _ in parsed)
+            parsed = []
+    for (index, resume_data), fit_score in zip(parsed, fit_scores):
+        roles = role_predictions[index]
+        results.append({
+            "index": index,
+            "candidate_name": resume_data["name"],
+            "predicted_role": roles[0]["role"],
+            "role_predictions": roles,
+            "skills": resume_data["skills"],
+            "experience_years": resume_data["experience_years"],
+            "fit_score": round(fit_score, 2),
+            "recommendation": "Strong match" if fit_score > 70 else "Moderate match" if fit_score > 50 else "Weak match"
+        })
+
+    get_drift_monitor().observe_batch(
+        predictions=[r["predicted_role"] for r in results if "error" not in r],
+        scores=[r["fit_score"] for r in results if "error" not in r]
+    )
+    results.sort(key=lambda r: r.get("fit_score", -1), reverse=True)
+    return {
+        "screened": sum(1 for r in results if "error" not in r),
+        "failed": sum(1 for r in results if "error" in r),
+        "results": results
+    }
+
+
+def run_resume_reparse(resume_ids: Optional[List[int]] = None, batch_size: int = 100) -> Dict:
+    """Re-run the advanced parser over stored resumes and save the structured content (background job)"""
+    advanced_parser = get_advanced_parser()
+    db = SessionLocal()
+    reparsed = failed = 0
+    last_id = 0
+    try:
+        query = db.query(Resume).filter(Resume.raw_text.isnot(None))
+        if resume_ids:
+            query = query.filter(Resume.id.in_(resume_ids))
+
+        # Keyset pagination keeps each batch small however many resumes there are
+        while True:
+            batch = query.filter(Resume.id > last_id).order_by(Resume.id).limit(batch_size).all()
+            if not batch:
+                break
+            for resume in batch:
+                try:
+                    resume.content = advanced_parser.parse(resume.raw_text)
+                    reparsed += 1
+                except Exception as e:
+                    print(f"Warning: could not reparse resume {resume.id}: {e}")
+                    failed += 1
+            db.commit()
+            last_id = batch[-1].id
+    finally:
+        db.close()
+
+    return {"reparsed": reparsed, "failed": failed}
+
+
+durable_queue: Optional[DurableJobQueue] = None
+durable_worker: Optional[DurableWorker] = None
+
+
+def get_durable_queue() -> DurableJobQueue:
+    """Durable job queue (JOB_QUEUE_PATH), created on first use"""
+    global durable_queue
+    if durable_queue is None:
+        durable_queue = DurableJobQueue()
+        durable_queue.register("resume_reparse", run_resume_reparse)
+        register_stats_provider("durable_jobs", durable_queue.get_stats)
+        register_metrics_collector(durable_queue_metrics)
+    return durable_queue
+
+
+def durable_queue_metrics() -> List:
+    """Durable queue depth for /metrics"""
+    stats = durable_queue.get_stats()
+    labels = {"queue": "durable"}
+    return [
+        ("job_queue_depth", "gauge", "Jobs waiting to run", [(labels, stats["queued"])]),
+        ("job_queue_running", "gauge", "Jobs running", [(labels, stats["running"])]),
+        ("job_queue_dead_letters", "gauge", "Durable jobs that exhausted their retries", [(labels, stats["dead"])])
+    ]
+
+
+MAX_BULK_RESUMES = int(os.getenv("BULK_SCREEN_MAX_RESUMES", "200"))
+
+
+class BulkScreeningRequest(BaseModel):
+    job_description: str
+    resume_texts: List[str] = Field(..., min_length=1, max_length=MAX_BULK_RESUMES)
+    priority: Literal["high", "normal", "low"] = "normal"
+
+
+class ReparseResumesRequest(BaseModel):
+    resume_ids: Optional[List[int]] = None
+    priority: Literal["high", "normal", "low"] = "low"
+    idempotency_key: Optional[str] = None
+    chunk_size: int = 500
+
+
+@app.post("/api/jobs/bulk-screen")
+async def enqueue_bulk_screening(
+    request: BulkScreeningRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """Screen a batch of resumes asynchronously; poll /api/jobs/{job_id} for the result"""
+    try:
+        job_id = job_queue.enqueue(
+            run_bulk_screening, request.job_description, request.resume_texts,
+            priority=request.priority, name="bulk_screening", owner=str(current_user["id"])
+        )
+    except queue.Full:
+        raise HTTPException(status_code=503, detail="Job queue is full, try again later",
+                            headers={"Retry-After": "30"})
+    return {"success": True, "job_id": job_id, "status_url": f"/api/jobs/{job_id}"}
+
+
+@app.post("/api/jobs/reparse-resumes")
+def enqueue_resume_reparse(
+    request: ReparseResumesRequest,
+    current_user: dict = Depends(get_current_admin)
+):
+    """
+    Re-parse stored resumes on the durable queue (admin only)
+
+    The backfill is split into chunks of resume IDs, each a separate job that is retried on failure
+    and survives restarts. Resubmitting with the same idempotency_key doesn't enqueue duplicates.
+    A sync handler, so the ID scan and queue writes run in the threadpool, off the event loop.
+    """
+    if SessionLocal is None:
+        raise HTTPException(status_code=500, detail="Database not configured")
+
+    resume_ids = request.resume_ids
+    if resume_ids is None:
+        db = SessionLocal()
+        try:
+            query = db.query(Resume.id).filter(Resume.raw_text.isnot(None)).order_by(Resume.id)
+            resume_ids = [row.id for row in query]
+        finally:
+            db.close()
+
+    chunk_size = max(1, request.chunk_size)
+    chunks = [resume_ids[i:i + chunk_size] for i in range(0, len(resume_ids), chunk_size)]
+    keys = None
+    if request.idempotency_key:
+        keys = [f"resume_reparse:{request.idempotency_key}:{i}" for i in range(len(chunks))]
+
+    job_ids = get_durable_queue().enqueue_many(
+        "resume_reparse", [((chunk,), None) for chunk in chunks],
+        priority=JOB_PRIORITIES[request.priority], idempotency_keys=keys, owner=str(current_user["id"])
+    )
+    return {
+        "success": True,
+        "job_ids": job_ids,
+        "resumes": len(resume_ids),
+        "status_urls": [f"/api/jobs/{job_id}" for job_id in job_ids]
+    }
+
+
+def get_visible_job(job_id: str, current_user: dict) -> Dict:
+    """A background or durable job owned by the user (any job for admins); 404 otherwise"""
+    job = job_queue.get_status(job_id) or get_durable_queue().get_status(job_id)
+    if job is None or (current_user["role"] != "admin" and job.get("owner") != str(current_user["id"])):
+        # Other users' jobs are indistinguishable from missing ones
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
+
+
+@app.get("/api/jobs/{job_id}")
+def get_job_status(job_id: str, current_user: dict = Depends(get_current_user)):
+    """Get the status and result of a background job (its owner or an admin)"""
+    return get_visible_job(job_id, current_user)
+
+
+@app.delete("/api/jobs/{job_id}")
+def cancel_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    """Cancel a background or durable job that hasn't started yet (its owner or an admin)"""
+    job = get_visible_job(job_id, current_user)
+    cancelled = get_durable_queue().cancel(job_id) if job.get("durable") else job_queue.cancel(job_id)
+    if not cancelled:
+        raise HTTPException(status_code=409, detail="Job already started or finished")
+    return {"success": True, "message": "Job cancelled"}
+
+
+@app.get("/api/admin/jobs/dead-letters")
+def get_dead_letter_jobs(limit: int = 100, current_user: dict = Depends(get_current_admin)):
+    """Durable jobs that exhausted their retries (admin only)"""
+    return {"success": True, "jobs": get_durable_queue().dead_letters(limit)}
+
+
+@app.post("/api/admin/jobs/{job_id}/requeue")
+def requeue_dead_letter_job(job_id: str, current_user: dict = Depends(get_current_admin)):
+    """Retry a dead-lettered durable job with a fresh set of attempts (admin only)"""
+    if not get_durable_queue().requeue_dead(job_id):
+        raise HTTPException(status_code=404, detail="Dead-lettered job not found")
+    return {"success": True, "message": "Job requeued"}
+
+
+@app.on_event("startup")
+def start_durable_workers():
+    """Start consuming the durable queue (DURABLE_JOB_WORKERS=0 leaves it to a separate worker process)"""
+    global durable_worker
+    workers = int(os.getenv("DURABLE_JOB_WORKERS", "1"))
+    if workers > 0:
+        durable_worker = DurableWorker(
+            get_durable_queue(), concurrency=workers,
+            retention=float(os.getenv("DURABLE_JOB_RETENTION_HOURS", "168")) * 3600
+        )
+        durable_worker.start()
+
+
+@app.on_event("shutdown")
+def stop_background_jobs():
+    """Let running jobs finish and stop the workers"""
+    job_queue.stop()
+    if durable_worker is not None:
+        durable_worker.stop()
+
+
 # Performance monitoring endpoints
 
 @app.get("/api/admin/performance")
@@ -2195,6 +2678,20 @@ async def get_performance_metrics():
     return get_performance_report()
 
 
+@app.get("/api/admin/drift")
+async def get_drift_report(current_user: dict = Depends(get_current_admin)):
+    """Get unsupervised drift statistics and alerts (admin only)"""
+    return get_drift_monitor().get_report()
+
+
+@app.post("/api/admin/drift/reference")
+async def reset_drift_reference(current_user: dict = Depends(get_current_admin)):
+    """Use the current window as the drift reference snapshot (admin only)"""
+    if not get_drift_monitor().set_reference():
+        raise HTTPException(status_code=400, detail="Not enough observations in the current window")
+    return {"success": True, "message": "Drift reference updated"}
+
+
 @app.get("/api/admin/cache-stats")
 async def get_cache_stats():
     """Get cache statistics"""
@@ -3,69 +3,261 @@ Performance Optimization Module
 Implements caching, rate limiting, and performance monitoring
 """
 
+from abc import ABC, abstractmethod
 from functools import wraps, lru_cache
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+import asyncio
+import bisect
+import dataclasses
+import inspect
+import itertools
 import time
 import hashlib
+import heapq
+import ipaddress
 import json
-from datetime import datetime, timedelta
-from collections import defaultdict, deque
+import math
+import os
+import pickle
+import queue
+import random
+import sqlite3
+import sys
+from datetime import date, datetime, timedelta
+from collections import OrderedDict, defaultdict, deque
 import threading
+import uuid
 
 
-class CacheManager:
-    """In-memory cache with TTL support"""
+class CacheBackend(ABC):
+    """Interface shared by cache backends used by `cache_manager` and `@cached`"""
     
-    def __init__(self, default_ttl: int = 3600):
+    name = "base"
+    namespace_separator = ":"
+    
+    def _namespace(self, key: str) -> str:
+        if self.namespace_separator in key:
+            return key.split(self.namespace_separator, 1)[0]
+        return "default"
+    
+    @abstractmethod
+    def get(self, key: str, default: Any = None) -> Optional[Any]:
+        """Get value from cache if not expired (`default` on a miss)"""
+    
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Set value in cache with TTL"""
+    
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Delete key from cache"""
+    
+    @abstractmethod
+    def clear(self) -> None:
+        """Clear entire cache"""
+    
+    @abstractmethod
+    def get_stats(self) -> Dict:
+        """Get cache statistics"""
+    
+    def get_counters(self) -> Dict:
+        """Hit/miss/eviction counters cheap enough for every metrics scrape"""
+        return self.get_stats()
+    
+    def cleanup_expired(self) -> int:
+        """Remove expired entries, return count removed"""
+        return 0
+
+
+class CacheManager(CacheBackend):
+    """In-memory LRU cache with TTL support and entry/byte limits"""
+    
+    name = "memory"
+    # Items sized per container (larger containers are extrapolated) and nesting levels sized
+    SIZE_SAMPLE = 32
+    SIZE_DEPTH = 3
+    
+    def __init__(
+        self,
+        default_ttl: int = 3600,
+        max_entries: Optional[int] = 10000,
+        max_bytes: Optional[int] = 256 * 1024 * 1024,
+        namespace_separator: str = ":"
+    ):
         """
         Initialize cache manager
         
         Args:
             default_ttl: Default time-to-live in seconds (default: 1 hour)
+            max_entries: Maximum number of entries (None for unbounded)
+            max_bytes: Maximum estimated size of all values in bytes (None for unbounded)
+            namespace_separator: Keys are grouped into namespaces by the prefix before this separator
         """
-        self._cache: Dict[str, Dict[str, Any]] = {}
+        # Least recently used entries first
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # (expires_at, key) min-heap; stale items (deleted or overwritten keys) are skipped when popped
+        self._expiry_heap: List[Tuple[float, str]] = []
         self._default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.namespace_separator = namespace_separator
         self._lock = threading.Lock()
+        self._bytes = 0
         self._hits = 0
         self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._rejected = 0
+        # namespace -> {"entries", "bytes", "hits", "misses"}; only namespaces with live entries
+        self._namespaces: Dict[str, Dict[str, int]] = {}
+    
+    @classmethod
+    def _estimate_size(cls, value: Any, depth: int = 0) -> int:
+        """
+        Approximate memory footprint of a cached value in bytes, without serializing it
+        
+        Arrays report their buffer size; containers add a sample of their items (extrapolated
+        to the full length) down to SIZE_DEPTH levels, so the cost is bounded per call.
+        """
+        nbytes = getattr(value, "nbytes", None)
+        if isinstance(nbytes, int):
+            return nbytes
+        
+        size = sys.getsizeof(value)
+        if depth >= cls.SIZE_DEPTH or isinstance(value, (str, bytes, bytearray, int, float, bool)):
+            return size
+        
+        if isinstance(value, dict):
+            items = itertools.islice(value.items(), cls.SIZE_SAMPLE)
+            sampled = [cls._estimate_size(k, depth + 1) + cls._estimate_size(v, depth + 1) for k, v in items]
+            count = len(value)
+        elif isinstance(value, (list, tuple, set, frozenset, deque)):
+            sampled = [cls._estimate_size(v, depth + 1) for v in itertools.islice(value, cls.SIZE_SAMPLE)]
+            count = len(value)
+        elif hasattr(value, "__dict__"):
+            return size + cls._estimate_size(vars(value), depth + 1)
+        else:
+            return size
+        
+        if sampled:
+            size += sum(sampled) * count // len(sampled)
+        return size
+    
+    def _remove(self, key: str) -> Dict[str, Any]:
+        entry = self._cache.pop(key)
+        self._bytes -= entry["size"]
+        name = self._namespace(key)
+        namespace = self._namespaces[name]
+        namespace["entries"] -= 1
+        namespace["bytes"] -= entry["size"]
+        if namespace["entries"] == 0:
+            # Namespaces come and go with their entries, so arbitrary key prefixes don't accumulate
+            del self._namespaces[name]
+        return entry
+    
+    def _expire(self, now: float) -> int:
+        """Pop expired entries off the heap; O(expired log n)"""
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self._cache.get(key)
+            if entry is not None and entry["expires_at"] == expires_at:
+                self._remove(key)
+                removed += 1
+        self._expirations += removed
+        return removed
+    
+    def _compact_heap(self) -> None:
+        """Drop stale heap items once they outnumber live entries"""
+        if len(self._expiry_heap) > 2 * len(self._cache) + 64:
+            self._expiry_heap = [(entry["expires_at"], key) for key, entry in self._cache.items()]
+            heapq.heapify(self._expiry_heap)
     
-    def get(self, key: str) -> Optional[Any]:
-        """Get value from cache if not expired"""
+    def _evict(self) -> None:
+        """Evict least recently used entries until within limits"""
+        while self._cache and (
+            (self.max_entries is not None and len(self._cache) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            self._remove(next(iter(self._cache)))
+            self._evictions += 1
+    
+    def get(self, key: str, default: Any = None) -> Optional[Any]:
+        """Get value from cache if not expired (`default` on a miss)"""
         with self._lock:
-            if key in self._cache:
-                entry = self._cache[key]
+            name = self._namespace(key)
+            entry = self._cache.get(key)
+            if entry is not None:
                 if entry["expires_at"] > time.time():
+                    self._cache.move_to_end(key)
                     self._hits += 1
+                    self._namespaces[name]["hits"] += 1
                     return entry["value"]
                 else:
                     # Expired, remove it
-                    del self._cache[key]
+                    self._remove(key)
+                    self._expirations += 1
             
             self._misses += 1
-            return None
+            namespace = self._namespaces.get(name)
+            if namespace is not None:
+                namespace["misses"] += 1
+            return default
     
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
         """Set value in cache with TTL"""
         ttl = ttl or self._default_ttl
+        size = self._estimate_size(value)
         with self._lock:
+            if key in self._cache:
+                self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                self._rejected += 1
+                return
+            
+            now = time.time()
+            self._expire(now)
+            expires_at = now + ttl
             self._cache[key] = {
                 "value": value,
-                "expires_at": time.time() + ttl,
-                "created_at": time.time()
+                "expires_at": expires_at,
+                "created_at": now,
+                "size": size
             }
+            heapq.heappush(self._expiry_heap, (expires_at, key))
+            self._bytes += size
+            namespace = self._namespaces.setdefault(
+                self._namespace(key), {"entries": 0, "bytes": 0, "hits": 0, "misses": 0}
+            )
+            namespace["entries"] += 1
+            namespace["bytes"] += size
+            
+            self._evict()
+            self._compact_heap()
     
     def delete(self, key: str) -> None:
         """Delete key from cache"""
         with self._lock:
             if key in self._cache:
-                del self._cache[key]
+                self._remove(key)
     
     def clear(self) -> None:
         """Clear entire cache"""
         with self._lock:
             self._cache.clear()
+            self._expiry_heap.clear()
+            self._namespaces.clear()
+            self._bytes = 0
             self._hits = 0
             self._misses = 0
+            self._evictions = 0
+            self._expirations = 0
+            self._rejected = 0
     
     def get_stats(self) -> Dict:
         """Get cache statistics"""
@@ -74,76 +266,791 @@ class CacheManager:
             hit_rate = (self._hits / total_requests * 100) if total_requests > 0 else 0
             
             return {
+                "backend": self.name,
                 "size": len(self._cache),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
                 "hits": self._hits,
                 "misses": self._misses,
                 "hit_rate": round(hit_rate, 2),
-                "total_requests": total_requests
+                "total_requests": total_requests,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "rejected": self._rejected,
+                "namespaces": {name: dict(stats) for name, stats in sorted(self._namespaces.items())}
             }
     
     def cleanup_expired(self) -> int:
         """Remove expired entries, return count removed"""
         with self._lock:
-            current_time = time.time()
-            expired_keys = [
-                key for key, entry in self._cache.items()
-                if entry["expires_at"] <= current_time
-            ]
-            
-            for key in expired_keys:
-                del self._cache[key]
+            removed = self._expire(time.time())
+            self._compact_heap()
+            return removed
+
+
+class _LocalCacheStats:
+    """Per-process hit/miss counters for shared backends"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.rejected = 0
+        self.namespaces: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0})
+    
+    def record(self, namespace: str, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+                self.namespaces[namespace]["hits"] += 1
+            else:
+                self.misses += 1
+                self.namespaces[namespace]["misses"] += 1
+    
+    def reset(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.errors = self.rejected = 0
+            self.namespaces.clear()
+    
+    def snapshot(self) -> Dict:
+        with self._lock:
+            total_requests = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total_requests * 100, 2) if total_requests else 0,
+                "total_requests": total_requests,
+                "errors": self.errors,
+                "rejected": self.rejected,
+                "namespaces": {name: dict(stats) for name, stats in sorted(self.namespaces.items())}
+            }
+
+
+def default_cache_dir() -> str:
+    """Per-user cache directory ($XDG_CACHE_HOME/resume-screener or ~/.cache/resume-screener)"""
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "resume-screener")
+
+
+def _prepare_private_file(path: str) -> None:
+    """
+    Create a file readable only by this user, refusing locations other users can tamper with
+    
+    Cached values are unpickled on read and may hold resume data, so a file (or directory) another
+    user can write would allow code execution in this process, and a readable one would leak PII.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if os.name != "posix":
+        return
+    
+    uid = os.getuid()
+    dir_stat = os.stat(directory)
+    if dir_stat.st_uid != uid or dir_stat.st_mode & 0o022:
+        raise PermissionError(
+            f"Cache directory {directory} must be owned by this user and not writable by group/others"
+        )
+    fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0), 0o600)
+    try:
+        file_stat = os.fstat(fd)
+    finally:
+        os.close(fd)
+    if file_stat.st_uid != uid or file_stat.st_mode & 0o077:
+        raise PermissionError(f"Cache file {path} must be owned by this user with mode 0600")
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Cache shared by all worker processes on a host, stored in a SQLite database (WAL mode)
+    
+    Entry/byte totals are maintained by triggers so limit checks are O(1); LRU eviction and
+    expiry use the `last_access` and `expires_at` indexes. Hit/miss counters are per process.
+    Values are pickled, so the file must only be writable by this user (checked on startup).
+    """
+    
+    name = "sqlite"
+    # Reads refresh `last_access` at most this often per key, to keep hits mostly read-only
+    ACCESS_RESOLUTION = 1.0
+    
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        default_ttl: int = 3600,
+        max_entries: Optional[int] = 10000,
+        max_bytes: Optional[int] = 256 * 1024 * 1024,
+        namespace_separator: str = ":",
+        timeout: float = 5.0
+    ):
+        """
+        Initialize SQLite cache backend
+        
+        Args:
+            path: Database file (default: CACHE_PATH or cache.db in the per-user cache directory)
+            default_ttl: Default time-to-live in seconds
+            max_entries: Maximum number of entries (None for unbounded)
+            max_bytes: Maximum size of all pickled values in bytes (None for unbounded)
+            namespace_separator: Keys are grouped into namespaces by the prefix before this separator
+            timeout: Seconds to wait for a lock held by another process
+        """
+        self.path = path or os.getenv("CACHE_PATH") or os.path.join(default_cache_dir(), "cache.db")
+        self._default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.namespace_separator = namespace_separator
+        self.timeout = timeout
+        self._local = threading.local()
+        self._stats = _LocalCacheStats()
+        
+        _prepare_private_file(self.path)
+        self._init_db()
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def _init_db(self) -> None:
+        conn = self._connect()
+        conn.executescript("""
+            BEGIN;
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_cache_expires_at ON cache(expires_at);
+            CREATE INDEX IF NOT EXISTS idx_cache_last_access ON cache(last_access);
+            CREATE TABLE IF NOT EXISTS cache_meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+            INSERT OR IGNORE INTO cache_meta VALUES ('entries', 0), ('bytes', 0), ('evictions', 0), ('expirations', 0);
+            CREATE TRIGGER IF NOT EXISTS cache_insert AFTER INSERT ON cache BEGIN
+                UPDATE cache_meta SET value = value + 1 WHERE name = 'entries';
+                UPDATE cache_meta SET value = value + NEW.size WHERE name = 'bytes';
+            END;
+            CREATE TRIGGER IF NOT EXISTS cache_update AFTER UPDATE OF size ON cache BEGIN
+                UPDATE cache_meta SET value = value + NEW.size - OLD.size WHERE name = 'bytes';
+            END;
+            CREATE TRIGGER IF NOT EXISTS cache_delete AFTER DELETE ON cache BEGIN
+                UPDATE cache_meta SET value = value - 1 WHERE name = 'entries';
+                UPDATE cache_meta SET value = value - OLD.size WHERE name = 'bytes';
+            END;
+            COMMIT;
+        """)
+    
+    def _meta(self, conn: sqlite3.Connection) -> Dict[str, int]:
+        return dict(conn.execute("SELECT name, value FROM cache_meta").fetchall())
+    
+    def _bump(self, conn: sqlite3.Connection, name: str, amount: int) -> None:
+        if amount:
+            conn.execute("UPDATE cache_meta SET value = value + ? WHERE name = ?", (amount, name))
+    
+    def get(self, key: str, default: Any = None) -> Optional[Any]:
+        """Get value from cache if not expired (`default` on a miss)"""
+        namespace = self._namespace(key)
+        now = time.time()
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, expires_at, last_access FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[1] > now:
+                if now - row[2] >= self.ACCESS_RESOLUTION:
+                    conn.execute("UPDATE cache SET last_access = ? WHERE key = ?", (now, key))
+                value = pickle.loads(row[0])
+                self._stats.record(namespace, hit=True)
+                return value
+            if row is not None:
+                # Expired, remove it
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    deleted = conn.execute("DELETE FROM cache WHERE key = ? AND expires_at <= ?", (key, now)).rowcount
+                    self._bump(conn, "expirations", deleted)
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+        except Exception as e:
+            self._stats.errors += 1
+            print(f"Warning: cache read failed for '{key}': {e}")
+        
+        self._stats.record(namespace, hit=False)
+        return default
+    
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Set value in cache with TTL"""
+        ttl = ttl or self._default_ttl
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            self._stats.rejected += 1
+            return
+        if self.max_bytes is not None and len(blob) > self.max_bytes:
+            self._stats.rejected += 1
+            self.delete(key)
+            return
+        
+        now = time.time()
+        try:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    """
+                    INSERT INTO cache (key, namespace, value, size, expires_at, last_access)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(key) DO UPDATE SET
+                        value = excluded.value, size = excluded.size,
+                        expires_at = excluded.expires_at, last_access = excluded.last_access
+                    """,
+                    (key, self._namespace(key), blob, len(blob), now + ttl, now)
+                )
+                self._evict(conn, now)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        except Exception as e:
+            self._stats.errors += 1
+            print(f"Warning: cache write failed for '{key}': {e}")
+    
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired entries, then least recently used ones until within limits"""
+        expired = conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,)).rowcount
+        self._bump(conn, "expirations", expired)
+        
+        evicted = 0
+        while True:
+            meta = self._meta(conn)
+            excess = 0
+            if self.max_entries is not None and meta["entries"] > self.max_entries:
+                excess = meta["entries"] - self.max_entries
+            elif self.max_bytes is not None and meta["bytes"] > self.max_bytes:
+                excess = 1
+            if not excess:
+                break
+            evicted += conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY last_access LIMIT ?)", (excess,)
+            ).rowcount
+        self._bump(conn, "evictions", evicted)
+    
+    def delete(self, key: str) -> None:
+        """Delete key from cache"""
+        try:
+            self._connect().execute("DELETE FROM cache WHERE key = ?", (key,))
+        except Exception as e:
+            self._stats.errors += 1
+            print(f"Warning: cache delete failed for '{key}': {e}")
+    
+    def clear(self) -> None:
+        """Clear entire cache (for every process sharing the database)"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM cache")
+            conn.execute("UPDATE cache_meta SET value = 0")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._stats.reset()
+    
+    def get_stats(self) -> Dict:
+        """Get cache statistics (sizes are shared; hits/misses are for this process)"""
+        conn = self._connect()
+        meta = self._meta(conn)
+        stats = self._stats.snapshot()
+        for namespace, entries, size in conn.execute(
+            "SELECT namespace, COUNT(*), SUM(size) FROM cache GROUP BY namespace"
+        ):
+            stats["namespaces"].setdefault(namespace, {"hits": 0, "misses": 0})
+            stats["namespaces"][namespace].update(entries=entries, bytes=size)
+        
+        return {
+            "backend": self.name,
+            "path": self.path,
+            "size": meta["entries"],
+            "bytes": meta["bytes"],
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": meta["evictions"],
+            "expirations": meta["expirations"],
+            **stats
+        }
+    
+    def cleanup_expired(self) -> int:
+        """Remove expired entries, return count removed"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            removed = conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),)).rowcount
+            self._bump(conn, "expirations", removed)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return removed
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Networked cache shared by all hosts (Redis or any client with the same get/set/delete/scan_iter/dbsize API)
+    
+    Expiry and eviction are left to the server (`maxmemory-policy allkeys-lru` is recommended).
+    Cache errors are counted and treated as misses so an unavailable server never fails a request.
+    Values are pickled: anyone who can write to the server can run code in the API process, so it
+    must be a trusted, authenticated instance (not shared with other applications).
+    """
+    
+    name = "redis"
+    
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        client: Any = None,
+        prefix: str = "resume-screener:cache:",
+        default_ttl: int = 3600,
+        namespace_separator: str = ":"
+    ):
+        """
+        Initialize networked cache backend
+        
+        Args:
+            url: Server URL (default: CACHE_REDIS_URL or redis://localhost:6379/0)
+            client: Pre-built client (e.g. a local stand-in for tests); `url` is ignored
+            prefix: Prefix for all keys written by this application
+            default_ttl: Default time-to-live in seconds
+            namespace_separator: Keys are grouped into namespaces by the prefix before this separator
+        """
+        if client is None:
+            import redis
+            url = url or os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+            client = redis.Redis.from_url(url)
+        self.url = url
+        self.client = client
+        self.prefix = prefix
+        self._default_ttl = default_ttl
+        self.namespace_separator = namespace_separator
+        self._stats = _LocalCacheStats()
+    
+    def get(self, key: str, default: Any = None) -> Optional[Any]:
+        """Get value from cache if not expired (`default` on a miss)"""
+        namespace = self._namespace(key)
+        try:
+            raw = self.client.get(self.prefix + key)
+            if raw is not None:
+                value = pickle.loads(raw)
+                self._stats.record(namespace, hit=True)
+                return value
+        except Exception as e:
+            self._stats.errors += 1
+            print(f"Warning: cache read failed for '{key}': {e}")
+        
+        self._stats.record(namespace, hit=False)
+        return default
+    
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Set value in cache with TTL"""
+        ttl = ttl or self._default_ttl
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            self._stats.rejected += 1
+            return
+        try:
+            self.client.set(self.prefix + key, blob, px=max(1, int(ttl * 1000)))
+        except Exception as e:
+            self._stats.errors += 1
+            print(f"Warning: cache write failed for '{key}': {e}")
+    
+    def delete(self, key: str) -> None:
+        """Delete key from cache"""
+        try:
+            self.client.delete(self.prefix + key)
+        except Exception as e:
+            self._stats.errors += 1
+            print(f"Warning: cache delete failed for '{key}': {e}")
+    
+    def _keys(self) -> List:
+        return list(self.client.scan_iter(match=self.prefix + "*"))
+    
+    def clear(self) -> None:
+        """Clear every key under this application's prefix"""
+        keys = self._keys()
+        if keys:
+            self.client.delete(*keys)
+        self._stats.reset()
+    
+    def get_stats(self) -> Dict:
+        """
+        Get cache statistics (hits/misses are for this process)
+        
+        The size is the server's DBSIZE, an O(1) key count for the whole database rather than a scan
+        of this prefix, so it is only exact when the database is dedicated to this cache.
+        """
+        stats = self._stats.snapshot()
+        try:
+            size = self.client.dbsize()
+        except Exception as e:
+            size = None
+            stats["error"] = str(e)
+        return {
+            "backend": self.name,
+            "url": self.url,
+            "size": size,
+            **stats
+        }
+    
+    def get_counters(self) -> Dict:
+        """Per-process counters without the server round trip get_stats needs for the size"""
+        return {"backend": self.name, **self._stats.snapshot()}
+
+
+CACHE_BACKENDS = {
+    "memory": CacheManager,
+    "sqlite": SQLiteCacheBackend,
+    "redis": RedisCacheBackend
+}
+
+
+def create_cache_backend(
+    backend: Optional[str] = None,
+    default_ttl: int = 3600,
+    max_entries: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    **kwargs
+) -> CacheBackend:
+    """
+    Create the configured cache backend
+    
+    Args:
+        backend: "memory" (per process), "sqlite" (shared by workers on a host) or "redis"
+            (shared across hosts); defaults to CACHE_BACKEND
+        default_ttl: Default time-to-live in seconds
+        max_entries: Entry limit for memory/sqlite backends (default: CACHE_MAX_ENTRIES)
+        max_bytes: Byte limit for memory/sqlite backends (default: CACHE_MAX_MB)
+        **kwargs: Backend-specific options (e.g. `path`, `url`, `client`)
+    
+    Returns:
+        Cache backend; falls back to the in-memory cache if the backend can't be created
+    """
+    backend = (backend or os.getenv("CACHE_BACKEND", "memory")).strip().lower()
+    if backend not in CACHE_BACKENDS:
+        raise ValueError(f"Unknown cache backend '{backend}'. Choose from: {', '.join(CACHE_BACKENDS)}")
+    
+    if max_entries is None:
+        max_entries = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+    if max_bytes is None:
+        max_bytes = int(os.getenv("CACHE_MAX_MB", "256")) * 1024 * 1024
+    
+    try:
+        if backend == "redis":
+            return RedisCacheBackend(default_ttl=default_ttl, **kwargs)
+        return CACHE_BACKENDS[backend](default_ttl=default_ttl, max_entries=max_entries,
+                                       max_bytes=max_bytes, **kwargs)
+    except Exception as e:
+        if backend == "memory":
+            raise
+        print(f"Warning: {backend} cache backend unavailable ({e}); using in-memory cache")
+        return CacheManager(default_ttl=default_ttl, max_entries=max_entries, max_bytes=max_bytes)
+
+
+# Sentinel distinguishing a cache miss from a cached None
+_MISSING = object()
+
+
+# Global cache instance (CACHE_BACKEND selects memory, sqlite or redis)
+cache_manager = create_cache_backend(default_ttl=3600)  # 1 hour default
+
+
+def _canonicalize(value: Any) -> Any:
+    """
+    Convert a value into a JSON-serializable form that is stable across processes
+    
+    Raises:
+        TypeError: If the value has no stable representation (define `__cache_key__` to make it cacheable)
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (bytes, bytearray)):
+        return {"__bytes__": hashlib.sha256(value).hexdigest()}
+    if isinstance(value, dict):
+        items = [(json.dumps(_canonicalize(k), sort_keys=True), _canonicalize(v)) for k, v in value.items()]
+        return {"__dict__": sorted(items, key=lambda item: item[0])}
+    if isinstance(value, list):
+        return [_canonicalize(v) for v in value]
+    if isinstance(value, tuple):
+        return {"__tuple__": [_canonicalize(v) for v in value]}
+    if isinstance(value, (set, frozenset)):
+        return {"__set__": sorted(json.dumps(_canonicalize(v), sort_keys=True) for v in value)}
+    if isinstance(value, Enum):
+        return {"__enum__": type(value).__qualname__, "value": _canonicalize(value.value)}
+    if isinstance(value, (datetime, date)):
+        return {"__datetime__": value.isoformat()}
+    if hasattr(value, "model_dump"):
+        # Pydantic models
+        return {"__model__": type(value).__qualname__, "data": _canonicalize(value.model_dump())}
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {"__model__": type(value).__qualname__, "data": _canonicalize(dataclasses.asdict(value))}
+    if hasattr(value, "dtype") and hasattr(value, "tobytes"):
+        # numpy arrays and scalars
+        return {"__array__": str(value.dtype), "shape": list(getattr(value, "shape", ())),
+                "sha256": hashlib.sha256(value.tobytes()).hexdigest()}
+    if hasattr(value, "__cache_key__"):
+        return {"__object__": type(value).__qualname__, "key": _canonicalize(value.__cache_key__())}
+    # Identity or repr-based keys could collide once an object is freed, or across processes
+    raise TypeError(f"Cannot build a cache key from {type(value).__module__}.{type(value).__qualname__}")
+
+
+def make_cache_key(func: Callable, args: tuple, kwargs: dict, namespace: Optional[str] = None) -> str:
+    """
+    Build a stable cache key for a call
+    
+    Arguments are bound to the function signature (so `f(1)` and `f(x=1)` share a key),
+    canonicalized and hashed; the key is prefixed with its namespace.
+    
+    Raises:
+        TypeError: If an argument can't be canonicalized
+    """
+    try:
+        bound = inspect.signature(func).bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+    except (TypeError, ValueError):
+        arguments = {"args": args, "kwargs": kwargs}
+    
+    key_data = json.dumps(
+        [func.__module__, func.__qualname__, _canonicalize(arguments)],
+        sort_keys=True, separators=(",", ":")
+    )
+    return f"{namespace or func.__qualname__}:{hashlib.sha256(key_data.encode()).hexdigest()}"
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one computation"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self._async_calls: Dict[Tuple[int, str], "asyncio.Future"] = {}
+        self.coalesced = 0
+    
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        """Run func once for concurrent callers with the same key (threads)"""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            else:
+                self.coalesced += 1
+        
+        if not leader:
+            return future.result()
+        
+        try:
+            result = func()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+    
+    async def do_async(self, key: str, func: Callable[[], Any]) -> Any:
+        """Await func once for concurrent callers with the same key (tasks on one event loop)"""
+        loop = asyncio.get_running_loop()
+        call_key = (id(loop), key)
+        
+        while True:
+            with self._lock:
+                future = self._async_calls.get(call_key)
+                leader = future is None
+                if leader:
+                    future = self._async_calls[call_key] = loop.create_future()
+                else:
+                    self.coalesced += 1
             
-            return len(expired_keys)
+            if leader:
+                break
+            try:
+                # Shielded so a cancelled waiter doesn't cancel the shared computation
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The leader was cancelled; retry (possibly as the new leader)
+        
+        try:
+            result = await func()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an exception nobody waited for isn't logged
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                del self._async_calls[call_key]
 
 
-# Global cache instance
-cache_manager = CacheManager(default_ttl=3600)  # 1 hour default
+# Shared by all @cached functions
+_single_flight = SingleFlight()
 
 
 def cached(ttl: int = 3600, key_prefix: str = ""):
     """
-    Decorator to cache function results
+    Decorator to cache function results (sync and async functions)
+    
+    Keys are hashes of the canonicalized call arguments. `None` results are cached too, and
+    concurrent misses on the same key wait for a single computation. Calls with arguments that
+    can't be canonicalized (objects without `__cache_key__`) run uncached.
     
     Args:
         ttl: Time-to-live in seconds
-        key_prefix: Prefix for cache key
+        key_prefix: Prefix for cache key (also the cache namespace; defaults to the function name)
     """
     def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            # Generate cache key from function name and arguments
-            key_data = f"{key_prefix}{func.__name__}{str(args)}{str(kwargs)}"
-            cache_key = hashlib.md5(key_data.encode()).hexdigest()
-            
-            # Try to get from cache
-            cached_result = cache_manager.get(cache_key)
-            if cached_result is not None:
-                return cached_result
-            
-            # Execute function and cache result
-            result = func(*args, **kwargs)
-            cache_manager.set(cache_key, result, ttl)
-            
-            return result
+        namespace = key_prefix or func.__name__
+        
+        def cache_key(*args, **kwargs) -> str:
+            return make_cache_key(func, args, kwargs, namespace)
         
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                try:
+                    key = cache_key(*args, **kwargs)
+                except TypeError:
+                    return await func(*args, **kwargs)
+                
+                cached_result = cache_manager.get(key, _MISSING)
+                if cached_result is not _MISSING:
+                    return cached_result
+                
+                async def compute():
+                    result = await func(*args, **kwargs)
+                    cache_manager.set(key, result, ttl)
+                    return result
+                
+                return await _single_flight.do_async(key, compute)
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                try:
+                    key = cache_key(*args, **kwargs)
+                except TypeError:
+                    return func(*args, **kwargs)
+                
+                cached_result = cache_manager.get(key, _MISSING)
+                if cached_result is not _MISSING:
+                    return cached_result
+                
+                def compute():
+                    result = func(*args, **kwargs)
+                    cache_manager.set(key, result, ttl)
+                    return result
+                
+                return _single_flight.do(key, compute)
+        
+        wrapper.cache_key = cache_key
+        wrapper.invalidate = lambda *args, **kwargs: cache_manager.delete(cache_key(*args, **kwargs))
         return wrapper
     return decorator
 
 
 class RateLimiter:
-    """Token bucket rate limiter"""
+    """
+    GCRA (generic cell rate algorithm) rate limiter
+    
+    Each identifier needs a single float, its theoretical arrival time (TAT). Requests may burst up
+    to `burst` at once and then proceed at `requests_per_minute`. State is split across
+    lock-striped shards, and keys whose TAT has passed (a full bucket, identical to a new key)
+    are swept out periodically, so idle identifiers don't accumulate.
+    """
     
-    def __init__(self, requests_per_minute: int = 60):
+    def __init__(
+        self,
+        requests_per_minute: int = 60,
+        burst: Optional[int] = None,
+        num_shards: int = 16,
+        sweep_interval: float = 60.0
+    ):
         """
         Initialize rate limiter
         
         Args:
             requests_per_minute: Maximum requests allowed per minute
+            burst: Requests allowed at once (default: requests_per_minute)
+            num_shards: Number of independently locked shards
+            sweep_interval: Seconds between idle-key sweeps of a shard
         """
         self.requests_per_minute = requests_per_minute
         self.requests_per_second = requests_per_minute / 60
-        self._buckets: Dict[str, deque] = defaultdict(deque)
-        self._lock = threading.Lock()
+        self.burst = burst or requests_per_minute
+        self.emission_interval = 60.0 / requests_per_minute
+        self.sweep_interval = sweep_interval
+        self._shards: List[Dict[str, float]] = [{} for _ in range(num_shards)]
+        self._locks = [threading.Lock() for _ in range(num_shards)]
+        self._last_sweep = [time.time()] * num_shards
+        # Per-shard counters, updated under the shard lock
+        self._allowed = [0] * num_shards
+        self._rejected = [0] * num_shards
+        self._evicted = [0] * num_shards
+    
+    def _shard(self, identifier: str) -> int:
+        return hash(identifier) % len(self._shards)
+    
+    def _sweep(self, index: int, now: float) -> None:
+        """Drop keys whose bucket has fully refilled (caller holds the shard lock)"""
+        if now - self._last_sweep[index] < self.sweep_interval:
+            return
+        self._last_sweep[index] = now
+        shard = self._shards[index]
+        idle = [key for key, tat in shard.items() if tat <= now]
+        for key in idle:
+            del shard[key]
+        self._evicted[index] += len(idle)
+    
+    def check(self, identifier: str) -> Tuple[bool, float]:
+        """
+        Check and count a request for the given identifier
+        
+        Args:
+            identifier: Unique identifier (e.g., user ID, IP address)
+        
+        Returns:
+            (allowed, retry_after) where retry_after is the wait in seconds when rejected
+        """
+        index = self._shard(identifier)
+        with self._locks[index]:
+            now = time.time()
+            shard = self._shards[index]
+            tat = max(shard.get(identifier, now), now)
+            new_tat = tat + self.emission_interval
+            allow_at = new_tat - self.burst * self.emission_interval
+            
+            if now < allow_at:
+                self._rejected[index] += 1
+                return False, allow_at - now
+            
+            shard[identifier] = new_tat
+            self._allowed[index] += 1
+            self._sweep(index, now)
+            return True, 0.0
     
     def is_allowed(self, identifier: str) -> bool:
         """
@@ -155,23 +1062,14 @@ class RateLimiter:
         Returns:
             True if request is allowed, False otherwise
         """
-        with self._lock:
-            current_time = time.time()
-            window_start = current_time - 60  # 1 minute window
-            
-            # Get or create bucket for identifier
-            bucket = self._buckets[identifier]
-            
-            # Remove old requests outside window
-            while bucket and bucket[0] < window_start:
-                bucket.popleft()
-            
-            # Check if under limit
-            if len(bucket) < self.requests_per_minute:
-                bucket.append(current_time)
-                return True
-            
-            return False
+        return self.check(identifier)[0]
+    
+    def _state(self, identifier: str) -> Tuple[float, float]:
+        """(tat, now) for an identifier"""
+        index = self._shard(identifier)
+        with self._locks[index]:
+            now = time.time()
+            return max(self._shards[index].get(identifier, now), now), now
     
     def get_wait_time(self, identifier: str) -> float:
         """
@@ -183,59 +1081,66 @@ class RateLimiter:
         Returns:
             Wait time in seconds
         """
-        with self._lock:
-            bucket = self._buckets[identifier]
-            if not bucket or len(bucket) < self.requests_per_minute:
-                return 0.0
-            
-            # Time until oldest request expires from window
-            oldest_request = bucket[0]
-            current_time = time.time()
-            wait_time = 60 - (current_time - oldest_request)
-            
-            return max(0.0, wait_time)
+        tat, now = self._state(identifier)
+        allow_at = tat + self.emission_interval - self.burst * self.emission_interval
+        return max(0.0, allow_at - now)
     
     def reset(self, identifier: str) -> None:
         """Reset rate limit for identifier"""
-        with self._lock:
-            if identifier in self._buckets:
-                del self._buckets[identifier]
+        index = self._shard(identifier)
+        with self._locks[index]:
+            self._shards[index].pop(identifier, None)
     
     def get_stats(self, identifier: str) -> Dict:
         """Get rate limit statistics for identifier"""
-        with self._lock:
-            bucket = self._buckets[identifier]
-            current_time = time.time()
-            window_start = current_time - 60
-            
-            # Clean old requests
-            while bucket and bucket[0] < window_start:
-                bucket.popleft()
-            
-            return {
-                "requests_in_window": len(bucket),
-                "limit": self.requests_per_minute,
-                "remaining": self.requests_per_minute - len(bucket),
-                "wait_time": self.get_wait_time(identifier)
-            }
+        tat, now = self._state(identifier)
+        remaining = min(self.burst, int((now - (tat - self.burst * self.emission_interval)) / self.emission_interval))
+        wait_time = max(0.0, tat + self.emission_interval - self.burst * self.emission_interval - now)
+        
+        return {
+            "requests_in_window": self.burst - remaining,
+            "limit": self.requests_per_minute,
+            "burst": self.burst,
+            "remaining": remaining,
+            "wait_time": wait_time
+        }
+    
+    def get_summary(self) -> Dict:
+        """Limiter-wide counters"""
+        tracked = allowed = rejected = evicted = 0
+        for index, lock in enumerate(self._locks):
+            with lock:
+                tracked += len(self._shards[index])
+                allowed += self._allowed[index]
+                rejected += self._rejected[index]
+                evicted += self._evicted[index]
+        return {
+            "requests_per_minute": self.requests_per_minute,
+            "burst": self.burst,
+            "allowed": allowed,
+            "rejected": rejected,
+            "tracked_keys": tracked,
+            "evicted_keys": evicted
+        }
 
 
 # Global rate limiter instances
-api_rate_limiter = RateLimiter(requests_per_minute=60)
-ml_rate_limiter = RateLimiter(requests_per_minute=30)  # Lower limit for ML operations
+api_rate_limiter = RateLimiter(requests_per_minute=int(os.getenv("API_RATE_LIMIT_PER_MINUTE", "60")))
+ml_rate_limiter = RateLimiter(  # Lower limit for ML operations
+    requests_per_minute=int(os.getenv("ML_RATE_LIMIT_PER_MINUTE", "30"))
+)
 
 
 def rate_limit(limiter: RateLimiter, identifier_func: Optional[Callable] = None):
     """
-    Decorator to enforce rate limiting
+    Decorator to enforce rate limiting (sync and async functions)
     
     Args:
         limiter: RateLimiter instance to use
         identifier_func: Function to extract identifier from arguments
     """
     def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs):
+        def check(args, kwargs) -> None:
             # Get identifier
             if identifier_func:
                 identifier = identifier_func(*args, **kwargs)
@@ -244,20 +1149,222 @@ def rate_limit(limiter: RateLimiter, identifier_func: Optional[Callable] = None)
                 identifier = str(args[0]) if args else "default"
             
             # Check rate limit
-            if not limiter.is_allowed(identifier):
-                wait_time = limiter.get_wait_time(identifier)
+            allowed, wait_time = limiter.check(identifier)
+            if not allowed:
                 raise Exception(f"Rate limit exceeded. Try again in {wait_time:.1f} seconds")
+        
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                check(args, kwargs)
+                return await func(*args, **kwargs)
             
+            return async_wrapper
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            check(args, kwargs)
             return func(*args, **kwargs)
         
-        return wrapper
-    return decorator
+        return wrapper
+    return decorator
+
+
+def parse_trusted_proxies(setting: str) -> list:
+    """Parse a comma-separated list of proxy IPs/CIDR ranges (e.g. "10.0.0.0/8,127.0.0.1")"""
+    return [ipaddress.ip_network(entry.strip(), strict=False) for entry in setting.split(",") if entry.strip()]
+
+
+# Reverse proxies whose X-Forwarded-For header is trusted (empty: use the socket peer address)
+TRUSTED_PROXIES = parse_trusted_proxies(os.getenv("TRUSTED_PROXIES", ""))
+
+
+def _is_trusted_proxy(host: str, trusted_proxies: list) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in trusted_proxies)
+
+
+def client_identifier(scope: Dict, trusted_proxies: Optional[list] = None) -> str:
+    """
+    Rate-limit key for a request: the client IP
+    
+    Behind a reverse proxy every request arrives from the proxy's address. When the peer is a
+    trusted proxy (`TRUSTED_PROXIES`), the client is the right-most X-Forwarded-For address that
+    is not itself a trusted proxy; entries left of it are client-supplied and can be spoofed.
+    
+    Args:
+        scope: ASGI scope
+        trusted_proxies: Networks of trusted proxies (default: TRUSTED_PROXIES)
+    """
+    trusted_proxies = TRUSTED_PROXIES if trusted_proxies is None else trusted_proxies
+    client = scope.get("client")
+    host = client[0] if client else None
+    
+    if host and trusted_proxies and _is_trusted_proxy(host, trusted_proxies):
+        forwarded = []
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                forwarded.extend(part.strip() for part in value.decode("latin-1").split(","))
+        forwarded = [address for address in forwarded if address]
+        for address in reversed(forwarded):
+            if not _is_trusted_proxy(address, trusted_proxies):
+                host = address
+                break
+        else:
+            if forwarded:
+                host = forwarded[0]
+    
+    return f"ip:{host}" if host else "ip:unknown"
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware enforcing per-route rate limits
+    
+    The first rule whose path prefix matches selects the limiter (e.g. `ml_rate_limiter` for
+    `/api/ml/`); other paths use the default limiter. Rejected requests get a 429 response with
+    a `Retry-After` header. CORS preflight requests and exempt paths are never limited.
+    """
+    
+    def __init__(
+        self,
+        app: Callable,
+        rules: Optional[List[Tuple[str, RateLimiter]]] = None,
+        default_limiter: Optional[RateLimiter] = None,
+        identifier_func: Optional[Callable[[Dict], str]] = None,
+        exempt_paths: Tuple[str, ...] = ("/ready", "/metrics", "/docs", "/openapi.json")
+    ):
+        """
+        Args:
+            app: ASGI application
+            rules: (path prefix, limiter) pairs, checked in order
+            default_limiter: Limiter for paths matching no rule (None leaves them unlimited)
+            identifier_func: Maps the ASGI scope to a rate-limit key (default: `client_identifier`)
+            exempt_paths: Paths that are never limited
+        """
+        self.app = app
+        self.rules = rules if rules is not None else [("/api/ml/", ml_rate_limiter)]
+        self.default_limiter = default_limiter
+        self.identifier_func = identifier_func or client_identifier
+        self.exempt_paths = exempt_paths
+    
+    def _limiter(self, path: str) -> Optional[RateLimiter]:
+        if path in self.exempt_paths:
+            return None
+        for prefix, limiter in self.rules:
+            if path.startswith(prefix):
+                return limiter
+        return self.default_limiter
+    
+    async def __call__(self, scope: Dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+        
+        limiter = self._limiter(scope["path"])
+        if limiter is not None:
+            allowed, retry_after = limiter.check(self.identifier_func(scope))
+            if not allowed:
+                retry_seconds = max(1, math.ceil(retry_after))
+                body = json.dumps({
+                    "detail": f"Rate limit exceeded. Try again in {retry_seconds} seconds"
+                }).encode()
+                await send({
+                    "type": "http.response.start",
+                    "status": 429,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode()),
+                        (b"retry-after", str(retry_seconds).encode()),
+                        (b"x-ratelimit-limit", str(limiter.requests_per_minute).encode())
+                    ]
+                })
+                await send({"type": "http.response.body", "body": body})
+                return
+        
+        await self.app(scope, receive, send)
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram (HDR-style)
+    
+    Each power-of-two range above `min_value` is split into `sub_buckets` linear buckets, so
+    percentiles carry a bounded relative error (1/sub_buckets) with a few hundred counters at most.
+    """
+    
+    def __init__(self, min_value: float = 1e-6, sub_buckets: int = 16):
+        self.min_value = min_value
+        self.sub_buckets = sub_buckets
+        self.counts: Dict[int, int] = defaultdict(int)
+        self.count = 0
+    
+    def bucket_index(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        mantissa, exponent = math.frexp(value / self.min_value)  # value/min = mantissa * 2**exponent
+        return exponent * self.sub_buckets + int((mantissa - 0.5) * 2 * self.sub_buckets)
+    
+    def bucket_bounds(self, index: int) -> Tuple[float, float]:
+        if index <= 0:
+            return 0.0, self.min_value
+        exponent, sub = divmod(index, self.sub_buckets)
+        base = self.min_value * 2.0 ** (exponent - 1)
+        return base * (1 + sub / self.sub_buckets), base * (1 + (sub + 1) / self.sub_buckets)
+    
+    def record(self, value: float, count: int = 1) -> None:
+        self.counts[self.bucket_index(value)] += count
+        self.count += count
+    
+    def merge(self, other: "LatencyHistogram") -> None:
+        for index, count in other.counts.items():
+            self.counts[index] += count
+        self.count += other.count
+    
+    def percentile(self, percent: float) -> Optional[float]:
+        """Value at the given percentile (bucket midpoint)"""
+        if self.count == 0:
+            return None
+        rank = max(1, math.ceil(percent / 100 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                lower, upper = self.bucket_bounds(index)
+                return (lower + upper) / 2
+        return None
+    
+    def percentiles(self, percents: Tuple[float, ...] = (50, 90, 99)) -> Dict[str, Optional[float]]:
+        return {f"p{p:g}": self.percentile(p) for p in percents}
+    
+    def cumulative_counts(self, bounds: Tuple[float, ...]) -> List[int]:
+        """Observations at or below each bound (a bucket counts once its upper edge is within the bound)"""
+        counts = [0] * len(bounds)
+        for index, count in self.counts.items():
+            upper = self.bucket_bounds(index)[1]
+            for position, bound in enumerate(bounds):
+                if upper <= bound * (1 + 1e-9):
+                    counts[position] += count
+                    break
+        return list(itertools.accumulate(counts))
 
 
 class PerformanceMonitor:
     """Monitor function execution performance"""
     
-    def __init__(self):
+    def __init__(self, window_seconds: int = 300, slot_seconds: int = 10):
+        """
+        Initialize performance monitor
+        
+        Args:
+            window_seconds: Length of the sliding window for recent percentiles
+            slot_seconds: Granularity of the sliding window
+        """
+        self.window_seconds = window_seconds
+        self.slot_seconds = slot_seconds
         self._metrics: Dict[str, Dict] = defaultdict(lambda: {
             "calls": 0,
             "total_time": 0.0,
@@ -265,10 +1372,15 @@ class PerformanceMonitor:
             "max_time": 0.0,
             "errors": 0
         })
+        self._histograms: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        # func_name -> deque of [slot_start, histogram, errors], oldest first
+        self._windows: Dict[str, deque] = defaultdict(deque)
         self._lock = threading.Lock()
     
     def record(self, func_name: str, execution_time: float, error: bool = False) -> None:
         """Record execution metrics"""
+        now = time.time()
+        slot_start = now - now % self.slot_seconds
         with self._lock:
             metrics = self._metrics[func_name]
             metrics["calls"] += 1
@@ -277,28 +1389,74 @@ class PerformanceMonitor:
             metrics["max_time"] = max(metrics["max_time"], execution_time)
             if error:
                 metrics["errors"] += 1
+            
+            self._histograms[func_name].record(execution_time)
+            
+            window = self._windows[func_name]
+            if not window or window[-1][0] != slot_start:
+                window.append([slot_start, LatencyHistogram(), 0])
+                self._expire_slots(window, now)
+            window[-1][1].record(execution_time)
+            if error:
+                window[-1][2] += 1
+    
+    def _expire_slots(self, window: deque, now: float) -> None:
+        while window and window[0][0] <= now - self.window_seconds - self.slot_seconds:
+            window.popleft()
+    
+    def _summarize(self, func_name: str, now: float) -> Dict:
+        metrics = self._metrics[func_name].copy()
+        if metrics["calls"] > 0:
+            metrics["avg_time"] = metrics["total_time"] / metrics["calls"]
+            metrics["error_rate"] = metrics["errors"] / metrics["calls"] * 100
+        metrics.update(self._histograms[func_name].percentiles())
+        
+        window = self._windows[func_name]
+        self._expire_slots(window, now)
+        recent = LatencyHistogram()
+        recent_errors = 0
+        for slot_start, histogram, errors in window:
+            if slot_start > now - self.window_seconds - self.slot_seconds:
+                recent.merge(histogram)
+                recent_errors += errors
+        metrics["window"] = {
+            "seconds": self.window_seconds,
+            "calls": recent.count,
+            "errors": recent_errors,
+            **recent.percentiles()
+        }
+        return metrics
     
     def get_metrics(self, func_name: Optional[str] = None) -> Dict:
-        """Get performance metrics"""
+        """Get performance metrics (totals, p50/p90/p99 overall and over the sliding window)"""
+        now = time.time()
         with self._lock:
             if func_name:
                 if func_name in self._metrics:
-                    metrics = self._metrics[func_name].copy()
-                    if metrics["calls"] > 0:
-                        metrics["avg_time"] = metrics["total_time"] / metrics["calls"]
-                        metrics["error_rate"] = metrics["errors"] / metrics["calls"] * 100
-                    return metrics
+                    return self._summarize(func_name, now)
                 return {}
             else:
                 # Return all metrics
-                result = {}
-                for name, metrics in self._metrics.items():
-                    m = metrics.copy()
-                    if m["calls"] > 0:
-                        m["avg_time"] = m["total_time"] / m["calls"]
-                        m["error_rate"] = m["errors"] / m["calls"] * 100
-                    result[name] = m
-                return result
+                return {name: self._summarize(name, now) for name in list(self._metrics)}
+    
+    def snapshot(self) -> Dict[str, Tuple[Dict, LatencyHistogram]]:
+        """Totals and a copy of the all-time histogram per function, under a single lock"""
+        with self._lock:
+            snapshot = {}
+            for name, metrics in self._metrics.items():
+                histogram = LatencyHistogram()
+                histogram.merge(self._histograms[name])
+                snapshot[name] = (metrics.copy(), histogram)
+            return snapshot
+    
+    def get_histogram(self, func_name: str) -> Optional[LatencyHistogram]:
+        """All-time latency histogram for a function (a copy)"""
+        with self._lock:
+            if func_name not in self._histograms:
+                return None
+            histogram = LatencyHistogram()
+            histogram.merge(self._histograms[func_name])
+            return histogram
     
     def reset(self, func_name: Optional[str] = None) -> None:
         """Reset metrics"""
@@ -306,19 +1464,43 @@ class PerformanceMonitor:
             if func_name:
                 if func_name in self._metrics:
                     del self._metrics[func_name]
+                self._histograms.pop(func_name, None)
+                self._windows.pop(func_name, None)
             else:
                 self._metrics.clear()
+                self._histograms.clear()
+                self._windows.clear()
 
 
 # Global performance monitor
 performance_monitor = PerformanceMonitor()
 
+# Per-route request latency, recorded by PerformanceMiddleware
+request_monitor = PerformanceMonitor()
+
 
 def monitor_performance(func: Callable) -> Callable:
-    """Decorator to monitor function performance"""
+    """Decorator to monitor function performance (sync and async functions)"""
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            start_time = time.perf_counter()
+            error_occurred = False
+            
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                error_occurred = True
+                raise
+            finally:
+                execution_time = time.perf_counter() - start_time
+                performance_monitor.record(func.__name__, execution_time, error_occurred)
+        
+        return async_wrapper
+    
     @wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
+        start_time = time.perf_counter()
         error_occurred = False
         
         try:
@@ -328,111 +1510,458 @@ def monitor_performance(func: Callable) -> Callable:
             error_occurred = True
             raise
         finally:
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             performance_monitor.record(func.__name__, execution_time, error_occurred)
     
     return wrapper
 
 
+class PerformanceMiddleware:
+    """
+    ASGI middleware recording latency for every HTTP route into `request_monitor`
+    
+    Requests are keyed by method and route template (e.g. "GET /api/jobs/{job_id}") so path
+    parameters don't create new series; unmatched paths share one key. 5xx responses and
+    unhandled exceptions count as errors.
+    """
+    
+    def __init__(self, app: Callable, monitor: Optional[PerformanceMonitor] = None):
+        self.app = app
+        self.monitor = monitor or request_monitor
+    
+    async def __call__(self, scope: Dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.perf_counter()
+        status_code = 500
+        
+        async def send_wrapper(message: Dict) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "<unmatched>"
+            self.monitor.record(f"{scope['method']} {path}", time.perf_counter() - start_time,
+                                error=status_code >= 500)
+
+
+# Trace of the request being handled in the current context (set by TracingMiddleware)
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+
+
+class Trace:
+    """Spans recorded while handling one request"""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        # (name, offset from trace start, duration) in seconds
+        self.spans: List[Tuple[str, float, float]] = []
+    
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+    
+    def server_timing(self) -> str:
+        """Server-Timing header value (durations in ms; repeated stages are summed)"""
+        durations: Dict[str, float] = {}
+        for name, _, duration in self.spans:
+            durations[name] = durations.get(name, 0.0) + duration
+        entries = [f"{name};dur={duration * 1000:.1f}" for name, duration in durations.items()]
+        entries.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(entries)
+    
+    def to_dict(self, status_code: Optional[int] = None) -> Dict:
+        return {
+            "name": self.name,
+            "status_code": status_code,
+            "started_at": datetime.utcfromtimestamp(self.started_at).isoformat(),
+            "total_ms": round(self.elapsed() * 1000, 2),
+            "spans": [
+                {"name": name, "start_ms": round(offset * 1000, 2), "duration_ms": round(duration * 1000, 2)}
+                for name, offset, duration in self.spans
+            ]
+        }
+
+
+class Tracer:
+    """Per-stage span timing with an optional sampled log of slow requests"""
+    
+    def __init__(
+        self,
+        slow_threshold: Optional[float] = None,
+        sample_rate: float = 1.0,
+        max_traces: int = 50,
+        log_path: Optional[str] = None,
+        max_pending_writes: int = 1000
+    ):
+        """
+        Initialize tracer
+        
+        Args:
+            slow_threshold: Requests slower than this (seconds) are kept as slow traces (None disables)
+            sample_rate: Fraction of slow requests that are kept
+            max_traces: Slow traces kept in memory
+            log_path: Optional JSON-lines file slow traces are appended to (by a writer thread)
+            max_pending_writes: Slow traces waiting for the writer; more are dropped from the log
+        """
+        self.slow_threshold = slow_threshold
+        self.sample_rate = sample_rate
+        self.log_path = log_path
+        self.stage_monitor = PerformanceMonitor()
+        self.slow_traces: deque = deque(maxlen=max_traces)
+        self.traces = 0
+        self.dropped_writes = 0
+        self._lock = threading.Lock()
+        self._pending_writes: "queue.Queue" = queue.Queue(maxsize=max_pending_writes)
+        self._writer: Optional[threading.Thread] = None
+    
+    @contextmanager
+    def span(self, name: str):
+        """Time a stage; recorded in the stage stats and in the current request's trace"""
+        trace = _current_trace.get()
+        start_time = time.perf_counter()
+        error_occurred = False
+        try:
+            yield
+        except Exception:
+            error_occurred = True
+            raise
+        finally:
+            duration = time.perf_counter() - start_time
+            self.stage_monitor.record(name, duration, error_occurred)
+            if trace is not None:
+                trace.spans.append((name, start_time - trace.start, duration))
+    
+    def start_trace(self, name: str) -> Tuple[Trace, Any]:
+        """Start a trace for the current context; returns the trace and a reset token"""
+        trace = Trace(name)
+        return trace, _current_trace.set(trace)
+    
+    def finish_trace(self, trace: Trace, token: Any, status_code: Optional[int] = None) -> None:
+        """End a trace and keep it if it was slow (and sampled)"""
+        _current_trace.reset(token)
+        with self._lock:
+            self.traces += 1
+        if self.slow_threshold is None or trace.elapsed() < self.slow_threshold:
+            return
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        
+        record = trace.to_dict(status_code)
+        with self._lock:
+            self.slow_traces.append(record)
+            if not self.log_path:
+                return
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_log, name="slow-trace-writer", daemon=True)
+                self._writer.start()
+        # File I/O stays off the event loop; a full queue drops the record rather than blocking
+        try:
+            self._pending_writes.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped_writes += 1
+    
+    def _write_log(self) -> None:
+        """Writer thread: append queued slow traces to the log file"""
+        while True:
+            records = [self._pending_writes.get()]
+            while True:
+                try:
+                    records.append(self._pending_writes.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with open(self.log_path, "a") as f:
+                    f.writelines(json.dumps(record) + "\n" for record in records)
+            except OSError as e:
+                print(f"Warning: could not write slow trace log: {e}")
+            finally:
+                for _ in records:
+                    self._pending_writes.task_done()
+    
+    def flush(self) -> None:
+        """Block until queued slow traces are written to the log"""
+        self._pending_writes.join()
+    
+    def get_stats(self) -> Dict:
+        """Per-stage timings and recent slow traces"""
+        with self._lock:
+            slow_traces = list(self.slow_traces)[-10:]
+            traces = self.traces
+            dropped_writes = self.dropped_writes
+        return {
+            "traces": traces,
+            "dropped_log_writes": dropped_writes,
+            "slow_threshold_ms": self.slow_threshold * 1000 if self.slow_threshold is not None else None,
+            "sample_rate": self.sample_rate,
+            "stages": self.stage_monitor.get_metrics(),
+            "slow_traces": slow_traces
+        }
+
+
+def _env_float(name: str) -> Optional[float]:
+    value = os.getenv(name, "").strip()
+    return float(value) if value else None
+
+
+# Global tracer (SLOW_TRACE_THRESHOLD_MS enables the slow trace log)
+_slow_trace_ms = _env_float("SLOW_TRACE_THRESHOLD_MS")
+_trace_sample_rate = _env_float("TRACE_SAMPLE_RATE")
+request_tracer = Tracer(
+    slow_threshold=_slow_trace_ms / 1000 if _slow_trace_ms is not None else None,
+    sample_rate=_trace_sample_rate if _trace_sample_rate is not None else 1.0,
+    log_path=os.getenv("TRACE_LOG_PATH") or None
+)
+span = request_tracer.span
+
+
+class TracingMiddleware:
+    """ASGI middleware that traces each HTTP request and adds a `Server-Timing` header"""
+    
+    def __init__(self, app: Callable, tracer: Optional[Tracer] = None):
+        self.app = app
+        self.tracer = tracer or request_tracer
+    
+    async def __call__(self, scope: Dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        trace, token = self.tracer.start_trace(f"{scope['method']} {scope['path']}")
+        status_code = 500
+        
+        async def send_wrapper(message: Dict) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", trace.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            if getattr(route, "path", None):
+                trace.name = f"{scope['method']} {route.path}"
+            self.tracer.finish_trace(trace, token, status_code)
+
+
+# Job priorities (lower runs first)
+JOB_PRIORITIES = {"high": 0, "normal": 5, "low": 10}
+
+
 class BackgroundJobQueue:
-    """Simple background job queue for async processing"""
+    """
+    Background job queue with priorities and result tracking
+    
+    Workers block on a priority queue (no polling) and are started on first enqueue. Each job's
+    status, result or error is kept for `result_ttl` seconds after it finishes.
+    """
     
-    def __init__(self, max_workers: int = 5):
+    def __init__(self, max_workers: int = 5, result_ttl: int = 3600, max_jobs: int = 10000,
+                 max_queued: Optional[int] = 1000):
         """
         Initialize job queue
         
         Args:
             max_workers: Maximum concurrent workers
+            result_ttl: Seconds a finished job's status and result are kept
+            max_jobs: Maximum finished jobs kept (oldest are dropped first)
+            max_queued: Maximum jobs waiting to run; enqueue raises queue.Full beyond it (None for unbounded)
         """
         self.max_workers = max_workers
-        self._queue: deque = deque()
+        self.result_ttl = result_ttl
+        self.max_jobs = max_jobs
+        self.max_queued = max_queued
+        # (priority, sequence, job_id); job_id None tells a worker to exit
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._sequence = itertools.count()
         self._workers: list = []
         self._lock = threading.Lock()
         self._running = False
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        # (expires_at, job_id) in finishing order; constant TTL keeps it sorted
+        self._finished: deque = deque()
+        # Jobs currently queued / running
+        self._counts = {"queued": 0, "running": 0}
         self._stats = {
             "total_jobs": 0,
             "completed_jobs": 0,
-            "failed_jobs": 0
+            "failed_jobs": 0,
+            "cancelled_jobs": 0
         }
     
     def start(self) -> None:
         """Start background workers"""
-        self._running = True
-        for _ in range(self.max_workers):
-            worker = threading.Thread(target=self._worker, daemon=True)
-            worker.start()
-            self._workers.append(worker)
-    
-    def stop(self) -> None:
-        """Stop background workers"""
-        self._running = False
-        for worker in self._workers:
-            worker.join(timeout=5)
-        self._workers.clear()
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            for i in range(self.max_workers):
+                worker = threading.Thread(target=self._worker, name=f"job-worker-{i}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+    
+    def stop(self, timeout: float = 5) -> None:
+        """Stop background workers (running jobs finish; queued jobs stay queued)"""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            workers, self._workers = self._workers, []
+        for _ in workers:
+            self._queue.put((float("-inf"), next(self._sequence), None))
+        for worker in workers:
+            worker.join(timeout=timeout)
     
-    def enqueue(self, func: Callable, *args, **kwargs) -> str:
+    def enqueue(self, func: Callable, *args, priority: Any = "normal", name: Optional[str] = None,
+                owner: Optional[str] = None, **kwargs) -> str:
         """
         Add job to queue
         
         Args:
-            func: Function to execute
+            func: Function to execute (sync or async)
             *args, **kwargs: Arguments for function
+            priority: "high", "normal", "low" or a number (lower runs first)
+            name: Display name (default: function name)
+            owner: ID of the user who enqueued the job (for access checks)
             
         Returns:
             Job ID
+        
+        Raises:
+            queue.Full: max_queued jobs are already waiting
         """
-        job_id = hashlib.md5(f"{time.time()}{func.__name__}".encode()).hexdigest()
+        priority_value = JOB_PRIORITIES[priority] if isinstance(priority, str) else priority
+        job_id = uuid.uuid4().hex
         
         with self._lock:
-            self._queue.append({
+            if self.max_queued is not None and self._counts["queued"] >= self.max_queued:
+                raise queue.Full(f"Job queue is full ({self.max_queued} jobs waiting)")
+            self._expire(time.time())
+            self._jobs[job_id] = {
                 "id": job_id,
+                "name": name or func.__name__,
+                "status": "queued",
+                "priority": priority_value,
+                "owner": owner,
+                "created_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+                "result": None,
+                "error": None,
                 "func": func,
                 "args": args,
-                "kwargs": kwargs,
-                "created_at": time.time()
-            })
+                "kwargs": kwargs
+            }
             self._stats["total_jobs"] += 1
+            self._counts["queued"] += 1
         
+        self._queue.put((priority_value, next(self._sequence), job_id))
+        if not self._running:
+            self.start()
         return job_id
     
+    def _expire(self, now: float) -> None:
+        """Drop finished jobs past their TTL, or beyond max_jobs (caller holds the lock)"""
+        while self._finished and (self._finished[0][0] <= now or len(self._finished) > self.max_jobs):
+            _, job_id = self._finished.popleft()
+            self._jobs.pop(job_id, None)
+    
+    def _finish(self, job: Dict[str, Any], status: str, result: Any = None, error: Optional[str] = None) -> None:
+        """Record a job's outcome (caller holds the lock)"""
+        now = time.time()
+        self._counts[job["status"]] -= 1
+        job.update(status=status, result=result, error=error, finished_at=now,
+                   func=None, args=None, kwargs=None)
+        self._stats[f"{status}_jobs"] += 1
+        self._finished.append((now + self.result_ttl, job["id"]))
+        self._expire(now)
+    
     def _worker(self) -> None:
         """Worker thread to process jobs"""
-        while self._running:
-            job = None
+        while True:
+            _, _, job_id = self._queue.get()
+            if job_id is None:
+                return
             
             with self._lock:
-                if self._queue:
-                    job = self._queue.popleft()
+                job = self._jobs.get(job_id)
+                if job is None or job["status"] != "queued":
+                    continue
+                job["status"] = "running"
+                job["started_at"] = time.time()
+                self._counts["queued"] -= 1
+                self._counts["running"] += 1
+                func, args, kwargs = job["func"], job["args"], job["kwargs"]
             
-            if job:
-                try:
-                    job["func"](*job["args"], **job["kwargs"])
-                    with self._lock:
-                        self._stats["completed_jobs"] += 1
-                except Exception as e:
-                    print(f"Job {job['id']} failed: {str(e)}")
-                    with self._lock:
-                        self._stats["failed_jobs"] += 1
-            else:
-                # No jobs, wait a bit
-                time.sleep(0.1)
+            try:
+                result = func(*args, **kwargs)
+                if inspect.iscoroutine(result):
+                    result = asyncio.run(result)
+                outcome = {"status": "completed", "result": result}
+            except Exception as e:
+                print(f"Job {job_id} failed: {str(e)}")
+                outcome = {"status": "failed", "error": str(e)}
+            
+            with self._lock:
+                self._finish(job, **outcome)
+    
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that hasn't started yet"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["status"] != "queued":
+                return False
+            self._finish(job, "cancelled")
+            return True
+    
+    def get_status(self, job_id: str) -> Optional[Dict]:
+        """Status, timings and result of a job (None if unknown or expired)"""
+        with self._lock:
+            self._expire(time.time())
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            status = {k: v for k, v in job.items() if k not in ("func", "args", "kwargs")}
+        
+        for field in ("created_at", "started_at", "finished_at"):
+            if status[field] is not None:
+                status[field] = datetime.utcfromtimestamp(status[field]).isoformat()
+        return status
     
     def get_stats(self) -> Dict:
         """Get queue statistics"""
         with self._lock:
             return {
-                "queue_size": len(self._queue),
+                "queue_size": self._counts["queued"],
+                "running": self._counts["running"],
                 "workers": len(self._workers),
+                "tracked_jobs": len(self._jobs),
                 **self._stats
             }
 
 
 # Global background job queue
-job_queue = BackgroundJobQueue(max_workers=5)
+job_queue = BackgroundJobQueue(
+    max_workers=int(os.getenv("JOB_WORKERS", "5")),
+    max_queued=int(os.getenv("JOB_QUEUE_MAX_QUEUED", "1000"))
+)
 
 
 def background_job(func: Callable) -> Callable:
-    """Decorator to run function as background job"""
+    """Decorator to run function as background job (returns the job ID)"""
     @wraps(func)
     def wrapper(*args, **kwargs):
         return job_queue.enqueue(func, *args, **kwargs)
@@ -462,66 +1991,468 @@ def batch_query_optimizer(query_func: Callable, batch_size: int = 100):
     return wrapper
 
 
-class ConnectionPool:
-    """Simple connection pool for database connections"""
+class ConnectionPoolMonitor:
+    """Live statistics of a SQLAlchemy engine's connection pool"""
+    
+    def __init__(self):
+        self.engine = None
+        self._lock = threading.Lock()
+        self._checked_out = 0
+        self._stats = {"connects": 0, "checkouts": 0, "invalidations": 0, "peak_checked_out": 0}
     
-    def __init__(self, max_connections: int = 10):
+    def attach(self, engine: Any) -> None:
         """
-        Initialize connection pool
+        Track an engine's pool through pool events
         
         Args:
-            max_connections: Maximum number of connections
+            engine: SQLAlchemy engine
         """
-        self.max_connections = max_connections
-        self._connections: deque = deque()
-        self._in_use: int = 0
+        from sqlalchemy import event
+        
+        self.engine = engine
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+    
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self._stats["connects"] += 1
+    
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        with self._lock:
+            self._stats["checkouts"] += 1
+            self._checked_out += 1
+            self._stats["peak_checked_out"] = max(self._stats["peak_checked_out"], self._checked_out)
+    
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self._checked_out = max(0, self._checked_out - 1)
+    
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self._stats["invalidations"] += 1
+    
+    def get_stats(self) -> Dict:
+        """Pool size, checked-out and overflow connections (QueuePool), plus event counters"""
+        if self.engine is None:
+            return {"attached": False}
+        
+        pool = self.engine.pool
+        stats = {"dialect": self.engine.dialect.name, "pool": type(pool).__name__}
+        # Only QueuePool reports sizing; other pool classes (e.g. SQLite :memory:) just get counters
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            method = getattr(pool, name, None)
+            if callable(method):
+                stats[name] = method()
+        if "size" in stats:
+            stats["max_overflow"] = getattr(pool, "_max_overflow", None)
+            stats["timeout"] = pool.timeout()
+        with self._lock:
+            stats["checked_out"] = self._checked_out
+            stats.update(self._stats)
+        return stats
+
+
+# Global pool monitor (attached to the application engine by main)
+connection_pool = ConnectionPoolMonitor()
+
+
+class ModelLoader:
+    """
+    Thread-safe one-time model loading with per-model load state and timings
+    
+    States: pending, loading, ready (warmed up, or loaded on demand by a request), failed (load
+    failed; retried on the next `get`) and warmup_failed (loaded, but the dummy inference raised).
+    """
+    
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._warmups: Dict[str, Optional[Callable[[Any], Any]]] = {}
+        self._models: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._status: Dict[str, Dict] = {}
         self._lock = threading.Lock()
     
-    def get_connection(self) -> Optional[Any]:
-        """Get connection from pool"""
+    def register(self, name: str, factory: Callable[[], Any],
+                 warmup: Optional[Callable[[Any], Any]] = None) -> None:
+        """
+        Register a model
+        
+        Args:
+            name: Model name
+            factory: Zero-argument callable that loads the model
+            warmup: Optional callable running one dummy inference on the loaded model
+        """
         with self._lock:
-            if self._connections:
-                self._in_use += 1
-                return self._connections.popleft()
-            elif self._in_use < self.max_connections:
-                # Create new connection (implement based on your DB)
-                self._in_use += 1
-                return None  # Return actual connection object
+            self._factories[name] = factory
+            self._warmups[name] = warmup
+            self._locks.setdefault(name, threading.Lock())
+            self._status.setdefault(name, {
+                "state": "pending",
+                "load_time": None,
+                "warmup_time": None,
+                "loaded_at": None,
+                "error": None
+            })
+    
+    @property
+    def names(self) -> list:
+        """Registered model names"""
+        return list(self._factories)
+    
+    def get(self, name: str) -> Any:
+        """Get a model, loading it on first use (concurrent callers share one load)"""
+        return self._load(name, state="ready")
+    
+    def _load(self, name: str, state: str) -> Any:
+        """Load a model once, setting `state` on success"""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        
+        with span(f"load_{name}"), self._locks[name]:
+            model = self._models.get(name)
+            if model is not None:
+                return model
+            
+            self._set_status(name, state="loading", error=None)
+            start_time = time.time()
+            try:
+                model = self._factories[name]()
+            except Exception as e:
+                self._set_status(name, state="failed", error=str(e),
+                                 load_time=time.time() - start_time)
+                raise
+            
+            self._models[name] = model
+            self._set_status(name, state=state, load_time=time.time() - start_time,
+                             loaded_at=datetime.utcnow().isoformat())
+            return model
+    
+    def is_loaded(self, name: str) -> bool:
+        """Check whether a model has been loaded"""
+        return name in self._models
+    
+    def warm_up(self, names: Optional[list] = None) -> Dict:
+        """
+        Load models and run one dummy inference on each
+        
+        Args:
+            names: Models to warm up (default: all registered)
+        
+        Returns:
+            Per-model status after warm-up
+        """
+        for name in (names if names is not None else self.names):
+            if name not in self._factories:
+                continue
+            try:
+                model = self._load(name, state="loading")
+            except Exception:
+                continue
+            
+            warmup = self._warmups.get(name)
+            start_time = time.time()
+            try:
+                if warmup is not None:
+                    warmup(model)
+            except Exception as e:
+                self._set_status(name, state="warmup_failed", error=f"Warm-up failed: {e}",
+                                 warmup_time=time.time() - start_time)
             else:
-                raise Exception("Connection pool exhausted")
+                self._set_status(name, state="ready", warmup_time=time.time() - start_time)
+        
+        return self.get_status()
+    
+    def warm_up_async(self, names: Optional[list] = None) -> threading.Thread:
+        """Warm up models in a background thread"""
+        thread = threading.Thread(target=self.warm_up, args=(names,), name="model-warmup", daemon=True)
+        thread.start()
+        return thread
     
-    def release_connection(self, connection: Any) -> None:
-        """Return connection to pool"""
+    def is_ready(self, names: Optional[list] = None) -> bool:
+        """
+        Check whether all given models are ready
+        
+        Models whose warm-up failed are loaded and still serve requests, so they don't hold back
+        readiness; they are reported by `degraded` instead.
+        """
         with self._lock:
-            self._connections.append(connection)
-            self._in_use -= 1
+            return all(
+                self._status.get(name, {}).get("state") in ("ready", "warmup_failed")
+                for name in (names if names is not None else self._factories)
+            )
     
-    def get_stats(self) -> Dict:
-        """Get pool statistics"""
+    def degraded(self, names: Optional[list] = None) -> list:
+        """Models that loaded but failed their warm-up inference"""
         with self._lock:
-            return {
-                "available": len(self._connections),
-                "in_use": self._in_use,
-                "max_connections": self.max_connections
+            return [
+                name for name in (names if names is not None else self._factories)
+                if self._status.get(name, {}).get("state") == "warmup_failed"
+            ]
+    
+    def get_status(self) -> Dict:
+        """Get per-model load state and timings"""
+        with self._lock:
+            return {name: status.copy() for name, status in self._status.items()}
+    
+    def _set_status(self, name: str, **fields) -> None:
+        with self._lock:
+            self._status[name].update(fields)
+
+
+# Global model loader
+model_loader = ModelLoader()
+
+
+# Additional stats sources (e.g. model-level caches) included in the report
+_stats_providers: Dict[str, Callable[[], Dict]] = {}
+
+
+def register_stats_provider(name: str, provider: Callable[[], Dict]) -> None:
+    """
+    Register a callable whose stats are included in the performance report
+    
+    Args:
+        name: Report section name
+        provider: Zero-argument callable returning a stats dictionary
+    """
+    _stats_providers[name] = provider
+
+
+class BatchSizeStats:
+    """Distribution of inference batch sizes per model (power-of-two buckets)"""
+    
+    BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._models: Dict[str, Dict] = {}
+    
+    def record(self, model: str, size: int) -> None:
+        """Record one inference call over `size` inputs"""
+        with self._lock:
+            stats = self._models.get(model)
+            if stats is None:
+                stats = self._models[model] = {"counts": [0] * (len(self.BUCKETS) + 1), "batches": 0, "items": 0,
+                                               "max": 0}
+            stats["counts"][bisect.bisect_left(self.BUCKETS, size)] += 1
+            stats["batches"] += 1
+            stats["items"] += size
+            stats["max"] = max(stats["max"], size)
+    
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {model: {**stats, "counts": list(stats["counts"])} for model, stats in self._models.items()}
+    
+    def get_stats(self) -> Dict:
+        """Batches, items, average and largest batch per model"""
+        return {
+            model: {
+                "batches": stats["batches"],
+                "items": stats["items"],
+                "avg_batch_size": round(stats["items"] / stats["batches"], 2),
+                "max_batch_size": stats["max"]
             }
+            for model, stats in self.snapshot().items()
+        }
+
+
+# Global inference batch size stats
+inference_batches = BatchSizeStats()
+
+
+# Prometheus text exposition
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"  # Starlette appends the charset
+METRICS_PREFIX = "resume_screener_"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Extra metric sources: callables returning (name, type, help, samples) families
+_metrics_collectors: List[Callable[[], List[Tuple]]] = []
+
+
+def register_metrics_collector(collector: Callable[[], List[Tuple]]) -> None:
+    """
+    Register a callable whose metrics are included in /metrics
+    
+    Args:
+        collector: Zero-argument callable returning (name, type, help, samples) tuples, where
+            samples is a list of (labels dict, value) pairs or (suffix, labels dict, value) triples
+    """
+    _metrics_collectors.append(collector)
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: Optional[float]) -> str:
+    if value is None:
+        return "NaN"
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        return repr(value)
+    return str(int(value))
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if math.isinf(bound) else f"{bound:g}"
+
+
+def _histogram_samples(labels: Dict, cumulative: List[int], bounds: Tuple, total: int, value_sum: float) -> List:
+    samples = [("_bucket", {**labels, "le": _format_bound(bound)}, count) for bound, count in zip(bounds, cumulative)]
+    samples.append(("_bucket", {**labels, "le": "+Inf"}, total))
+    samples.append(("_sum", labels, value_sum))
+    samples.append(("_count", labels, total))
+    return samples
+
+
+def _process_rss_bytes() -> Optional[int]:
+    """Resident set size of this process (psutil, else /proc)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def collect_metrics() -> List[Tuple]:
+    """Metric families for the core performance components"""
+    families = []
+    
+    routes = request_monitor.snapshot()
+    latency, errors = [], []
+    for route, (metrics, histogram) in sorted(routes.items()):
+        labels = {"route": route}
+        latency.extend(_histogram_samples(labels, histogram.cumulative_counts(LATENCY_BUCKETS), LATENCY_BUCKETS,
+                                          metrics["calls"], metrics["total_time"]))
+        errors.append((labels, metrics["errors"]))
+    families.append(("http_request_duration_seconds", "histogram", "HTTP request latency by route", latency))
+    families.append(("http_request_errors_total", "counter", "HTTP requests answered with a 5xx status", errors))
+    
+    cache = cache_manager.get_counters()
+    cache_labels = {"backend": cache.get("backend", cache_manager.name)}
+    for field, help_text in (("hits", "Cache hits"), ("misses", "Cache misses"), ("evictions", "Cache evictions")):
+        if cache.get(field) is not None:
+            families.append((f"cache_{field}_total", "counter", help_text, [(cache_labels, cache[field])]))
+    if cache.get("size") is not None:
+        families.append(("cache_entries", "gauge", "Cached entries", [(cache_labels, cache["size"])]))
+    if cache.get("bytes") is not None:
+        families.append(("cache_bytes", "gauge", "Estimated size of cached values", [(cache_labels, cache["bytes"])]))
+    families.append(("cache_coalesced_misses_total", "counter", "Cache misses served by another caller's computation",
+                     [({}, _single_flight.coalesced)]))
+    
+    jobs = job_queue.get_stats()
+    queue_labels = {"queue": "memory"}
+    families.append(("job_queue_depth", "gauge", "Jobs waiting to run", [(queue_labels, jobs["queue_size"])]))
+    families.append(("job_queue_running", "gauge", "Jobs running", [(queue_labels, jobs["running"])]))
+    families.append(("jobs_finished_total", "counter", "Finished background jobs by outcome", [
+        ({**queue_labels, "outcome": outcome}, jobs[f"{outcome}_jobs"])
+        for outcome in ("completed", "failed", "cancelled")
+    ]))
+    
+    limiters = {"api": api_rate_limiter.get_summary(), "ml": ml_rate_limiter.get_summary()}
+    families.append(("rate_limit_rejected_total", "counter", "Requests rejected by the rate limiter",
+                     [({"limiter": name}, summary["rejected"]) for name, summary in limiters.items()]))
+    families.append(("rate_limit_allowed_total", "counter", "Requests allowed by the rate limiter",
+                     [({"limiter": name}, summary["allowed"]) for name, summary in limiters.items()]))
+    
+    models = model_loader.get_status()
+    families.append(("model_load_seconds", "gauge", "Time taken to load each model", [
+        ({"model": name}, status["load_time"]) for name, status in sorted(models.items())
+        if status["load_time"] is not None
+    ]))
+    families.append(("model_warmup_seconds", "gauge", "Time taken to warm up each model", [
+        ({"model": name}, status["warmup_time"]) for name, status in sorted(models.items())
+        if status["warmup_time"] is not None
+    ]))
+    families.append(("model_loaded", "gauge", "Whether each model is loaded (1) or not (0)", [
+        ({"model": name}, int(status["state"] in ("ready", "warmup_failed"))) for name, status in sorted(models.items())
+    ]))
+    
+    batches = []
+    for model, stats in sorted(inference_batches.snapshot().items()):
+        cumulative = list(itertools.accumulate(stats["counts"][:-1]))
+        batches.extend(_histogram_samples({"model": model}, cumulative, BatchSizeStats.BUCKETS,
+                                          stats["batches"], stats["items"]))
+    families.append(("inference_batch_size", "histogram", "Inputs per model inference call", batches))
+    
+    database = connection_pool.get_stats()
+    if "checkedout" in database:
+        families.append(("db_pool_checked_out", "gauge", "Database connections checked out",
+                         [({}, database["checkedout"])]))
+        families.append(("db_pool_overflow", "gauge", "Database connections beyond the pool size",
+                         [({}, max(0, database["overflow"]))]))
+        families.append(("db_pool_size", "gauge", "Database connection pool size", [({}, database["size"])]))
+    
+    rss = _process_rss_bytes()
+    if rss is not None:
+        families.append(("process_resident_memory_bytes", "gauge", "Resident set size of this process",
+                         [({}, rss)]))
+    
+    return families
+
+
+def render_metrics() -> str:
+    """Render all metrics in the Prometheus text exposition format"""
+    families = collect_metrics()
+    for collector in list(_metrics_collectors):
+        try:
+            families.extend(collector())
+        except Exception as e:
+            print(f"Warning: metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+    
+    # Collectors may add samples to an existing family (e.g. another queue's depth)
+    merged: Dict[str, Tuple[str, str, List]] = {}
+    for name, metric_type, help_text, samples in families:
+        merged.setdefault(name, (metric_type, help_text, []))[2].extend(samples)
+    
+    lines = []
+    for name, (metric_type, help_text, samples) in merged.items():
+        name = METRICS_PREFIX + name
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for sample in samples:
+            suffix, labels, value = sample if len(sample) == 3 else ("", *sample)
+            label_text = ",".join(f'{key}="{_escape_label(val)}"' for key, val in labels.items())
+            lines.append(f"{name}{suffix}{{{label_text}}} {_format_value(value)}" if label_text
+                         else f"{name}{suffix} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
 
 
 # Utility functions
 
 def get_performance_report() -> Dict:
     """Get comprehensive performance report"""
-    return {
+    report = {
         "timestamp": datetime.utcnow().isoformat(),
-        "cache": cache_manager.get_stats(),
+        "cache": {**cache_manager.get_stats(), "coalesced_misses": _single_flight.coalesced},
         "performance": performance_monitor.get_metrics(),
+        "requests": request_monitor.get_metrics(),
+        "tracing": request_tracer.get_stats(),
         "job_queue": job_queue.get_stats(),
-        "api_rate_limit": {
-            "requests_per_minute": api_rate_limiter.requests_per_minute
-        },
-        "ml_rate_limit": {
-            "requests_per_minute": ml_rate_limiter.requests_per_minute
-        }
+        "database": connection_pool.get_stats(),
+        "inference_batches": inference_batches.get_stats(),
+        "models": model_loader.get_status(),
+        "api_rate_limit": api_rate_limiter.get_summary(),
+        "ml_rate_limit": ml_rate_limiter.get_summary()
     }
+    
+    for name, provider in list(_stats_providers.items()):
+        try:
+            report[name] = provider()
+        except Exception as e:
+            report[name] = {"error": str(e)}
+    
+    return report
 
 
 def cleanup_resources() -> Dict:
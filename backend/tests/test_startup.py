@@ -0,0 +1,27 @@
+"""
+Cold-start regression tests for the API worker
+Imports run in a fresh interpreter so modules loaded by other tests don't hide regressions
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + '/..')
+from import_report import measure_imports, get_import_report
+
+# Generous budget for slow CI machines; the ML stack alone takes several seconds to import
+COLD_START_BUDGET = float(os.getenv("COLD_START_BUDGET", "4.0"))
+
+
+def test_main_does_not_import_ml_stack():
+    measurement = measure_imports("main")
+
+    assert measurement["heavy_modules"] == []
+
+
+def test_main_cold_start_time():
+    report = get_import_report("main", top=10)
+    print(f"\nCold start: {report['total_time'] * 1000:.0f}ms")
+    for package in report["packages"]:
+        print(f"  {package['package']}: {package['time'] * 1000:.1f}ms")
+
+    assert report["total_time"] < COLD_START_BUDGET
@@ -0,0 +1,259 @@
+"""
+Streaming Drift Monitor
+Unsupervised drift detection on resume embeddings, predicted roles and scores with constant memory per window
+"""
+
+from collections import Counter, deque
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+import threading
+import time
+import numpy as np
+
+
+def population_stability_index(reference: np.ndarray, current: np.ndarray, epsilon: float = 1e-4) -> float:
+    """PSI between two histograms (counts); > 0.2 is commonly treated as significant drift"""
+    ref = reference / reference.sum() if reference.sum() else reference
+    cur = current / current.sum() if current.sum() else current
+    ref = np.clip(ref, epsilon, None)
+    cur = np.clip(cur, epsilon, None)
+    return float(np.sum((cur - ref) * np.log(cur / ref)))
+
+
+class RunningMoments:
+    """Streaming per-dimension mean and variance (Chan et al. batch update)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean: Optional[np.ndarray] = None
+        self._m2: Optional[np.ndarray] = None
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of observations, shape (n, dims)"""
+        values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+        n = values.shape[0]
+        if n == 0:
+            return
+
+        batch_mean = values.mean(axis=0)
+        batch_m2 = ((values - batch_mean) ** 2).sum(axis=0)
+
+        if self.count == 0:
+            self.count, self.mean, self._m2 = n, batch_mean, batch_m2
+            return
+
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean = self.mean + delta * n / total
+        self._m2 = self._m2 + batch_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+
+    @property
+    def variance(self) -> Optional[np.ndarray]:
+        return self._m2 / self.count if self.count else None
+
+    @property
+    def dims(self) -> int:
+        return 0 if self.mean is None else self.mean.shape[0]
+
+
+class WindowStats:
+    """Sufficient statistics for one monitoring window (no raw inputs retained)"""
+
+    def __init__(self, score_edges: np.ndarray):
+        self.started_at = time.time()
+        self.embeddings = RunningMoments()
+        self.roles: Counter = Counter()
+        self.score_edges = score_edges
+        self.score_histogram = np.zeros(len(score_edges) - 1)
+        self.scores = RunningMoments()
+
+    @property
+    def count(self) -> int:
+        return max(self.embeddings.count, sum(self.roles.values()), self.scores.count)
+
+    def summary(self) -> Dict:
+        return {
+            "started_at": datetime.utcfromtimestamp(self.started_at).isoformat(),
+            "embeddings": self.embeddings.count,
+            "embedding_dims": self.embeddings.dims,
+            "predictions": sum(self.roles.values()),
+            "role_histogram": dict(self.roles.most_common()),
+            "scores": self.scores.count,
+            "score_mean": round(float(self.scores.mean[0]), 3) if self.scores.count else None,
+            "score_std": round(float(np.sqrt(self.scores.variance[0])), 3) if self.scores.count else None
+        }
+
+
+class DriftMonitor:
+    """Compare rolling windows of model inputs/outputs against a reference snapshot"""
+
+    def __init__(
+        self,
+        window_seconds: int = 3600,
+        min_samples: int = 50,
+        score_range: Tuple[float, float] = (0.0, 100.0),
+        score_bins: int = 20,
+        psi_threshold: float = 0.2,
+        embedding_shift_threshold: float = 0.5,
+        max_alerts: int = 100
+    ):
+        """
+        Initialize drift monitor
+
+        Args:
+            window_seconds: Length of a monitoring window
+            min_samples: Observations a window needs before it is compared (or used as reference)
+            score_range: Range of the score histogram (values outside are clipped)
+            score_bins: Number of score histogram bins
+            psi_threshold: PSI above which role/score distributions are flagged
+            embedding_shift_threshold: Mean standardized centroid shift above which embeddings are flagged
+            max_alerts: Alerts kept in memory
+        """
+        self.window_seconds = window_seconds
+        self.min_samples = min_samples
+        self.score_edges = np.linspace(score_range[0], score_range[1], score_bins + 1)
+        self.psi_threshold = psi_threshold
+        self.embedding_shift_threshold = embedding_shift_threshold
+
+        self.reference: Optional[WindowStats] = None
+        self.current = WindowStats(self.score_edges)
+        self.last_comparison: Optional[Dict] = None
+        self.alerts: deque = deque(maxlen=max_alerts)
+        self.windows_closed = 0
+        self._lock = threading.Lock()
+
+    def observe(self, embedding: Optional[Iterable[float]] = None, prediction: Optional[str] = None,
+                score: Optional[float] = None) -> None:
+        """Record one embedding, predicted role and/or score"""
+        self.observe_batch(
+            embeddings=None if embedding is None else [embedding],
+            predictions=None if prediction is None else [prediction],
+            scores=None if score is None else [score]
+        )
+
+    def observe_batch(self, embeddings: Optional[Iterable] = None, predictions: Optional[Iterable[str]] = None,
+                      scores: Optional[Iterable[float]] = None) -> None:
+        """Record a batch of observations"""
+        with self._lock:
+            if time.time() - self.current.started_at >= self.window_seconds:
+                self._rotate()
+
+            window = self.current
+            if embeddings is not None:
+                values = np.atleast_2d(np.asarray(embeddings, dtype=np.float64))
+                if window.embeddings.dims and values.shape[1] != window.embeddings.dims:
+                    # Embedding model changed; statistics are no longer comparable
+                    window.embeddings = RunningMoments()
+                    if self.reference is not None:
+                        self.reference.embeddings = RunningMoments()
+                window.embeddings.update(values)
+            if predictions is not None:
+                window.roles.update(str(p) for p in predictions)
+            if scores is not None:
+                values = np.clip(np.asarray(list(scores), dtype=np.float64), self.score_edges[0], self.score_edges[-1])
+                window.score_histogram += np.histogram(values, bins=self.score_edges)[0]
+                window.scores.update(values.reshape(-1, 1))
+
+    def set_reference(self) -> bool:
+        """Freeze the current window as the reference snapshot and start a new window"""
+        with self._lock:
+            if self.current.count < self.min_samples:
+                return False
+            self.reference = self.current
+            self.current = WindowStats(self.score_edges)
+            return True
+
+    def rotate(self) -> Optional[Dict]:
+        """Close the current window (comparing it to the reference) and start a new one"""
+        with self._lock:
+            return self._rotate()
+
+    def _rotate(self) -> Optional[Dict]:
+        closed, self.current = self.current, WindowStats(self.score_edges)
+        if closed.count < self.min_samples:
+            return None
+
+        self.windows_closed += 1
+        if self.reference is None:
+            self.reference = closed
+            return None
+
+        comparison = self._compare(self.reference, closed)
+        self.last_comparison = comparison
+        for alert in comparison["alerts"]:
+            self.alerts.append(alert)
+        return comparison
+
+    def compare(self) -> Optional[Dict]:
+        """Compare the (still open) current window with the reference"""
+        with self._lock:
+            if self.reference is None or self.current.count == 0:
+                return None
+            return self._compare(self.reference, self.current)
+
+    def _compare(self, reference: WindowStats, window: WindowStats) -> Dict:
+        metrics = {}
+        alerts = []
+        now = datetime.utcnow().isoformat()
+
+        def flag(kind: str, metric: str, value: float, threshold: float) -> None:
+            alerts.append({"type": kind, "metric": metric, "value": round(value, 4),
+                           "threshold": threshold, "detected_at": now})
+
+        ref_emb, cur_emb = reference.embeddings, window.embeddings
+        if ref_emb.count and cur_emb.count and ref_emb.dims == cur_emb.dims:
+            ref_std = np.sqrt(ref_emb.variance + 1e-12)
+            shift = float(np.mean(np.abs(cur_emb.mean - ref_emb.mean) / ref_std))
+            variance_ratio = float(np.mean((cur_emb.variance + 1e-12) / (ref_emb.variance + 1e-12)))
+            centroid_cosine = float(
+                np.dot(cur_emb.mean, ref_emb.mean)
+                / max(np.linalg.norm(cur_emb.mean) * np.linalg.norm(ref_emb.mean), 1e-12)
+            )
+            metrics["embedding"] = {
+                "mean_shift": round(shift, 4),
+                "variance_ratio": round(variance_ratio, 4),
+                "centroid_cosine": round(centroid_cosine, 4)
+            }
+            if shift > self.embedding_shift_threshold:
+                flag("embedding_drift", "mean_shift", shift, self.embedding_shift_threshold)
+
+        if reference.roles and window.roles:
+            roles = sorted(set(reference.roles) | set(window.roles))
+            psi = population_stability_index(
+                np.array([reference.roles.get(r, 0) for r in roles], dtype=np.float64),
+                np.array([window.roles.get(r, 0) for r in roles], dtype=np.float64)
+            )
+            metrics["roles"] = {"psi": round(psi, 4), "new_roles": sorted(set(window.roles) - set(reference.roles))}
+            if psi > self.psi_threshold:
+                flag("prediction_drift", "role_psi", psi, self.psi_threshold)
+
+        if reference.scores.count and window.scores.count:
+            psi = population_stability_index(reference.score_histogram, window.score_histogram)
+            metrics["scores"] = {
+                "psi": round(psi, 4),
+                "mean_delta": round(float(window.scores.mean[0] - reference.scores.mean[0]), 4)
+            }
+            if psi > self.psi_threshold:
+                flag("score_drift", "score_psi", psi, self.psi_threshold)
+
+        return {
+            "window_started_at": datetime.utcfromtimestamp(window.started_at).isoformat(),
+            "samples": window.count,
+            "metrics": metrics,
+            "drift_detected": bool(alerts),
+            "alerts": alerts
+        }
+
+    def get_report(self) -> Dict:
+        """Drift summary for the performance report"""
+        with self._lock:
+            return {
+                "window_seconds": self.window_seconds,
+                "windows_closed": self.windows_closed,
+                "reference": self.reference.summary() if self.reference else None,
+                "current": self.current.summary(),
+                "last_comparison": self.last_comparison,
+                "drift_detected": bool(self.last_comparison and self.last_comparison["drift_detected"]),
+                "alerts": list(self.alerts)[-10:]
+            }
@@ -0,0 +1,387 @@
+"""
+Sentence Embedding Backends
+Full-precision PyTorch (sentence-transformers) and int8-quantized ONNX Runtime backends for MiniLM
+"""
+
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Union
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+BACKENDS = ("torch", "onnx-int8")
+BACKEND_ALIASES = {"pytorch": "torch", "onnx": "onnx-int8", "onnx_int8": "onnx-int8"}
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "onnx")
+
+# Short resume/job snippets used for the parity check and benchmark
+SAMPLE_TEXTS = [
+    "Senior Software Engineer with 5 years of experience in Python, Django and AWS.",
+    "Built React and TypeScript dashboards backed by Node.js microservices.",
+    "Data scientist skilled in machine learning, pandas, scikit-learn and SQL.",
+    "Looking for a DevOps engineer familiar with Docker, Kubernetes and CI/CD pipelines.",
+    "Led a team of 8 engineers and improved deployment frequency by 40%.",
+    "Bachelor of Science in Computer Science, GPA 3.8.",
+    "Experienced teacher with strong communication and curriculum design skills.",
+    "Product manager driving roadmap, stakeholder alignment and agile delivery.",
+]
+
+
+@contextmanager
+def _file_lock(path: str):
+    """Exclusive inter-process lock on a lock file (no-op where fcntl is unavailable)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def normalize_backend(backend: Optional[str]) -> str:
+    """Resolve a backend name (or alias); defaults to EMBEDDING_BACKEND or torch"""
+    name = (backend or os.getenv("EMBEDDING_BACKEND", "torch")).strip().lower()
+    name = BACKEND_ALIASES.get(name, name)
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend '{name}' (expected one of {', '.join(BACKENDS)})")
+    return name
+
+
+class TorchEmbedder:
+    """Full-precision sentence-transformers backend"""
+
+    backend = "torch"
+
+    def __init__(self, model_name: str = DEFAULT_MODEL):
+        from sentence_transformers import SentenceTransformer
+
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name, device="cpu")
+
+    def encode(self, texts: Union[str, List[str]], batch_size: int = 32, **kwargs) -> np.ndarray:
+        """Encode texts into embeddings (same contract as SentenceTransformer.encode)"""
+        return self.model.encode(texts, batch_size=batch_size, **kwargs)
+
+
+class OnnxEmbedder:
+    """int8 dynamically-quantized ONNX Runtime backend"""
+
+    backend = "onnx-int8"
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, cache_dir: Optional[str] = None,
+                 num_threads: Optional[int] = None):
+        """
+        Initialize ONNX embedder, exporting and quantizing the model on first use
+
+        Args:
+            model_name: sentence-transformers model name or path
+            cache_dir: Directory for exported models (default: EMBEDDING_CACHE_DIR or ml/models/onnx)
+            num_threads: ONNX Runtime intra-op threads (default: runtime's choice)
+        """
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise ImportError("onnx-int8 embedding backend requires 'onnxruntime' and 'onnx' (pip install onnxruntime onnx)")
+        from transformers import AutoTokenizer
+
+        self.model_name = model_name
+        self.export_dir = os.path.join(
+            cache_dir or os.getenv("EMBEDDING_CACHE_DIR", DEFAULT_CACHE_DIR),
+            model_name.strip("/").replace("/", "__") + "-int8"
+        )
+
+        if not os.path.exists(os.path.join(self.export_dir, "config.json")):
+            # One exporter at a time; the others wait and then reuse its output
+            with _file_lock(self.export_dir + ".lock"):
+                if not os.path.exists(os.path.join(self.export_dir, "config.json")):
+                    self.export(model_name, self.export_dir)
+
+        with open(os.path.join(self.export_dir, "config.json"), "r") as f:
+            self.config = json.load(f)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(self.export_dir)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(
+            os.path.join(self.export_dir, "model.onnx"), options, providers=["CPUExecutionProvider"]
+        )
+
+    @staticmethod
+    def export(model_name: str, export_dir: str) -> str:
+        """
+        Export a sentence-transformers model to ONNX and quantize its weights to int8
+
+        The export is written to a temporary directory next to `export_dir` and moved into place
+        with os.replace, so readers never see a partial export.
+
+        Returns:
+            Export directory (model.onnx, tokenizer files and config.json)
+        """
+        import torch
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        from sentence_transformers import SentenceTransformer, models
+
+        st_model = SentenceTransformer(model_name, device="cpu")
+        transformer = st_model[0]
+        pooling = next((m for m in st_model if isinstance(m, models.Pooling)), None)
+
+        class _Encoder(torch.nn.Module):
+            def __init__(self, model):
+                super().__init__()
+                self.model = model
+
+            def forward(self, input_ids, attention_mask, token_type_ids=None):
+                return self.model(input_ids=input_ids, attention_mask=attention_mask,
+                                  token_type_ids=token_type_ids)[0]
+
+        dummy = transformer.tokenizer(SAMPLE_TEXTS[:2], padding=True, return_tensors="pt")
+        input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in dummy]
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+        parent_dir = os.path.dirname(os.path.abspath(export_dir))
+        os.makedirs(parent_dir, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=os.path.basename(export_dir) + ".", suffix=".tmp", dir=parent_dir)
+        try:
+            fp32_path = os.path.join(tmp_dir, "model-fp32.onnx")
+            encoder = _Encoder(transformer.auto_model).eval()
+
+            with torch.no_grad():
+                torch.onnx.export(
+                    encoder,
+                    tuple(dummy[name] for name in input_names),
+                    fp32_path,
+                    input_names=input_names,
+                    output_names=["last_hidden_state"],
+                    dynamic_axes=dynamic_axes,
+                    opset_version=14,
+                    dynamo=False
+                )
+
+            quantize_dynamic(fp32_path, os.path.join(tmp_dir, "model.onnx"), weight_type=QuantType.QInt8)
+            os.remove(fp32_path)
+
+            transformer.tokenizer.save_pretrained(tmp_dir)
+            with open(os.path.join(tmp_dir, "config.json"), "w") as f:
+                json.dump({
+                    "model_name": model_name,
+                    "input_names": input_names,
+                    "max_seq_length": transformer.max_seq_length,
+                    "pooling": "cls" if pooling is not None and pooling.pooling_mode_cls_token else "mean",
+                    "normalize": any(isinstance(m, models.Normalize) for m in st_model)
+                }, f, indent=2)
+
+            # Replace a stale (incomplete) export; a complete one is never overwritten
+            if os.path.isdir(export_dir) and not os.path.exists(os.path.join(export_dir, "config.json")):
+                shutil.rmtree(export_dir)
+            os.replace(tmp_dir, export_dir)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        return export_dir
+
+    def encode(self, texts: Union[str, List[str]], batch_size: int = 32, **kwargs) -> np.ndarray:
+        """Encode texts into embeddings (same output as SentenceTransformer.encode)"""
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+
+        batches = []
+        for i in range(0, len(texts), batch_size):
+            tokens = self.tokenizer(
+                list(texts[i:i + batch_size]),
+                padding=True,
+                truncation=True,
+                max_length=self.config["max_seq_length"],
+                return_tensors="np"
+            )
+            feed = {name: tokens[name].astype(np.int64) for name in self.config["input_names"]}
+            hidden = self.session.run(None, feed)[0]
+            batches.append(self._pool(hidden, feed["attention_mask"]))
+
+        embeddings = np.vstack(batches) if batches else np.zeros((0, 0), dtype=np.float32)
+        return embeddings[0] if single else embeddings
+
+    def _pool(self, hidden: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        """Pool token embeddings the way the sentence-transformers pipeline does"""
+        if self.config["pooling"] == "cls":
+            pooled = hidden[:, 0]
+        else:
+            mask = attention_mask[..., None].astype(hidden.dtype)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+        if self.config["normalize"]:
+            pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled.astype(np.float32)
+
+
+def _cosine_rows(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    a = a / np.clip(np.linalg.norm(a, axis=1, keepdims=True), 1e-12, None)
+    b = b / np.clip(np.linalg.norm(b, axis=1, keepdims=True), 1e-12, None)
+    return (a * b).sum(axis=1)
+
+
+def check_parity(candidate, reference, texts: Optional[List[str]] = None,
+                 threshold: float = 0.99) -> Dict:
+    """
+    Compare two embedders by per-text cosine agreement
+
+    Args:
+        candidate: Embedder under test (e.g. onnx-int8)
+        reference: Reference embedder (e.g. torch)
+        texts: Texts to embed (default: SAMPLE_TEXTS)
+        threshold: Minimum cosine similarity every text must reach
+
+    Returns:
+        Mean/min cosine agreement and whether the check passed
+    """
+    texts = texts or SAMPLE_TEXTS
+    cosines = _cosine_rows(np.asarray(candidate.encode(texts)), np.asarray(reference.encode(texts)))
+
+    return {
+        "candidate": getattr(candidate, "backend", type(candidate).__name__),
+        "reference": getattr(reference, "backend", type(reference).__name__),
+        "texts": len(texts),
+        "mean_cosine": round(float(cosines.mean()), 6),
+        "min_cosine": round(float(cosines.min()), 6),
+        "threshold": threshold,
+        "passed": bool(cosines.min() >= threshold)
+    }
+
+
+def benchmark(embedders: List, texts: Optional[List[str]] = None, batch_size: int = 32,
+              repeats: int = 3) -> Dict:
+    """
+    Compare embedding throughput across backends
+
+    Args:
+        embedders: Embedders to compare; speedups are relative to the first
+        texts: Texts to embed (default: SAMPLE_TEXTS repeated to 64 texts)
+        batch_size: Encoding batch size
+        repeats: Timed runs per backend (best run is reported)
+
+    Returns:
+        Per-backend timings, throughput and speedup
+    """
+    texts = texts or (SAMPLE_TEXTS * 8)
+    results = {}
+    baseline = None
+
+    for embedder in embedders:
+        embedder.encode(texts[:batch_size], batch_size=batch_size)  # warm up
+
+        timings = []
+        for _ in range(repeats):
+            start_time = time.perf_counter()
+            embedder.encode(texts, batch_size=batch_size)
+            timings.append(time.perf_counter() - start_time)
+
+        best = min(timings)
+        baseline = baseline or best
+        results[getattr(embedder, "backend", type(embedder).__name__)] = {
+            "best_time": round(best, 4),
+            "texts_per_second": round(len(texts) / best, 1),
+            "ms_per_text": round(best / len(texts) * 1000, 3),
+            "speedup": round(baseline / best, 2)
+        }
+
+    return {
+        "texts": len(texts),
+        "batch_size": batch_size,
+        "repeats": repeats,
+        "backends": results
+    }
+
+
+# Shared embedders, one per (backend, model), each built once under its own lock
+_embedders: Dict[tuple, object] = {}
+_embedders_lock = threading.Lock()
+_build_locks: Dict[tuple, threading.Lock] = {}
+
+
+def get_embedder(backend: Optional[str] = None, model_name: str = DEFAULT_MODEL):
+    """
+    Get the shared embedder for a backend
+
+    The backend defaults to the EMBEDDING_BACKEND setting ("torch" or "onnx-int8"). With
+    EMBEDDING_PARITY_CHECK enabled, an ONNX backend that disagrees with PyTorch falls back to
+    PyTorch, as does one that cannot be built (missing packages, failed export or quantization).
+    Concurrent first calls build the embedder only once.
+
+    Returns:
+        Embedder with a SentenceTransformer-compatible `encode`
+    """
+    backend = normalize_backend(backend)
+    key = (backend, model_name)
+
+    with _embedders_lock:
+        if key in _embedders:
+            return _embedders[key]
+        build_lock = _build_locks.setdefault(key, threading.Lock())
+
+    with build_lock:
+        with _embedders_lock:
+            if key in _embedders:
+                return _embedders[key]
+
+        if backend == "torch":
+            embedder = TorchEmbedder(model_name)
+        else:
+            embedder = _build_onnx_embedder(model_name)
+
+        with _embedders_lock:
+            _embedders[key] = embedder
+        return embedder
+
+
+def _build_onnx_embedder(model_name: str):
+    """ONNX embedder, or the shared torch embedder if it can't be built or fails the parity check"""
+    try:
+        embedder = OnnxEmbedder(model_name)
+    except Exception as e:
+        print(f"Warning: ONNX embedder unavailable ({e}). Falling back to torch embedding backend.")
+        return get_embedder("torch", model_name)
+
+    if os.getenv("EMBEDDING_PARITY_CHECK", "").strip().lower() in ("1", "true", "yes"):
+        threshold = float(os.getenv("EMBEDDING_PARITY_THRESHOLD", "0.99"))
+        parity = check_parity(embedder, get_embedder("torch", model_name), threshold=threshold)
+        if not parity["passed"]:
+            print(f"Warning: ONNX embedder failed parity check ({parity}). Falling back to torch.")
+            return get_embedder("torch", model_name)
+    return embedder
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Check parity and benchmark embedding backends")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    torch_embedder = TorchEmbedder(args.model)
+    onnx_embedder = OnnxEmbedder(args.model)
+
+    print("Parity:", json.dumps(check_parity(onnx_embedder, torch_embedder), indent=2))
+    print("Benchmark:", json.dumps(
+        benchmark([torch_embedder, onnx_embedder], batch_size=args.batch_size, repeats=args.repeats),
+        indent=2
+    ))
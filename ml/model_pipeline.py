@@ -6,13 +6,22 @@ Automated training, versioning, and monitoring for ML models
 import os
 import json
 import joblib
+import multiprocessing
+import queue
 import shutil
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, NamedTuple, Optional, Tuple, Any
 from pathlib import Path
 import numpy as np
-from sklearn.model_selection import train_test_split, cross_val_score
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+from scipy import sparse
+import tempfile
+from sklearn.base import clone
+from sklearn.model_selection import train_test_split, cross_val_score, ParameterGrid, StratifiedKFold
+from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, get_scorer
 import hashlib
 
 
@@ -46,30 +55,100 @@ class ModelVersion:
 class ModelRegistry:
     """Registry for managing model versions"""
     
-    def __init__(self, registry_dir: str = "ml/models"):
+    def __init__(self, registry_dir: str = "ml/models", cache_size: int = 4, mmap_mode: Optional[str] = "r"):
         """
         Initialize model registry
         
         Args:
             registry_dir: Directory to store models and metadata
+            cache_size: Maximum number of loaded models kept in memory
+            mmap_mode: joblib mmap mode for numpy arrays in model artifacts (None to load into memory)
         """
         self.registry_dir = Path(registry_dir)
         self.registry_dir.mkdir(parents=True, exist_ok=True)
         self.metadata_file = self.registry_dir / "registry.json"
+        self.db_file = self.registry_dir / "registry.db"
+        self.cache_size = cache_size
+        self.mmap_mode = mmap_mode
+        
+        # Loaded models keyed by (model_name, version), least recently used first
+        self._models: OrderedDict = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_evictions = 0
+        self._lock = threading.RLock()
         self._load_registry()
     
     def _load_registry(self) -> None:
-        """Load registry metadata"""
-        if self.metadata_file.exists():
+        """Open the registry metadata store, importing a legacy registry.json once and renaming it"""
+        self._db = sqlite3.connect(str(self.db_file), check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS models (
+                name TEXT PRIMARY KEY,
+                latest TEXT,
+                production TEXT
+            );
+            CREATE TABLE IF NOT EXISTS versions (
+                model_name TEXT NOT NULL,
+                version TEXT NOT NULL,
+                path TEXT NOT NULL,
+                metrics TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                PRIMARY KEY (model_name, version)
+            );
+            CREATE INDEX IF NOT EXISTS idx_versions_created ON versions (model_name, created_at);
+        """)
+        
+        if not self.metadata_file.exists():
+            return
+        has_models = self._db.execute("SELECT 1 FROM models LIMIT 1").fetchone()
+        if not has_models:
             with open(self.metadata_file, 'r') as f:
-                self.registry = json.load(f)
-        else:
-            self.registry = {}
+                legacy = json.load(f)
+            with self._lock, self._db:
+                self._db.execute("BEGIN")
+                for name, entry in legacy.items():
+                    self._db.execute(
+                        "INSERT INTO models (name, latest, production) VALUES (?, ?, ?)",
+                        (name, entry.get("latest"), entry.get("production"))
+                    )
+                    self._db.executemany(
+                        "INSERT OR IGNORE INTO versions (model_name, version, path, metrics, created_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        [(name, v["version"], v["path"], json.dumps(v["metrics"]), v["created_at"])
+                         for v in entry.get("versions", [])]
+                    )
+        # registry.db is the only store from here on; keep the old file for reference but out of the way
+        os.replace(self.metadata_file, self.metadata_file.with_name("registry.json.migrated"))
     
-    def _save_registry(self) -> None:
-        """Save registry metadata"""
-        with open(self.metadata_file, 'w') as f:
-            json.dump(self.registry, f, indent=2)
+    @staticmethod
+    def _row_to_version(row: sqlite3.Row) -> Dict:
+        return {
+            "version": row["version"],
+            "path": row["path"],
+            "metrics": json.loads(row["metrics"]),
+            "created_at": row["created_at"]
+        }
+    
+    def resolve_version(self, model_name: str, version: Optional[str]) -> Optional[str]:
+        """Resolve 'latest'/'production' aliases to a concrete version"""
+        if version in ("latest", "production"):
+            with self._lock:
+                row = self._db.execute(
+                    f"SELECT {version} FROM models WHERE name = ?", (model_name,)
+                ).fetchone()
+            return row[0] if row else None
+        return version
+    
+    def _get_version_info(self, model_name: str, version: str) -> Optional[Dict]:
+        """Look up a single version by primary key"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM versions WHERE model_name = ? AND version = ?", (model_name, version)
+            ).fetchone()
+        return self._row_to_version(row) if row else None
     
     def register_model(
         self,
@@ -90,8 +169,13 @@ class ModelRegistry:
         Returns:
             Version string
         """
-        # Generate version based on timestamp
-        version = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        # Generate version based on timestamp (suffixed if registered within the same second)
+        base_version = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        version = base_version
+        suffix = 1
+        while (self.registry_dir / model_name / version).exists():
+            version = f"{base_version}_{suffix}"
+            suffix += 1
         
         # Create model directory
         model_dir = self.registry_dir / model_name / version
@@ -114,67 +198,73 @@ class ModelRegistry:
         with open(metadata_path, 'w') as f:
             json.dump(full_metadata, f, indent=2)
         
-        # Update registry
-        if model_name not in self.registry:
-            self.registry[model_name] = {
-                "versions": [],
-                "latest": None,
-                "production": None
-            }
-        
-        self.registry[model_name]["versions"].append({
-            "version": version,
-            "path": str(model_path),
-            "metrics": metrics,
-            "created_at": full_metadata["created_at"]
-        })
-        
-        # Set as latest
-        self.registry[model_name]["latest"] = version
-        
-        self._save_registry()
+        # Update registry (one version row and the latest pointer)
+        with self._lock, self._db:
+            self._db.execute("BEGIN")
+            self._db.execute(
+                "INSERT INTO versions (model_name, version, path, metrics, created_at) VALUES (?, ?, ?, ?, ?)",
+                (model_name, version, str(model_path), json.dumps(metrics), full_metadata["created_at"])
+            )
+            self._db.execute(
+                "INSERT INTO models (name, latest) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET latest = excluded.latest",
+                (model_name, version)
+            )
         
         return version
     
-    def get_model(self, model_name: str, version: str = "latest") -> Optional[Any]:
+    def get_model(self, model_name: str, version: str = "latest", mmap_mode: str = "default") -> Optional[Any]:
         """
         Load a specific model version
         
+        Loaded models are cached by (model_name, version); numpy arrays in the artifact are
+        memory-mapped according to the registry's mmap_mode.
+        
         Args:
             model_name: Name of the model
             version: Version string or 'latest' or 'production'
+            mmap_mode: Override the registry's mmap mode; overridden loads bypass the cache
             
         Returns:
             Loaded model object
         """
-        if model_name not in self.registry:
-            return None
-        
-        # Resolve version
-        if version == "latest":
-            version = self.registry[model_name]["latest"]
-        elif version == "production":
-            version = self.registry[model_name]["production"]
-        
+        version = self.resolve_version(model_name, version)
         if not version:
             return None
         
-        # Find version info
-        version_info = next(
-            (v for v in self.registry[model_name]["versions"] if v["version"] == version),
-            None
-        )
+        key = (model_name, version)
+        use_cache = mmap_mode == "default"
+        
+        if use_cache:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    self._cache_hits += 1
+                    return self._models[key]
+                self._cache_misses += 1
         
+        version_info = self._get_version_info(model_name, version)
         if not version_info:
             return None
         
-        # Load model
-        return joblib.load(version_info["path"])
+        model = joblib.load(version_info["path"], mmap_mode=self.mmap_mode if use_cache else mmap_mode)
+        
+        if use_cache and self.cache_size > 0:
+            with self._lock:
+                self._models[key] = model
+                self._models.move_to_end(key)
+                while len(self._models) > self.cache_size:
+                    self._models.popitem(last=False)
+                    self._cache_evictions += 1
+        
+        return model
     
     def promote_to_production(self, model_name: str, version: str) -> bool:
         """
         Promote a model version to production
         
+        The previous production model is evicted from the model cache and the new one loaded.
+        
         Args:
             model_name: Name of the model
             version: Version to promote
@@ -182,54 +272,70 @@ class ModelRegistry:
         Returns:
             True if successful
         """
-        if model_name not in self.registry:
-            return False
-        
         # Verify version exists
-        version_exists = any(
-            v["version"] == version
-            for v in self.registry[model_name]["versions"]
-        )
-        
-        if not version_exists:
+        if not self._get_version_info(model_name, version):
             return False
         
-        self.registry[model_name]["production"] = version
-        self._save_registry()
+        previous = self.resolve_version(model_name, "production")
+        with self._lock, self._db:
+            self._db.execute("UPDATE models SET production = ? WHERE name = ?", (version, model_name))
+        
+        if previous and previous != version:
+            self.evict(model_name, previous)
+        self.get_model(model_name, version)
         
         return True
     
+    def evict(self, model_name: str, version: Optional[str] = None) -> int:
+        """Drop one version (or all versions) of a model from the model cache"""
+        with self._lock:
+            keys = [
+                key for key in self._models
+                if key[0] == model_name and (version is None or key[1] == version)
+            ]
+            for key in keys:
+                del self._models[key]
+            return len(keys)
+    
+    def get_cache_stats(self) -> Dict:
+        """Get model cache statistics"""
+        with self._lock:
+            total_requests = self._cache_hits + self._cache_misses
+            hit_rate = (self._cache_hits / total_requests * 100) if total_requests > 0 else 0
+            return {
+                "size": len(self._models),
+                "max_size": self.cache_size,
+                "models": [f"{name}:{version}" for name, version in self._models],
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "evictions": self._cache_evictions,
+                "hit_rate": round(hit_rate, 2)
+            }
+    
+    def list_models(self) -> List[str]:
+        """List registered model names"""
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT name FROM models ORDER BY name")]
+    
     def list_versions(self, model_name: str) -> List[Dict]:
         """List all versions of a model"""
-        if model_name not in self.registry:
-            return []
-        
-        return self.registry[model_name]["versions"]
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT * FROM versions WHERE model_name = ? ORDER BY created_at, version", (model_name,)
+            ).fetchall()
+        return [self._row_to_version(row) for row in rows]
     
     def get_metrics(self, model_name: str, version: str = "latest") -> Optional[Dict]:
         """Get metrics for a specific model version"""
-        if model_name not in self.registry:
+        version = self.resolve_version(model_name, version)
+        if not version:
             return None
         
-        # Resolve version
-        if version == "latest":
-            version = self.registry[model_name]["latest"]
-        elif version == "production":
-            version = self.registry[model_name]["production"]
-        
-        # Find version
-        version_info = next(
-            (v for v in self.registry[model_name]["versions"] if v["version"] == version),
-            None
-        )
-        
+        version_info = self._get_version_info(model_name, version)
         return version_info["metrics"] if version_info else None
     
     def compare_versions(self, model_name: str, versions: List[str]) -> Dict:
         """Compare metrics across multiple versions"""
-        if model_name not in self.registry:
-            return {}
-        
         comparison = {}
         for version in versions:
             metrics = self.get_metrics(model_name, version)
@@ -249,10 +355,7 @@ class ModelRegistry:
         Returns:
             Number of versions removed
         """
-        if model_name not in self.registry:
-            return 0
-        
-        versions = self.registry[model_name]["versions"]
+        versions = self.list_versions(model_name)
         
         if len(versions) <= keep_last:
             return 0
@@ -265,7 +368,7 @@ class ModelRegistry:
         )
         
         # Keep recent versions and production
-        production = self.registry[model_name].get("production")
+        production = self.resolve_version(model_name, "production")
         versions_to_keep = set()
         
         # Keep most recent
@@ -277,24 +380,67 @@ class ModelRegistry:
             versions_to_keep.add(production)
         
         # Remove old versions
-        removed_count = 0
+        removed = []
         for version_info in versions:
             if version_info["version"] not in versions_to_keep:
                 # Delete files
                 model_path = Path(version_info["path"])
                 if model_path.exists():
                     shutil.rmtree(model_path.parent)
-                removed_count += 1
+                self.evict(model_name, version_info["version"])
+                removed.append((model_name, version_info["version"]))
         
         # Update registry
-        self.registry[model_name]["versions"] = [
-            v for v in versions
-            if v["version"] in versions_to_keep
-        ]
+        with self._lock, self._db:
+            self._db.execute("BEGIN")
+            self._db.executemany("DELETE FROM versions WHERE model_name = ? AND version = ?", removed)
         
-        self._save_registry()
-        
-        return removed_count
+        return len(removed)
+
+
+# Training data for hyperparameter search workers, loaded once per worker process
+_search_data: Dict[str, Any] = {}
+
+
+def _init_search_worker(data_path: str) -> None:
+    """Process-pool initializer: memory-map the training split into the worker"""
+    _search_data["X"], _search_data["y"] = joblib.load(data_path, mmap_mode="r")
+
+
+def _take_rows(data: Any, idx: np.ndarray) -> Any:
+    """Select rows by position from an array-like (sparse matrices are indexed directly)"""
+    return data[idx] if sparse.issparse(data) else np.asarray(data)[idx]
+
+
+def _fit_and_score_fold(estimator: Any, train_idx: np.ndarray, test_idx: np.ndarray,
+                        scoring: str) -> Tuple[float, float, float]:
+    """Fit one configuration on one CV fold; returns (score, fit_time, score_time)"""
+    X, y = _search_data["X"], _search_data["y"]
+    
+    start_time = time.perf_counter()
+    estimator.fit(_take_rows(X, train_idx), _take_rows(y, train_idx))
+    fit_time = time.perf_counter() - start_time
+    
+    start_time = time.perf_counter()
+    score = get_scorer(scoring)(estimator, _take_rows(X, test_idx), _take_rows(y, test_idx))
+    return float(score), fit_time, time.perf_counter() - start_time
+
+
+def _evaluate_classifier(model_obj: Any, X_test: Any, y_test: Any) -> Dict:
+    """Test-set classification metrics"""
+    y_pred = model_obj.predict(X_test)
+    
+    return {
+        "accuracy": float(accuracy_score(y_test, y_pred)),
+        "precision": float(precision_score(y_test, y_pred, average='weighted', zero_division=0)),
+        "recall": float(recall_score(y_test, y_pred, average='weighted', zero_division=0)),
+        "f1_score": float(f1_score(y_test, y_pred, average='weighted', zero_division=0))
+    }
+
+
+def _num_features(X: Any) -> int:
+    shape = getattr(X, "shape", None)
+    return shape[1] if shape is not None and len(shape) > 1 else 1
 
 
 class ModelTrainer:
@@ -317,7 +463,8 @@ class ModelTrainer:
         X: np.ndarray,
         y: np.ndarray,
         test_size: float = 0.2,
-        cv_folds: int = 5
+        cv_folds: int = 5,
+        n_jobs: Optional[int] = None
     ) -> Dict:
         """
         Train model with cross-validation and evaluation
@@ -329,6 +476,7 @@ class ModelTrainer:
             y: Target labels
             test_size: Test set size
             cv_folds: Number of cross-validation folds
+            n_jobs: Parallel workers for cross-validation folds (-1 for all cores)
             
         Returns:
             Training results with metrics
@@ -344,18 +492,11 @@ class ModelTrainer:
         model_obj.fit(X_train, y_train)
         
         # Evaluate on test set
-        y_pred = model_obj.predict(X_test)
-        
-        test_metrics = {
-            "accuracy": float(accuracy_score(y_test, y_pred)),
-            "precision": float(precision_score(y_test, y_pred, average='weighted', zero_division=0)),
-            "recall": float(recall_score(y_test, y_pred, average='weighted', zero_division=0)),
-            "f1_score": float(f1_score(y_test, y_pred, average='weighted', zero_division=0))
-        }
+        test_metrics = _evaluate_classifier(model_obj, X_test, y_test)
         
         # Cross-validation
         cv_scores = cross_val_score(
-            model_obj, X_train, y_train, cv=cv_folds, scoring='accuracy'
+            model_obj, X_train, y_train, cv=cv_folds, scoring='accuracy', n_jobs=n_jobs
         )
         
         cv_metrics = {
@@ -374,7 +515,7 @@ class ModelTrainer:
             "training_time_seconds": training_time,
             "train_samples": len(X_train),
             "test_samples": len(X_test),
-            "features": X.shape[1] if len(X.shape) > 1 else 1
+            "features": _num_features(X)
         }
         
         # Register model
@@ -403,6 +544,247 @@ class ModelTrainer:
             "success": True
         }
     
+    def search_and_train(
+        self,
+        model_name: str,
+        model_obj: Any,
+        X: Any,
+        y: Any,
+        param_grid: Optional[Dict[str, List]] = None,
+        test_size: float = 0.2,
+        cv_folds: int = 5,
+        n_jobs: Optional[int] = None,
+        time_budget: Optional[float] = None,
+        early_stopping_margin: Optional[float] = 0.05,
+        min_folds: int = 2,
+        scoring: str = "accuracy"
+    ) -> Dict:
+        """
+        Parallel hyperparameter search with cross-validation, then train and register the best model
+        
+        Every (configuration, fold) pair runs as a task on a process pool. Workers memory-map the
+        training split once. Tasks are dispatched fold by fold, no more than one per worker at a
+        time, so a configuration whose mean score is clearly below the best one on the same folds
+        can be stopped before its remaining folds are sent.
+        
+        Args:
+            model_name: Name of the model
+            model_obj: Unfitted estimator; grid parameters are applied with set_params
+            X: Feature matrix (or raw texts for a vectorizer pipeline)
+            y: Target labels
+            param_grid: Parameter grid (e.g. {"clf__C": [0.1, 1, 10]}); None runs CV on model_obj as-is
+            test_size: Test set size
+            cv_folds: Number of cross-validation folds
+            n_jobs: Worker processes (default: all cores)
+            time_budget: Wall-clock budget in seconds for the search; unfinished trials are cancelled and
+                their worker processes terminated
+            early_stopping_margin: Stop a configuration trailing the best by more than this (None disables)
+            min_folds: Folds a configuration must complete before it can be stopped
+            scoring: scikit-learn scorer name
+            
+        Returns:
+            Training results with metrics, best parameters and per-trial timings
+        """
+        training_start = datetime.utcnow()
+        search_start = time.perf_counter()
+        
+        # Split data
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=test_size, random_state=42, stratify=y
+        )
+        
+        folds = list(StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=42).split(
+            np.zeros(len(y_train)), y_train
+        ))
+        trials = [
+            {"params": params, "fold_scores": {}, "fit_times": [], "score_times": [],
+             "status": "running", "error": None}
+            for params in ParameterGrid(param_grid or {})
+        ]
+        
+        def is_trailing(trial: Dict) -> bool:
+            done = trial["fold_scores"]
+            if early_stopping_margin is None or len(done) < min_folds:
+                return False
+            mean = np.mean(list(done.values()))
+            best = max(
+                np.mean([other["fold_scores"][f] for f in done])
+                for other in trials
+                if all(f in other["fold_scores"] for f in done)
+            )
+            return mean < best - early_stopping_margin
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            data_path = os.path.join(tmp_dir, "train.joblib")
+            joblib.dump((X_train, y_train), data_path)
+            
+            n_workers = n_jobs if n_jobs and n_jobs > 0 else os.cpu_count()
+            pool = multiprocessing.Pool(
+                processes=n_workers,
+                initializer=_init_search_worker,
+                initargs=(data_path,)
+            )
+            results = queue.Queue()
+            queued = deque(
+                (trial_idx, fold_idx) for fold_idx in range(len(folds)) for trial_idx in range(len(trials))
+            )
+            in_flight = 0
+            
+            def dispatch() -> None:
+                nonlocal in_flight
+                while queued and in_flight < n_workers:
+                    trial_idx, fold_idx = queued.popleft()
+                    if trials[trial_idx]["status"] != "running":
+                        continue
+                    estimator = clone(model_obj).set_params(**trials[trial_idx]["params"])
+                    train_idx, test_idx = folds[fold_idx]
+                    key = (trial_idx, fold_idx)
+                    pool.apply_async(
+                        _fit_and_score_fold, (estimator, train_idx, test_idx, scoring),
+                        callback=lambda result, key=key: results.put((key, result, None)),
+                        error_callback=lambda error, key=key: results.put((key, None, error))
+                    )
+                    in_flight += 1
+            
+            deadline = search_start + time_budget if time_budget else None
+            try:
+                dispatch()
+                while in_flight:
+                    timeout = max(0.0, deadline - time.perf_counter()) if deadline else None
+                    try:
+                        done = [results.get(timeout=timeout)]
+                    except queue.Empty:
+                        break
+                    while True:
+                        try:
+                            done.append(results.get_nowait())
+                        except queue.Empty:
+                            break
+                    in_flight -= len(done)
+                    
+                    # Handle a batch of results in fold order so stopping decisions depend less on timing
+                    for (trial_idx, fold_idx), result, error in sorted(done, key=lambda item: item[0][::-1]):
+                        trial = trials[trial_idx]
+                        if trial["status"] != "running":
+                            continue
+                        if error is not None:
+                            trial["error"] = str(error)
+                            trial["status"] = "failed"
+                            continue
+                        
+                        score, fit_time, score_time = result
+                        trial["fold_scores"][fold_idx] = score
+                        trial["fit_times"].append(fit_time)
+                        trial["score_times"].append(score_time)
+                        trial["elapsed"] = time.perf_counter() - search_start
+                        if len(trial["fold_scores"]) == len(folds):
+                            trial["status"] = "completed"
+                        
+                        for other in trials:
+                            if other["status"] == "running" and is_trailing(other):
+                                other["status"] = "early_stopped"
+                    
+                    if deadline and time.perf_counter() >= deadline:
+                        break
+                    dispatch()
+            finally:
+                # Fits still running past the budget are killed along with their workers
+                pool.terminate()
+                pool.join()
+        
+        search_time = time.perf_counter() - search_start
+        for trial in trials:
+            if trial["status"] == "running":
+                trial["status"] = "budget_exhausted"
+            scores = [trial["fold_scores"][f] for f in sorted(trial["fold_scores"])]
+            trial["cv_scores"] = scores
+            trial["cv_mean"] = float(np.mean(scores)) if scores else None
+            trial["cv_std"] = float(np.std(scores)) if scores else None
+        
+        # Prefer fully cross-validated configurations
+        scored = [t for t in trials if t["cv_mean"] is not None]
+        candidates = [t for t in scored if t["status"] == "completed"] or scored
+        if not candidates:
+            raise ValueError("No hyperparameter trial finished within the time budget")
+        best_trial = max(candidates, key=lambda t: t["cv_mean"])
+        
+        # Train the best configuration on the full training split
+        fit_start = time.perf_counter()
+        best_model = clone(model_obj).set_params(**best_trial["params"])
+        best_model.fit(X_train, y_train)
+        final_fit_time = time.perf_counter() - fit_start
+        
+        test_metrics = _evaluate_classifier(best_model, X_test, y_test)
+        
+        training_end = datetime.utcnow()
+        trial_summaries = [
+            {
+                "params": t["params"],
+                "status": t["status"],
+                "folds_completed": len(t["cv_scores"]),
+                "cv_mean": t["cv_mean"],
+                "cv_std": t["cv_std"],
+                "cv_scores": t["cv_scores"],
+                "fit_time_total": round(sum(t["fit_times"]), 4),
+                "fit_time_mean": round(float(np.mean(t["fit_times"])), 4) if t["fit_times"] else None,
+                "score_time_total": round(sum(t["score_times"]), 4),
+                "finished_at_seconds": round(t.get("elapsed", 0.0), 4),
+                "error": t["error"]
+            }
+            for t in trials
+        ]
+        
+        all_metrics = {
+            **test_metrics,
+            "cv_mean": best_trial["cv_mean"],
+            "cv_std": best_trial["cv_std"],
+            "cv_scores": best_trial["cv_scores"],
+            "training_time_seconds": (training_end - training_start).total_seconds(),
+            "search_time_seconds": round(search_time, 4),
+            "final_fit_time_seconds": round(final_fit_time, 4),
+            "trials": len(trials),
+            "train_samples": len(y_train),
+            "test_samples": len(y_test),
+            "features": _num_features(X)
+        }
+        
+        # Register model with the full search record
+        version = self.registry.register_model(
+            model_name=model_name,
+            model_obj=best_model,
+            metrics=all_metrics,
+            metadata={
+                "training_start": training_start.isoformat(),
+                "training_end": training_end.isoformat(),
+                "search": {
+                    "param_grid": param_grid or {},
+                    "best_params": best_trial["params"],
+                    "scoring": scoring,
+                    "cv_folds": cv_folds,
+                    "time_budget": time_budget,
+                    "early_stopping_margin": early_stopping_margin,
+                    "trials": trial_summaries
+                }
+            }
+        )
+        
+        # Record in history
+        self.training_history.append({
+            "model_name": model_name,
+            "version": version,
+            "metrics": all_metrics,
+            "timestamp": training_end.isoformat()
+        })
+        
+        return {
+            "model_name": model_name,
+            "version": version,
+            "metrics": all_metrics,
+            "best_params": best_trial["params"],
+            "trials": trial_summaries,
+            "success": True
+        }
+    
     def auto_retrain_if_needed(
         self,
         model_name: str,
@@ -466,12 +848,50 @@ class ModelTrainer:
         return self.training_history
 
 
+class PredictionRecord(NamedTuple):
+    """Compact prediction log entry"""
+    timestamp: float
+    model_name: str
+    model_version: str
+    prediction: Any
+    actual: Any
+    confidence: Optional[float]
+    correct: Optional[bool]
+
+
 class ModelMonitor:
     """Monitor model performance in production"""
     
-    def __init__(self):
-        self.predictions_log = []
+    def __init__(
+        self,
+        capacity: int = 10000,
+        bucket_seconds: int = 60,
+        retention_hours: int = 24,
+        flush_path: Optional[str] = None,
+        flush_every: int = 1000
+    ):
+        """
+        Initialize model monitor
+        
+        Args:
+            capacity: Maximum number of individual predictions kept in memory
+            bucket_seconds: Width of the rolling aggregate buckets
+            retention_hours: How long aggregate buckets are kept
+            flush_path: Optional JSON-lines file predictions are appended to
+            flush_every: Flush after this many new predictions (when flush_path is set)
+        """
+        self.predictions_log: deque = deque(maxlen=capacity)
         self.performance_alerts = []
+        self.bucket_seconds = bucket_seconds
+        self.retention_hours = retention_hours
+        self.flush_path = flush_path
+        self.flush_every = flush_every
+        
+        # model_name -> {bucket_start: [predictions, with_feedback, correct, confidence_sum, confidence_count]}
+        self._buckets: Dict[str, OrderedDict] = {}
+        self._pending: List[PredictionRecord] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
     
     def log_prediction(
         self,
@@ -483,17 +903,85 @@ class ModelMonitor:
         confidence: float = None
     ) -> None:
         """Log a model prediction for monitoring"""
-        log_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "model_name": model_name,
-            "model_version": model_version,
-            "prediction": prediction,
-            "actual": actual,
-            "confidence": confidence,
-            "correct": prediction == actual if actual is not None else None
-        }
+        record = PredictionRecord(
+            timestamp=time.time(),
+            model_name=model_name,
+            model_version=model_version,
+            prediction=prediction,
+            actual=actual,
+            confidence=confidence,
+            correct=prediction == actual if actual is not None else None
+        )
+        bucket_start = int(record.timestamp // self.bucket_seconds) * self.bucket_seconds
+        
+        with self._lock:
+            self.predictions_log.append(record)
+            
+            buckets = self._buckets.setdefault(model_name, OrderedDict())
+            bucket = buckets.get(bucket_start)
+            if bucket is None:
+                bucket = buckets[bucket_start] = [0, 0, 0, 0.0, 0]
+                # Drop buckets past the retention window
+                oldest = bucket_start - self.retention_hours * 3600
+                while buckets and next(iter(buckets)) < oldest:
+                    buckets.popitem(last=False)
+            
+            bucket[0] += 1
+            if actual is not None:
+                bucket[1] += 1
+                bucket[2] += 1 if record.correct else 0
+            if confidence is not None:
+                bucket[3] += confidence
+                bucket[4] += 1
+            
+            should_flush = False
+            if self.flush_path:
+                self._pending.append(record)
+                should_flush = len(self._pending) >= self.flush_every
         
-        self.predictions_log.append(log_entry)
+        if should_flush:
+            self.flush()
+    
+    def flush(self, path: Optional[str] = None) -> int:
+        """
+        Append predictions logged since the last flush to disk as JSON lines
+        
+        Returns:
+            Number of predictions written
+        """
+        path = path or self.flush_path
+        if not path:
+            return 0
+        
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            if not pending:
+                return 0
+            
+            with open(path, 'a') as f:
+                for record in pending:
+                    f.write(json.dumps(self._record_to_dict(record), default=str) + "\n")
+            return len(pending)
+    
+    @staticmethod
+    def _record_to_dict(record: PredictionRecord) -> Dict:
+        entry = record._asdict()
+        entry["timestamp"] = datetime.utcfromtimestamp(record.timestamp).isoformat()
+        return entry
+    
+    def get_recent_predictions(self, model_name: Optional[str] = None, limit: int = 100) -> List[Dict]:
+        """Get the most recent individual predictions (newest first)"""
+        with self._lock:
+            records = list(self.predictions_log)
+        
+        recent = []
+        for record in reversed(records):
+            if model_name is None or record.model_name == model_name:
+                recent.append(self._record_to_dict(record))
+                if len(recent) >= limit:
+                    break
+        return recent
     
     def get_recent_performance(
         self,
@@ -501,34 +989,44 @@ class ModelMonitor:
         hours: int = 24
     ) -> Dict:
         """Get recent performance metrics"""
-        cutoff_time = datetime.utcnow().timestamp() - (hours * 3600)
-        
-        recent_logs = [
-            log for log in self.predictions_log
-            if log["model_name"] == model_name and
-            datetime.fromisoformat(log["timestamp"]).timestamp() > cutoff_time
-        ]
-        
-        if not recent_logs:
+        cutoff_time = time.time() - (hours * 3600)
+        cutoff_bucket = int(cutoff_time // self.bucket_seconds) * self.bucket_seconds
+        
+        total = with_actual = correct = confidence_count = 0
+        confidence_sum = 0.0
+        
+        with self._lock:
+            for bucket_start, bucket in reversed(self._buckets.get(model_name, {}).items()):
+                if bucket_start < cutoff_bucket:
+                    break
+                total += bucket[0]
+                with_actual += bucket[1]
+                correct += bucket[2]
+                confidence_sum += bucket[3]
+                confidence_count += bucket[4]
+        
+        if not total:
             return {"error": "No recent predictions found"}
         
-        # Calculate metrics
-        total = len(recent_logs)
-        with_actual = [log for log in recent_logs if log["actual"] is not None]
-        correct = [log for log in with_actual if log["correct"]]
-        
         return {
             "model_name": model_name,
             "time_period_hours": hours,
             "total_predictions": total,
-            "predictions_with_feedback": len(with_actual),
-            "accuracy": len(correct) / len(with_actual) if with_actual else None,
-            "average_confidence": np.mean([
-                log["confidence"] for log in recent_logs
-                if log["confidence"] is not None
-            ]) if any(log["confidence"] is not None for log in recent_logs) else None
+            "predictions_with_feedback": with_actual,
+            "accuracy": correct / with_actual if with_actual else None,
+            "average_confidence": confidence_sum / confidence_count if confidence_count else None
         }
     
+    def get_stats(self) -> Dict:
+        """Get monitor buffer statistics"""
+        with self._lock:
+            return {
+                "buffered_predictions": len(self.predictions_log),
+                "capacity": self.predictions_log.maxlen,
+                "models": {name: len(buckets) for name, buckets in self._buckets.items()},
+                "pending_flush": len(self._pending)
+            }
+    
     def check_for_drift(
         self,
         model_name: str,
@@ -9,6 +9,8 @@ from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import json
 
+from ml.skill_vocabulary import skill_vocabulary
+
 class AdvancedResumeParser:
     def __init__(self):
         """Initialize the resume parser with spaCy model"""
@@ -22,6 +24,14 @@ class AdvancedResumeParser:
         
         # Common skill patterns and keywords
         self.skill_patterns = self._load_skill_patterns()
+        # Word-boundary patterns compiled once; the built-in catalog is interned into the shared vocabulary
+        self._skill_regexes = {
+            category: [(skill, re.compile(r'\b' + re.escape(skill.lower()) + r'\b')) for skill in skills]
+            for category, skills in self.skill_patterns.items()
+        }
+        skill_vocabulary.to_ids(
+            (skill for skills in self.skill_patterns.values() for skill in skills), intern=True
+        )
         self.education_keywords = ["bachelor", "master", "phd", "diploma", "degree", "b.s.", "m.s.", "b.a.", "m.a.", "mba"]
         self.experience_keywords = ["experience", "worked", "employed", "position", "role"]
         
@@ -159,12 +169,11 @@ class AdvancedResumeParser:
         extracted_skills = {}
         all_skills = []
         
-        for category, skills in self.skill_patterns.items():
+        for category, skills in self._skill_regexes.items():
             found_skills = []
-            for skill in skills:
+            for skill, pattern in skills:
                 # Use word boundaries for accurate matching
-                pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-                if re.search(pattern, text_lower):
+                if pattern.search(text_lower):
                     found_skills.append(skill.title())
                     all_skills.append(skill.title())
             
@@ -3,17 +3,19 @@ Semantic Job-Resume Matcher
 Advanced matching system using semantic similarity and weighted scoring
 """
 
-from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 from typing import Dict, List, Tuple
 import numpy as np
 import re
 
+from ml.embeddings import get_embedder
+from ml.skill_vocabulary import SkillSet, skill_vocabulary
+
 
 class SemanticMatcher:
     def __init__(self):
-        """Initialize semantic matcher with sentence transformer model"""
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+        """Initialize semantic matcher with the shared sentence embedding model"""
+        self.model = get_embedder()
         
         # Weights for different matching criteria
         self.weights = {
@@ -90,48 +92,46 @@ class SemanticMatcher:
         
         return max(0.0, min(1.0, similarity))  # Clamp between 0 and 1
     
-    def _calculate_skills_match(self, resume_data: Dict, job_data: Dict) -> float:
-        """Calculate skills match score"""
-        resume_skills = set([
-            skill.lower() 
-            for skill in resume_data.get("skills", {}).get("all_skills", [])
-        ])
-        
-        required_skills = set([
-            skill.lower() 
-            for skill in job_data.get("required_skills", [])
-        ])
-        
-        preferred_skills = set([
-            skill.lower() 
-            for skill in job_data.get("preferred_skills", [])
-        ])
-        
-        if not required_skills and not preferred_skills:
+    def _resume_skill_bits(self, resume_data: Dict) -> SkillSet:
+        """Skill set for a resume, always encoded from the skill names (vocabulary IDs are process-local)"""
+        return skill_vocabulary.encode(resume_data.get("skills", {}).get("all_skills", []))
+    
+    def _job_skill_bits(self, job_data: Dict) -> Tuple[SkillSet, SkillSet]:
+        """Required and preferred skill sets for a job"""
+        return (
+            skill_vocabulary.encode(job_data.get("required_skills", [])),
+            skill_vocabulary.encode(job_data.get("preferred_skills", []))
+        )
+    
+    def _skills_score(self, resume_bits: SkillSet, required_bits: SkillSet, preferred_bits: SkillSet) -> float:
+        """Weighted skills match score from skill bitsets"""
+        if not required_bits and not preferred_bits:
             return 0.5  # Neutral score if no skills specified
         
         # Calculate required skills match (weighted more heavily)
         required_match = 0.0
-        if required_skills:
-            matched_required = resume_skills.intersection(required_skills)
-            required_match = len(matched_required) / len(required_skills)
+        if required_bits:
+            required_match = skill_vocabulary.count(resume_bits & required_bits) / skill_vocabulary.count(required_bits)
         
         # Calculate preferred skills match
         preferred_match = 0.0
-        if preferred_skills:
-            matched_preferred = resume_skills.intersection(preferred_skills)
-            preferred_match = len(matched_preferred) / len(preferred_skills)
+        if preferred_bits:
+            preferred_match = skill_vocabulary.count(resume_bits & preferred_bits) / skill_vocabulary.count(preferred_bits)
         
         # Weighted combination (required skills are more important)
-        if required_skills and preferred_skills:
+        if required_bits and preferred_bits:
             score = (required_match * 0.7) + (preferred_match * 0.3)
-        elif required_skills:
+        elif required_bits:
             score = required_match
         else:
             score = preferred_match
         
         return score
     
+    def _calculate_skills_match(self, resume_data: Dict, job_data: Dict) -> float:
+        """Calculate skills match score"""
+        return self._skills_score(self._resume_skill_bits(resume_data), *self._job_skill_bits(job_data))
+    
     def _calculate_experience_match(self, resume_data: Dict, job_data: Dict) -> float:
         """Calculate experience match score"""
         # Extract years of experience from resume
@@ -226,24 +226,12 @@ class SemanticMatcher:
     
     def _identify_skill_gaps(self, resume_data: Dict, job_data: Dict) -> Dict:
         """Identify missing skills and provide recommendations"""
-        resume_skills = set([
-            skill.lower() 
-            for skill in resume_data.get("skills", {}).get("all_skills", [])
-        ])
-        
-        required_skills = set([
-            skill.lower() 
-            for skill in job_data.get("required_skills", [])
-        ])
-        
-        preferred_skills = set([
-            skill.lower() 
-            for skill in job_data.get("preferred_skills", [])
-        ])
+        resume_bits = self._resume_skill_bits(resume_data)
+        required_bits, preferred_bits = self._job_skill_bits(job_data)
         
         # Find gaps
-        missing_required = list(required_skills - resume_skills)
-        missing_preferred = list(preferred_skills - resume_skills)
+        missing_required = skill_vocabulary.names(required_bits - resume_bits)
+        missing_preferred = skill_vocabulary.names(preferred_bits - resume_bits)
         
         return {
             "missing_required_skills": missing_required,
@@ -350,6 +338,39 @@ class SemanticMatcher:
         
         return results
 
+    
+    def rank_by_skills(self, resumes: List[Dict], job_data: Dict, top_k: int = None) -> List[Dict]:
+        """
+        Rank many resumes against one job by skills match using bitset overlap
+        
+        Args:
+            resumes: Parsed resume data dictionaries
+            job_data: Job posting data dictionary
+            top_k: Number of results to return (all if None)
+            
+        Returns:
+            List of {index, skills_match, missing_required_skills} sorted by score
+        """
+        required_bits, preferred_bits = self._job_skill_bits(job_data)
+        resume_bits = [self._resume_skill_bits(resume) for resume in resumes]
+        
+        ranked = sorted(
+            (
+                (self._skills_score(bits, required_bits, preferred_bits), index)
+                for index, bits in enumerate(resume_bits)
+            ),
+            key=lambda x: (-x[0], x[1])
+        )[:top_k]
+        
+        return [
+            {
+                "index": index,
+                "skills_match": round(score, 4),
+                "missing_required_skills": skill_vocabulary.names(required_bits - resume_bits[index])
+            }
+            for score, index in ranked
+        ]
+
 
 if __name__ == "__main__":
     # Test the matcher
@@ -3,17 +3,249 @@ Skill Recommendation Engine
 Analyzes candidate skills and provides personalized recommendations for career growth
 """
 
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
+from collections import OrderedDict
+from bisect import bisect_right
 import json
+import os
+import threading
 from datetime import datetime
+import numpy as np
+from scipy import sparse
+
+from ml.skill_vocabulary import skill_vocabulary
+
+
+def normalize_skill(skill: str) -> str:
+    """Normalize a skill name for lookups, resolving synonyms to the canonical skill"""
+    return skill_vocabulary.canonical(skill)
 
 
 class SkillRecommendationEngine:
-    def __init__(self):
-        """Initialize skill recommendation engine"""
-        self.skill_taxonomy = self._load_skill_taxonomy()
-        self.career_paths = self._load_career_paths()
-        self.market_trends = self._load_market_trends()
+    def __init__(self, taxonomy_path: Optional[str] = None, cache_size: int = 4096):
+        """
+        Initialize skill recommendation engine
+        
+        Args:
+            taxonomy_path: Optional JSON data file overriding the built-in taxonomy.
+                Falls back to the SKILL_TAXONOMY_PATH environment variable.
+            cache_size: Maximum number of memoized recommendation results (0 disables)
+        """
+        self.taxonomy_path = taxonomy_path or os.getenv("SKILL_TAXONOMY_PATH")
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple, Tuple[Dict[str, str], Dict]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_evictions = 0
+        self.reload_taxonomy()
+    
+    def reload_taxonomy(self) -> None:
+        """(Re)load taxonomy, career paths and trends and rebuild lookup indexes"""
+        data = {}
+        if self.taxonomy_path:
+            with open(self.taxonomy_path, 'r') as f:
+                data = json.load(f)
+        
+        self.skill_taxonomy = data.get("skill_taxonomy") or self._load_skill_taxonomy()
+        self.career_paths = data.get("career_paths") or self._load_career_paths()
+        self.market_trends = data.get("market_trends") or self._load_market_trends()
+        self.role_indicators = data.get("role_indicators") or self._load_role_indicators()
+        self._build_indexes()
+        self.clear_cache()
+    
+    def _build_indexes(self) -> None:
+        """
+        Compile taxonomy, career paths and trends into normalized lookup structures
+        so that recommendation cost scales with the candidate's skill count
+        """
+        # Adjacency index: skill -> related skills (display names)
+        self._related_index: Dict[str, List[str]] = {}
+        # Category index: skill -> categories of every taxonomy entry it belongs to
+        self._category_index: Dict[str, List[str]] = {}
+        
+        for category, skill_dict in self.skill_taxonomy.items():
+            for skill_name, skill_info in skill_dict.items():
+                key = normalize_skill(skill_name)
+                cat = skill_info.get("category", category)
+                related = self._related_index.setdefault(key, [])
+                related.extend(r for r in skill_info.get("related", []) if r not in related)
+                
+                members = {key} | {normalize_skill(r) for r in skill_info.get("related", [])}
+                for member in members:
+                    self._category_index.setdefault(member, []).append(cat)
+        
+        # Career path lookups
+        self._career_index: Dict[str, Dict[str, frozenset]] = {
+            role: {
+                "core": frozenset(normalize_skill(s) for s in path.get("core_skills", [])),
+                "recommended": frozenset(normalize_skill(s) for s in path.get("recommended_skills", []))
+            }
+            for role, path in self.career_paths.items()
+        }
+        
+        # Role x skill-ID incidence matrices for inference and career-path scoring,
+        # over the IDs of the shared skill vocabulary
+        role_skills = [self.role_indicators] + [{
+            role: path.get("core_skills", []) for role, path in self.career_paths.items()
+        }]
+        role_skill_ids = [
+            {role: skill_vocabulary.to_ids(skills, intern=True) for role, skills in mapping.items()}
+            for mapping in role_skills
+        ]
+        self._matrix_width = 1 + max(
+            (max(ids) for mapping in role_skill_ids for ids in mapping.values() if ids),
+            default=0
+        )
+        self._indicator_roles, self._indicator_matrix, self._indicator_sizes = \
+            self._build_incidence_matrix(role_skill_ids[0])
+        self._path_roles, self._path_matrix, self._path_sizes = \
+            self._build_incidence_matrix(role_skill_ids[1])
+        
+        # Market trend lookups
+        self._hot_skills = [
+            (skill, normalize_skill(skill)) for skill in self.market_trends.get("hot_skills_2024", [])
+        ]
+        self._emerging_skills = [
+            (skill, normalize_skill(skill)) for skill in self.market_trends.get("emerging_technologies", [])
+        ]
+        self._hot_skills_set = frozenset(key for _, key in self._hot_skills)
+        
+        # Experience only matters relative to these thresholds
+        self._experience_thresholds = sorted({
+            float(path.get("typical_years", 0)) for path in self.career_paths.values()
+        })
+    
+    def _build_incidence_matrix(self, role_skill_ids: Dict[str, List[int]]) -> Tuple[List[str], sparse.csr_matrix, np.ndarray]:
+        """Build a sparse role x skill-ID incidence matrix"""
+        roles = list(role_skill_ids)
+        rows, cols = [], []
+        for row, role in enumerate(roles):
+            ids = role_skill_ids[role]
+            rows.extend([row] * len(ids))
+            cols.extend(ids)
+        
+        matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(len(roles), self._matrix_width)
+        )
+        sizes = np.asarray(matrix.sum(axis=1)).ravel()
+        return roles, matrix, sizes
+    
+    def _skill_matrix(self, skill_lists: List[List[str]]) -> sparse.csr_matrix:
+        """Encode candidates' skills as a sparse candidate x skill-ID matrix"""
+        rows, cols = [], []
+        for row, skills in enumerate(skill_lists):
+            # Skills outside the matrix cannot match any role
+            ids = {
+                skill_id for skill_id in map(skill_vocabulary.lookup, skills)
+                if skill_id is not None and skill_id < self._matrix_width
+            }
+            rows.extend([row] * len(ids))
+            cols.extend(ids)
+        
+        return sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(len(skill_lists), self._matrix_width)
+        )
+    
+    def _score_roles(
+        self,
+        skill_lists: List[List[str]],
+        roles: List[str],
+        matrix: sparse.csr_matrix,
+        sizes: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Score every role for every candidate in one sparse product"""
+        candidates = self._skill_matrix(skill_lists)
+        counts = np.asarray((candidates @ matrix.T).todense())
+        ratios = counts / np.maximum(sizes, 1)
+        return counts, ratios
+    
+    def infer_roles_batch(self, skill_lists: List[List[str]], top_n: int = 3) -> List[List[Dict]]:
+        """
+        Infer the top-N likely roles for many candidates at once
+        
+        Args:
+            skill_lists: One skill list per candidate
+            top_n: Number of roles to return per candidate
+            
+        Returns:
+            Per candidate, roles ordered by indicator matches (ties keep indicator order)
+        """
+        if not skill_lists or not self._indicator_roles:
+            return [[] for _ in skill_lists]
+        
+        counts, ratios = self._score_roles(
+            skill_lists, self._indicator_roles, self._indicator_matrix, self._indicator_sizes
+        )
+        top = np.argsort(-counts, axis=1, kind="stable")[:, :top_n]
+        
+        return [
+            [
+                {
+                    "role": self._indicator_roles[j],
+                    "score": int(counts[i, j]),
+                    "match_ratio": round(float(ratios[i, j]), 3)
+                }
+                for j in top[i]
+                if counts[i, j] > 0
+            ]
+            for i in range(len(skill_lists))
+        ]
+    
+    def infer_roles(self, skills: List[str], top_n: int = 3) -> List[Dict]:
+        """Infer the top-N likely roles for a single candidate"""
+        return self.infer_roles_batch([skills], top_n)[0]
+    
+    def score_career_paths(self, skills: List[str]) -> Dict[str, float]:
+        """Core-skill completeness (percent) of every career path for a candidate"""
+        if not self._path_roles:
+            return {}
+        
+        _, ratios = self._score_roles([skills], self._path_roles, self._path_matrix, self._path_sizes)
+        return {
+            role: round(float(ratio) * 100, 1)
+            for role, ratio in zip(self._path_roles, ratios[0])
+        }
+    
+    def experience_bucket(self, experience_years: float) -> float:
+        """
+        Map experience onto the largest career-path threshold it reaches
+        
+        Recommendations only compare experience against `typical_years`, so
+        every value in the same bucket yields the same result.
+        """
+        index = bisect_right(self._experience_thresholds, float(experience_years or 0))
+        return self._experience_thresholds[index - 1] if index else 0.0
+    
+    def clear_cache(self) -> None:
+        """Clear memoized recommendations"""
+        with self._cache_lock:
+            self._cache.clear()
+            self._cache_hits = 0
+            self._cache_misses = 0
+            self._cache_evictions = 0
+    
+    def get_cache_stats(self) -> Dict:
+        """Get recommendation cache statistics"""
+        with self._cache_lock:
+            total_requests = self._cache_hits + self._cache_misses
+            hit_rate = (self._cache_hits / total_requests * 100) if total_requests > 0 else 0
+            
+            return {
+                "size": len(self._cache),
+                "max_size": self.cache_size,
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "evictions": self._cache_evictions,
+                "hit_rate": round(hit_rate, 2),
+                "total_requests": total_requests
+            }
+    
+    def _normalize_skills(self, skills: List[str]) -> Set[str]:
+        """Build the normalized lookup set for a candidate's skills"""
+        return {normalize_skill(skill) for skill in skills}
     
     def _load_skill_taxonomy(self) -> Dict:
         """Load comprehensive skill taxonomy with relationships"""
@@ -187,11 +419,22 @@ class SkillRecommendationEngine:
             }
         }
     
+    def _load_role_indicators(self) -> Dict:
+        """Load skills that indicate a likely role"""
+        return {
+            "Software Engineer": ["python", "java", "javascript", "git"],
+            "Frontend Developer": ["react", "javascript", "html", "css"],
+            "Backend Developer": ["python", "node.js", "sql", "api"],
+            "Data Scientist": ["machine learning", "python", "pandas", "statistics"],
+            "DevOps Engineer": ["docker", "kubernetes", "ci/cd", "aws"]
+        }
+    
     def generate_recommendations(
         self, 
         current_skills: List[str],
         target_role: str = None,
-        experience_years: float = 0
+        experience_years: float = 0,
+        inferred_roles: Optional[List[Dict]] = None
     ) -> Dict:
         """
         Generate personalized skill recommendations
@@ -200,12 +443,66 @@ class SkillRecommendationEngine:
             current_skills: List of current skills
             target_role: Desired career role (optional)
             experience_years: Years of experience
+            inferred_roles: Precomputed `infer_roles` result for the skills (used without a target role)
             
         Returns:
-            Dictionary with recommendations and learning paths
+            Dictionary with recommendations and learning paths. Results are
+            memoized per canonical skill set, role and experience bucket; each
+            call gets its own copy, with the caller's spelling of its skills.
         """
-        current_skills_lower = [skill.lower() for skill in current_skills]
+        skills = self.canonical_skills(current_skills)
+        experience_bucket = self.experience_bucket(experience_years)
+        key = (frozenset(skills), target_role, experience_bucket)
+        
+        if self.cache_size > 0:
+            with self._cache_lock:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    self._cache_hits += 1
+                else:
+                    self._cache_misses += 1
+            if cached is not None:
+                # Copy so callers can't mutate the cache; show this caller's skill spellings
+                cached_skills, recommendations = cached
+                return self._relabel(recommendations, {
+                    cached_skills[k]: name for k, name in skills.items() if cached_skills[k] != name
+                })
         
+        recommendations = self._compute_recommendations(
+            list(skills.values()), target_role, experience_bucket, inferred_roles
+        )
+        
+        if self.cache_size > 0:
+            with self._cache_lock:
+                self._cache[key] = (skills, recommendations)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+                    self._cache_evictions += 1
+            return self._relabel(recommendations, {})
+        
+        return recommendations
+    
+    @classmethod
+    def _relabel(cls, value, names: Dict[str, str]):
+        """Copy nested dicts and lists, replacing string values found in names"""
+        if isinstance(value, dict):
+            return {k: cls._relabel(v, names) for k, v in value.items()}
+        if isinstance(value, list):
+            return [cls._relabel(v, names) for v in value]
+        if isinstance(value, str):
+            return names.get(value, value)
+        return value
+    
+    def _compute_recommendations(
+        self,
+        current_skills: List[str],
+        target_role: str,
+        experience_years: float,
+        inferred_roles: Optional[List[Dict]] = None
+    ) -> Dict:
+        """Compute recommendations for a canonical skill list"""
         # Analyze current skill profile
         skill_profile = self._analyze_skill_profile(current_skills)
         
@@ -214,7 +511,7 @@ class SkillRecommendationEngine:
         
         # Get career progression recommendations
         career_recommendations = self._get_career_recommendations(
-            current_skills, target_role, experience_years
+            current_skills, target_role, experience_years, inferred_roles
         )
         
         # Get trending skills relevant to profile
@@ -239,6 +536,90 @@ class SkillRecommendationEngine:
             "market_insights": self._get_market_insights(current_skills, target_role)
         }
     
+    def canonical_skills(self, skills: List[str]) -> Dict[str, str]:
+        """Deduplicate skills case-insensitively, mapping normalized keys to display names in sorted order"""
+        unique: Dict[str, str] = {}
+        for skill in skills:
+            key = normalize_skill(skill)
+            if key:
+                unique.setdefault(key, skill.strip())
+        return {key: unique[key] for key in sorted(unique)}
+    
+    def generate_batch_recommendations(self, profiles: List[Dict]) -> Dict:
+        """
+        Generate recommendations for a cohort of candidates
+        
+        Profiles with the same canonical skill set, target role and experience
+        bucket are computed once and shared.
+        
+        Args:
+            profiles: List of dicts with current_skills and optional
+                candidate_id, target_role and experience_years
+            
+        Returns:
+            Dictionary with per-candidate results and aggregated skill demand
+        """
+        groups: Dict[Tuple, List[int]] = {}
+        display_skills: Dict[Tuple, List[str]] = {}
+        for index, profile in enumerate(profiles):
+            skills = self.canonical_skills(profile.get("current_skills") or [])
+            key = (
+                frozenset(skills),
+                profile.get("target_role"),
+                self.experience_bucket(profile.get("experience_years") or 0)
+            )
+            groups.setdefault(key, []).append(index)
+            display_skills.setdefault(key, list(skills.values()))
+        
+        # Infer roles for every profile without a target role in one sparse product
+        untargeted = [key for key in groups if not key[1]]
+        inferred = dict(zip(untargeted, self.infer_roles_batch([display_skills[key] for key in untargeted])))
+        
+        results: List[Optional[Dict]] = [None] * len(profiles)
+        missing_counts: Dict[str, int] = {}
+        next_counts: Dict[str, int] = {}
+        role_counts: Dict[str, int] = {}
+        
+        for key, members in groups.items():
+            _, target_role, experience_years = key
+            recommendations = self.generate_recommendations(
+                current_skills=display_skills[key],
+                target_role=target_role,
+                experience_years=experience_years,
+                inferred_roles=inferred.get(key)
+            )
+            weight = len(members)
+            
+            for skill in recommendations["skill_gaps"]:
+                missing_counts[skill] = missing_counts.get(skill, 0) + weight
+            for item in recommendations["next_skills_to_learn"]:
+                next_counts[item["skill"]] = next_counts.get(item["skill"], 0) + weight
+            role = recommendations["career_path"].get("current_role") or recommendations["career_path"].get("target_role")
+            role_counts[role] = role_counts.get(role, 0) + weight
+            
+            for index in members:
+                results[index] = {
+                    "candidate_id": profiles[index].get("candidate_id"),
+                    "recommendations": recommendations
+                }
+        
+        def ranked(counts: Dict[str, int]) -> List[Dict]:
+            return [
+                {"skill": skill, "count": count}
+                for skill, count in sorted(counts.items(), key=lambda x: (-x[1], x[0]))
+            ]
+        
+        return {
+            "total_candidates": len(profiles),
+            "unique_profiles": len(groups),
+            "results": results,
+            "skill_demand": {
+                "missing_skills": ranked(missing_counts),
+                "next_skills_to_learn": ranked(next_counts)
+            },
+            "role_distribution": dict(sorted(role_counts.items(), key=lambda x: -x[1]))
+        }
+    
     def _analyze_skill_profile(self, skills: List[str]) -> Dict:
         """Analyze the candidate's skill profile"""
         profile = {
@@ -250,14 +631,8 @@ class SkillRecommendationEngine:
         
         # Categorize skills
         for skill in skills:
-            skill_lower = skill.lower()
-            for category, skill_dict in self.skill_taxonomy.items():
-                for skill_name, skill_info in skill_dict.items():
-                    if skill_lower == skill_name.lower() or skill_lower in [s.lower() for s in skill_info.get("related", [])]:
-                        cat = skill_info.get("category", category)
-                        if cat not in profile["skill_categories"]:
-                            profile["skill_categories"][cat] = []
-                        profile["skill_categories"][cat].append(skill)
+            for cat in self._category_index.get(normalize_skill(skill), []):
+                profile["skill_categories"].setdefault(cat, []).append(skill)
         
         # Identify strengths (categories with most skills)
         if profile["skill_categories"]:
@@ -280,16 +655,14 @@ class SkillRecommendationEngine:
     
     def _find_complementary_skills(self, current_skills: List[str]) -> List[str]:
         """Find skills that complement current skill set"""
-        complementary = set()
-        current_lower = [s.lower() for s in current_skills]
+        complementary: Dict[str, None] = {}
+        current_lower = self._normalize_skills(current_skills)
         
-        for category, skill_dict in self.skill_taxonomy.items():
-            for skill_name, skill_info in skill_dict.items():
-                if skill_name.lower() in current_lower:
-                    # Add related skills
-                    for related in skill_info.get("related", []):
-                        if related.lower() not in current_lower:
-                            complementary.add(related)
+        for skill in current_skills:
+            # Add related skills
+            for related in self._related_index.get(normalize_skill(skill), []):
+                if normalize_skill(related) not in current_lower:
+                    complementary.setdefault(related)
         
         return list(complementary)
     
@@ -297,36 +670,41 @@ class SkillRecommendationEngine:
         self, 
         current_skills: List[str], 
         target_role: str,
-        experience_years: float
+        experience_years: float,
+        inferred_roles: Optional[List[Dict]] = None
     ) -> Dict:
         """Get career-specific recommendations"""
-        current_lower = [s.lower() for s in current_skills]
-        
         # Determine current or target role
-        if not target_role:
-            # Try to infer role from skills
-            target_role = self._infer_role(current_skills)
+        if target_role:
+            inferred_roles = None
+        else:
+            # Infer role from skills (precomputed for batches)
+            if inferred_roles is None:
+                inferred_roles = self.infer_roles_batch([current_skills])[0]
+            target_role = inferred_roles[0]["role"] if inferred_roles else "Software Engineer"
         
         if target_role not in self.career_paths:
-            return {"target_role": target_role, "missing_skills": [], "next_level": None}
+            result = {"target_role": target_role, "missing_skills": [], "next_level": None}
+            if inferred_roles is not None:
+                result["inferred_roles"] = inferred_roles
+            return result
         
         path = self.career_paths[target_role]
+        index = self._career_index[target_role]
+        current_lower = self._normalize_skills(current_skills)
         
-        # Find missing core skills
-        missing_core = [
-            skill for skill in path["core_skills"]
-            if skill.lower() not in current_lower
-        ]
-        
-        # Find missing recommended skills for next level
+        # Missing core skills, and recommended skills for the next level (in path order)
+        missing_core_keys = index["core"] - current_lower
+        missing_recommended_keys = index["recommended"] - current_lower
+        missing_core = [skill for skill in path["core_skills"] if normalize_skill(skill) in missing_core_keys]
         missing_recommended = [
             skill for skill in path.get("recommended_skills", [])
-            if skill.lower() not in current_lower
+            if normalize_skill(skill) in missing_recommended_keys
         ]
         
-        # Determine readiness for next level
-        core_completeness = 1.0 - (len(missing_core) / len(path["core_skills"]))
-        ready_for_next = core_completeness >= 0.8 and experience_years >= path.get("typical_years", 0)
+        # Determine readiness for next level (core completeness from the path incidence matrix)
+        core_completeness = self.score_career_paths(current_skills).get(target_role, 0.0)
+        ready_for_next = core_completeness >= 80 and experience_years >= path.get("typical_years", 0)
         
         return {
             "current_role": target_role,
@@ -334,25 +712,26 @@ class SkillRecommendationEngine:
             "missing_skills": missing_core + missing_recommended,
             "missing_core_skills": missing_core,
             "missing_recommended_skills": missing_recommended,
-            "core_completeness": round(core_completeness * 100, 1),
+            "core_completeness": core_completeness,
             "ready_for_promotion": ready_for_next,
-            "estimated_time_to_next_level": path.get("typical_years", 0)
+            "estimated_time_to_next_level": path.get("typical_years", 0),
+            **({"inferred_roles": inferred_roles} if inferred_roles is not None else {})
         }
     
     def _get_relevant_trending_skills(self, current_skills: List[str]) -> List[str]:
         """Get trending skills relevant to current profile"""
-        current_lower = [s.lower() for s in current_skills]
+        current_lower = self._normalize_skills(current_skills)
         
         # Filter hot skills that aren't already known
         relevant_trending = [
-            skill for skill in self.market_trends["hot_skills_2024"]
-            if skill.lower() not in current_lower
+            skill for skill, key in self._hot_skills
+            if key not in current_lower
         ]
         
         # Add emerging technologies
         emerging = [
-            skill for skill in self.market_trends["emerging_technologies"]
-            if skill.lower() not in current_lower
+            skill for skill, key in self._emerging_skills
+            if key not in current_lower
         ]
         
         return relevant_trending + emerging
@@ -366,11 +745,13 @@ class SkillRecommendationEngine:
     ) -> List[Dict]:
         """Prioritize which skills to learn next"""
         priority_skills = []
-        current_lower = [s.lower() for s in current_skills]
+        current_lower = self._normalize_skills(current_skills)
+        seen: Set[str] = set()
         
         # Priority 1: Missing core skills for current role
         for skill in career_recs.get("missing_core_skills", []):
-            if skill.lower() not in current_lower:
+            if normalize_skill(skill) not in current_lower:
+                seen.add(skill)
                 priority_skills.append({
                     "skill": skill,
                     "priority": "critical",
@@ -380,7 +761,8 @@ class SkillRecommendationEngine:
         
         # Priority 2: Missing recommended skills for next level
         for skill in career_recs.get("missing_recommended_skills", [])[:5]:
-            if skill.lower() not in current_lower:
+            if normalize_skill(skill) not in current_lower:
+                seen.add(skill)
                 priority_skills.append({
                     "skill": skill,
                     "priority": "high",
@@ -390,7 +772,8 @@ class SkillRecommendationEngine:
         
         # Priority 3: Trending skills that complement current stack
         for skill in trending[:5]:
-            if skill.lower() not in current_lower and skill not in [s["skill"] for s in priority_skills]:
+            if normalize_skill(skill) not in current_lower and skill not in seen:
+                seen.add(skill)
                 priority_skills.append({
                     "skill": skill,
                     "priority": "medium",
@@ -400,7 +783,8 @@ class SkillRecommendationEngine:
         
         # Priority 4: Complementary skills
         for skill in complementary[:5]:
-            if skill.lower() not in current_lower and skill not in [s["skill"] for s in priority_skills]:
+            if normalize_skill(skill) not in current_lower and skill not in seen:
+                seen.add(skill)
                 priority_skills.append({
                     "skill": skill,
                     "priority": "medium",
@@ -468,7 +852,7 @@ class SkillRecommendationEngine:
         # Check if candidate has hot skills
         hot_skills_count = sum(
             1 for skill in current_skills
-            if skill.lower() in [s.lower() for s in self.market_trends["hot_skills_2024"]]
+            if normalize_skill(skill) in self._hot_skills_set
         )
         
         if hot_skills_count >= 5:
@@ -482,24 +866,8 @@ class SkillRecommendationEngine:
     
     def _infer_role(self, skills: List[str]) -> str:
         """Infer likely role from skill set"""
-        skills_lower = [s.lower() for s in skills]
-        
-        role_indicators = {
-            "Software Engineer": ["python", "java", "javascript", "git"],
-            "Frontend Developer": ["react", "javascript", "html", "css"],
-            "Backend Developer": ["python", "node.js", "sql", "api"],
-            "Data Scientist": ["machine learning", "python", "pandas", "statistics"],
-            "DevOps Engineer": ["docker", "kubernetes", "ci/cd", "aws"]
-        }
-        
-        best_match = ("Software Engineer", 0)
-        
-        for role, indicators in role_indicators.items():
-            match_count = sum(1 for ind in indicators if ind in skills_lower)
-            if match_count > best_match[1]:
-                best_match = (role, match_count)
-        
-        return best_match[0]
+        inferred = self.infer_roles(skills, top_n=1)
+        return inferred[0]["role"] if inferred else "Software Engineer"
 
 
 if __name__ == "__main__":
@@ -0,0 +1,302 @@
+"""
+Canonical Skill Vocabulary
+Interns skill names (including synonyms) to integer IDs and encodes skill sets as bitsets
+
+Only trusted sources (the Skill table, built-in skill catalogs) are interned. Skills from requests
+are looked up without interning, and those outside the vocabulary are carried by name in a
+SkillSet, so user input can't grow the process-global vocabulary.
+"""
+
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+import os
+import threading
+
+
+# Canonical skill -> aliases that should resolve to the same ID (unambiguous spellings only)
+DEFAULT_SYNONYMS: Dict[str, List[str]] = {
+    "node.js": ["nodejs", "node js"],
+    "go": ["golang"],
+    "javascript": ["ecmascript"],
+    "postgresql": ["postgres", "psql"],
+    "kubernetes": ["k8s"],
+    "ci/cd": ["cicd", "ci cd", "ci-cd"],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "rest api": ["rest apis", "restful api", "restful apis"],
+    "react": ["react.js", "reactjs"],
+    "vue": ["vue.js", "vuejs"],
+    "next.js": ["nextjs"],
+    "nuxt.js": ["nuxtjs"],
+    "express": ["express.js", "expressjs"],
+    "c++": ["cpp"],
+    "c#": ["csharp"],
+    "gcp": ["google cloud", "google cloud platform"],
+    "aws": ["amazon web services"],
+    "mongodb": ["mongo"],
+    "nlp": ["natural language processing"],
+    "power bi": ["powerbi"],
+}
+
+# Short aliases that can mean something else in free text; opt in with short_aliases=True
+# (or SKILL_SHORT_ALIASES=true for the global vocabulary)
+SHORT_ALIASES: Dict[str, List[str]] = {
+    "node.js": ["node"],
+    "javascript": ["js"],
+    "typescript": ["ts"],
+    "machine learning": ["ml"],
+    "rest api": ["rest"],
+}
+
+
+def normalize_skill_name(skill: str) -> str:
+    """Normalize a raw skill string (case and surrounding whitespace)"""
+    return " ".join(skill.strip().lower().split())
+
+
+class SkillSet:
+    """A set of skills: a bitset of vocabulary IDs plus canonical names of skills outside the vocabulary"""
+    
+    __slots__ = ("bits", "unknown")
+    
+    def __init__(self, bits: int = 0, unknown: FrozenSet[str] = frozenset()):
+        self.bits = bits
+        self.unknown = unknown
+    
+    def __and__(self, other: "SkillSet") -> "SkillSet":
+        return SkillSet(self.bits & other.bits, self.unknown & other.unknown)
+    
+    def __or__(self, other: "SkillSet") -> "SkillSet":
+        return SkillSet(self.bits | other.bits, self.unknown | other.unknown)
+    
+    def __sub__(self, other: "SkillSet") -> "SkillSet":
+        return SkillSet(self.bits & ~other.bits, self.unknown - other.unknown)
+    
+    def __len__(self) -> int:
+        return bin(self.bits).count("1") + len(self.unknown)
+    
+    def __bool__(self) -> bool:
+        return bool(self.bits or self.unknown)
+    
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, SkillSet) and (self.bits, self.unknown) == (other.bits, other.unknown)
+    
+    def __repr__(self) -> str:
+        return f"SkillSet(bits={self.bits:#x}, unknown={sorted(self.unknown)})"
+
+
+class SkillVocabulary:
+    """Thread-safe mapping between canonical skill names and integer IDs"""
+    
+    def __init__(self, synonyms: Optional[Dict[str, List[str]]] = None, short_aliases: bool = False):
+        """
+        Initialize skill vocabulary
+        
+        Args:
+            synonyms: Canonical skill -> aliases (default: DEFAULT_SYNONYMS)
+            short_aliases: Also register SHORT_ALIASES (e.g. "js", "ml")
+        """
+        self._lock = threading.Lock()
+        self._aliases: Dict[str, str] = {}
+        self._ids: Dict[str, int] = {}
+        self._names: Dict[int, str] = {}
+        self._categories: Dict[int, Optional[str]] = {}
+        self._next_id = 1
+        
+        for canonical, aliases in (synonyms if synonyms is not None else DEFAULT_SYNONYMS).items():
+            self.add_synonyms(canonical, aliases)
+        if short_aliases:
+            for canonical, aliases in SHORT_ALIASES.items():
+                self.add_synonyms(canonical, aliases)
+    
+    def add_synonyms(self, canonical: str, aliases: Iterable[str]) -> None:
+        """Register aliases that resolve to a canonical skill"""
+        key = normalize_skill_name(canonical)
+        with self._lock:
+            for alias in aliases:
+                alias_key = normalize_skill_name(alias)
+                if alias_key != key:
+                    self._aliases[alias_key] = key
+    
+    def canonical(self, skill: str) -> str:
+        """Resolve a skill (or alias) to its canonical normalized key"""
+        key = normalize_skill_name(skill)
+        return self._aliases.get(key, key)
+    
+    def add(self, skill: str, skill_id: Optional[int] = None, category: Optional[str] = None) -> int:
+        """
+        Intern a skill, optionally with a fixed ID (e.g. a `Skill` table primary key)
+        
+        Args:
+            skill: Skill name or alias
+            skill_id: ID to assign; allocated automatically when omitted
+            category: Optional skill category
+        
+        Returns:
+            Integer ID of the canonical skill
+        """
+        key = self.canonical(skill)
+        with self._lock:
+            if key in self._ids:
+                return self._ids[key]
+            
+            if skill_id is None:
+                skill_id = self._next_id
+            elif skill_id in self._names:
+                raise ValueError(f"Skill ID {skill_id} already assigned to '{self._names[skill_id]}'")
+            
+            self._ids[key] = skill_id
+            self._names[skill_id] = key
+            self._categories[skill_id] = category
+            self._next_id = max(self._next_id, skill_id + 1)
+            return skill_id
+    
+    def intern(self, skill: str) -> int:
+        """Get the ID for a skill, interning it if unseen"""
+        skill_id = self._ids.get(self.canonical(skill))
+        return skill_id if skill_id is not None else self.add(skill)
+    
+    def lookup(self, skill: str) -> Optional[int]:
+        """Get the ID for a skill without interning it"""
+        return self._ids.get(self.canonical(skill))
+    
+    def name(self, skill_id: int) -> Optional[str]:
+        """Get the canonical name for an ID"""
+        return self._names.get(skill_id)
+    
+    def category(self, skill_id: int) -> Optional[str]:
+        """Get the category for an ID, if known"""
+        return self._categories.get(skill_id)
+    
+    def __len__(self) -> int:
+        return len(self._ids)
+    
+    def __contains__(self, skill: str) -> bool:
+        return self.canonical(skill) in self._ids
+    
+    def to_ids(self, skills: Iterable[str], intern: bool = False) -> List[int]:
+        """
+        Encode skills as a sorted array of unique IDs
+        
+        Args:
+            skills: Skill names or aliases
+            intern: Add unseen skills to the vocabulary (trusted sources only); otherwise they are skipped
+        """
+        resolve = self.intern if intern else self.lookup
+        ids = {resolve(skill) for skill in skills if skill and skill.strip()}
+        ids.discard(None)
+        return sorted(ids)
+    
+    def to_bitset(self, skills: Iterable[str], intern: bool = False) -> int:
+        """Encode skills as a bitset (bit N set for skill ID N); unseen skills are skipped unless interned"""
+        return self.ids_to_bitset(self.to_ids(skills, intern=intern))
+    
+    def encode(self, skills: Iterable[str]) -> SkillSet:
+        """Encode untrusted skills without interning: known skills as bits, the rest by canonical name"""
+        bits = 0
+        unknown = set()
+        for skill in skills:
+            if not skill or not skill.strip():
+                continue
+            key = self.canonical(skill)
+            skill_id = self._ids.get(key)
+            if skill_id is None:
+                unknown.add(key)
+            else:
+                bits |= 1 << skill_id
+        return SkillSet(bits, frozenset(unknown))
+    
+    def contains(self, skill_set: SkillSet, skill: str) -> bool:
+        """Check whether a skill (or alias) is in a SkillSet"""
+        key = self.canonical(skill)
+        skill_id = self._ids.get(key)
+        if skill_id is None:
+            return key in skill_set.unknown
+        return bool(skill_set.bits >> skill_id & 1)
+    
+    @staticmethod
+    def ids_to_bitset(skill_ids: Iterable[int]) -> int:
+        """Encode skill IDs as a bitset"""
+        bits = 0
+        for skill_id in skill_ids:
+            bits |= 1 << skill_id
+        return bits
+    
+    @staticmethod
+    def bitset_to_ids(bits: int) -> List[int]:
+        """Decode a bitset into sorted skill IDs"""
+        ids = []
+        while bits:
+            low = bits & -bits
+            ids.append(low.bit_length() - 1)
+            bits ^= low
+        return ids
+    
+    def names(self, bits: Union[int, SkillSet]) -> List[str]:
+        """Decode a bitset (ordered by ID) or a SkillSet (then unknown skills, sorted) into canonical skill names"""
+        if isinstance(bits, SkillSet):
+            return self.names(bits.bits) + sorted(bits.unknown)
+        return [self._names[skill_id] for skill_id in self.bitset_to_ids(bits)]
+    
+    @staticmethod
+    def count(bits: Union[int, SkillSet]) -> int:
+        """Number of skills in a bitset or SkillSet"""
+        if isinstance(bits, SkillSet):
+            return len(bits)
+        return bin(bits).count("1")
+    
+    def bulk_overlap(self, candidate_bits: List[int], required_bits: int) -> List[int]:
+        """Count required skills covered by each candidate bitset"""
+        return [self.count(bits & required_bits) for bits in candidate_bits]
+    
+    def load_rows(self, rows: Iterable[Tuple[int, str, Optional[str]]]) -> int:
+        """
+        Seed the vocabulary from (id, name, category) rows, e.g. the `Skill` table
+        
+        A row keeps its ID when that ID is free. Rows whose name is already known only fill in the
+        category; rows whose ID is taken by another skill get a new ID (IDs are process-local).
+        
+        Returns:
+            Number of skills loaded
+        """
+        loaded = 0
+        collisions = []
+        for skill_id, name, category in rows:
+            existing = self.lookup(name)
+            if existing is not None:
+                with self._lock:
+                    if self._categories.get(existing) is None:
+                        self._categories[existing] = category
+                continue
+            
+            with self._lock:
+                taken = skill_id in self._names
+            if taken:
+                collisions.append(skill_id)
+                self.add(name, category=category)
+            else:
+                self.add(name, skill_id=skill_id, category=category)
+            loaded += 1
+        
+        if collisions:
+            print(f"Warning: {len(collisions)} skill IDs were already in use and got new vocabulary IDs: "
+                  f"{collisions[:10]}")
+        return loaded
+    
+    def load_from_db(self, db: Any, skill_model: Any) -> int:
+        """
+        Seed the vocabulary from the `Skill` table
+        
+        Args:
+            db: SQLAlchemy session
+            skill_model: The `Skill` ORM model
+        
+        Returns:
+            Number of skills loaded
+        """
+        rows = db.query(skill_model.id, skill_model.name, skill_model.category).order_by(skill_model.id).all()
+        return self.load_rows(rows)
+
+
+# Global vocabulary shared by the ML components
+skill_vocabulary = SkillVocabulary(
+    short_aliases=os.getenv("SKILL_SHORT_ALIASES", "").strip().lower() in ("1", "true", "yes")
+)
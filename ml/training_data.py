@@ -0,0 +1,250 @@
+"""
+Streaming Training Data
+Streams (resume text, role label) pairs from the database in chunks for out-of-core training
+"""
+
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+import os
+import re
+import sys
+import time
+
+
+# Application statuses whose job title is treated as a confirmed role for the candidate's resume
+CONFIRMED_APPLICATION_STATUSES = ("offered", "accepted")
+
+# Free-text job titles -> role classes, checked in order (first match wins)
+TITLE_ROLE_PATTERNS = [
+    ("Data Scientist", r"data scien|data analy|machine learning|\bml\b|\bai\b"),
+    ("DevOps Engineer", r"devops|\bsre\b|site reliability|platform engineer|infrastructure|cloud engineer"),
+    ("Software Engineer", r"software|developer|programmer|front[- ]?end|back[- ]?end|full[- ]?stack"),
+    ("Designer", r"design|\bux\b|\bui\b"),
+    ("Financial Analyst", r"financ|accountant|accounting|investment analyst"),
+    ("HR Manager", r"\bhr\b|human resources|recruit|talent acquisition|people (ops|operations|partner)"),
+    ("Marketing Specialist", r"marketing|\bseo\b|brand|content strateg"),
+    ("Project Manager", r"project manager|program manager|scrum master|delivery manager"),
+    ("Sales Representative", r"sales|account executive|business development"),
+    ("Teacher", r"teacher|instructor|tutor|educator|lecturer|professor"),
+]
+_TITLE_ROLE_REGEXES = [(role, re.compile(pattern, re.IGNORECASE)) for role, pattern in TITLE_ROLE_PATTERNS]
+
+
+def title_to_role(title: str) -> Optional[str]:
+    """Map a job title (e.g. "Senior Backend Developer") to a role class, or None if it fits none"""
+    for role, regex in _TITLE_ROLE_REGEXES:
+        if regex.search(title):
+            return role
+    return None
+
+
+def current_rss_mb() -> Optional[float]:
+    """Current resident set size of this process in MB (None without psutil)"""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None where unsupported)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class TrainingDataStream:
+    """
+    Re-iterable stream of labeled resume chunks read through server-side cursors
+
+    Sources:
+        applications: `Resume.raw_text` labeled with the role of the job in offered/accepted applications
+
+    Job titles are free text, so they are mapped to role classes with `label_map` and rows whose
+    title maps to no role are dropped (one class per distinct title would blow up the model).
+    `ScreeningResult.role_prediction` is not a source: it is the model's own output, and training
+    on it would only reinforce its mistakes. Confirmed roles go through `/api/ml/role-feedback`.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        models: Any,
+        chunk_size: int = 1000,
+        sources: Sequence[str] = ("applications",),
+        application_statuses: Sequence[str] = CONFIRMED_APPLICATION_STATUSES,
+        label_map: Callable[[str], Optional[str]] = title_to_role,
+        min_text_length: int = 20
+    ):
+        """
+        Initialize training data stream
+
+        Args:
+            session_factory: Callable returning a SQLAlchemy session (e.g. `SessionLocal`)
+            models: Module providing the `Resume`, `Application`, `Job`, `ScreeningResult` models
+            chunk_size: Rows fetched per chunk
+            sources: Which sources to stream, in order
+            application_statuses: Application statuses that confirm a role
+            label_map: Maps a job title to a role class (return None to drop the example)
+            min_text_length: Skip resumes with less text than this
+        """
+        self.session_factory = session_factory
+        self.models = models
+        self.chunk_size = chunk_size
+        self.sources = list(sources)
+        self.application_statuses = [models.ApplicationStatus(s) for s in application_statuses]
+        self.label_map = label_map
+        self.min_text_length = min_text_length
+
+    def _statements(self) -> List:
+        from sqlalchemy import select
+
+        m = self.models
+        statements = []
+        for source in self.sources:
+            if source == "applications":
+                statements.append(
+                    select(m.Resume.raw_text, m.Job.title)
+                    .join(m.Application, m.Application.resume_id == m.Resume.id)
+                    .join(m.Job, m.Job.id == m.Application.job_id)
+                    .where(m.Application.status.in_(self.application_statuses), m.Resume.raw_text.isnot(None))
+                    .order_by(m.Application.id)
+                )
+            else:
+                raise ValueError(f"Unknown training data source '{source}'")
+        return statements
+
+    def _label(self, label: Optional[str]) -> Optional[str]:
+        if not label:
+            return None
+        return self.label_map(label.strip())
+
+    def labels(self) -> List[str]:
+        """Distinct labels across all sources (one DISTINCT query per source)"""
+        labels = set()
+        session = self.session_factory()
+        try:
+            for statement in self._statements():
+                label_column = statement.selected_columns[1]
+                distinct = statement.with_only_columns(label_column).distinct().order_by(None)
+                for (label,) in session.execute(distinct):
+                    mapped = self._label(label)
+                    if mapped:
+                        labels.add(mapped)
+        finally:
+            session.close()
+        return sorted(labels)
+
+    def __iter__(self) -> Iterator[Tuple[List[str], List[str]]]:
+        """Yield (texts, labels) chunks; only one chunk is held in memory at a time"""
+        session = self.session_factory()
+        try:
+            for statement in self._statements():
+                result = session.execute(
+                    statement.execution_options(stream_results=True, yield_per=self.chunk_size)
+                )
+                for rows in result.partitions(self.chunk_size):
+                    texts, labels = [], []
+                    for text, label in rows:
+                        label = self._label(label)
+                        if label and text and len(text) >= self.min_text_length:
+                            texts.append(text)
+                            labels.append(label)
+                    if texts:
+                        yield texts, labels
+        finally:
+            session.close()
+
+
+def train_from_stream(
+    stream: TrainingDataStream,
+    learner: Any = None,
+    epochs: int = 1,
+    checkpoint: bool = True
+) -> Dict:
+    """
+    Train an incremental job-role model out of core
+
+    Each chunk is hashed and learned with partial_fit, then discarded, so memory is bounded by
+    the chunk size rather than the corpus size.
+
+    Args:
+        stream: Training data stream
+        learner: IncrementalJobPredictor (default: new one over the stream's labels)
+        epochs: Passes over the stream
+        checkpoint: Register a final checkpoint if the learner has a registry
+
+    Returns:
+        Training summary with throughput and memory usage
+    """
+    if learner is None:
+        from ml.job_predictor import IncrementalJobPredictor
+        learner = IncrementalJobPredictor(classes=stream.labels())
+
+    rss_start = current_rss_mb()
+    rss_max = rss_start
+    start_time = time.time()
+    examples = 0
+    chunks = 0
+
+    for _ in range(epochs):
+        for texts, labels in stream:
+            learner.partial_fit(texts, labels)
+            examples += len(texts)
+            chunks += 1
+
+            rss = current_rss_mb()
+            if rss is not None:
+                rss_max = max(rss_max or 0.0, rss)
+
+    version = None
+    if checkpoint and learner.registry is not None and learner.model is not None:
+        version = learner.checkpoint()
+
+    elapsed = time.time() - start_time
+    process_peak = peak_rss_mb()
+    return {
+        "examples": examples,
+        "chunks": chunks,
+        "epochs": epochs,
+        "chunk_size": stream.chunk_size,
+        "training_time_seconds": round(elapsed, 3),
+        "examples_per_second": round(examples / elapsed, 1) if elapsed > 0 else None,
+        "rss_start_mb": round(rss_start, 1) if rss_start is not None else None,
+        "rss_max_mb": round(rss_max, 1) if rss_max is not None else None,
+        "peak_rss_mb": round(process_peak, 1) if process_peak is not None else None,
+        "version": version,
+        "learner": learner.get_stats()
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Train the job-role model out of core from the database")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--epochs", type=int, default=1)
+    parser.add_argument("--model-name", default="job_role_online")
+    args = parser.parse_args()
+
+    backend_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+    sys.path.insert(0, os.path.dirname(backend_dir))
+    sys.path.insert(0, backend_dir)
+    from database import SessionLocal
+    import models
+    from ml.job_predictor import IncrementalJobPredictor
+    from ml.model_pipeline import ModelRegistry
+
+    stream = TrainingDataStream(SessionLocal, models, chunk_size=args.chunk_size)
+    learner = IncrementalJobPredictor(
+        classes=stream.labels(),
+        batch_size=args.chunk_size,
+        registry=ModelRegistry(),
+        model_name=args.model_name
+    )
+    print(json.dumps(train_from_stream(stream, learner, epochs=args.epochs), indent=2, default=str))